@@ -97,17 +97,20 @@ def simple_validate_video_fallback(url_or_path: str, hashtags: str) -> dict[str,
     }
 
 
-from flask import Flask, render_template, request, redirect, url_for, jsonify
+from flask import Flask, render_template, request, redirect, url_for, jsonify, Response
 import os
 import sys
 import requests
 import tempfile
 import time
 import random
+import uuid
 from datetime import datetime
 from urllib.parse import urlparse
 import re
-from typing import Dict, Any
+import functools
+import importlib.util
+from typing import Dict, Any, Callable, Optional
 
 # Set up Google Cloud authentication
 os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = "/Users/jamesmcdaniel/Downloads/kinetic-primer-461205-v8-d9bf26abe17e.json"
@@ -115,67 +118,112 @@ os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = "/Users/jamesmcdaniel/Downloads/k
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.config import Config
-
-# Twelve Labs SDK imports
-try:
-    import twelvelabs
-    from twelvelabs import TwelveLabs
-    from twelvelabs.models.task import Task
-    TWELVE_LABS_AVAILABLE = True
-    print("✅ Twelve Labs SDK imported successfully")
-except ImportError as e:
-    print(f"⚠️ Twelve Labs SDK not available: {e}")
-    TWELVE_LABS_AVAILABLE = False
-    TwelveLabs = None
+from src.services.job_queue import ValidationJobQueue
+from src.services.result_cache import ValidationResultCache
+from src.services.batch_validator import BatchValidationRunner
+from src.services.search_fanout import SearchFanout
+from src.services.task_poller import TaskPoller, task_status
+from src.services.rate_limiter import ApiRateLimiter, RateLimitedClient
+from src.services.warmup import LazyTwelveLabsClient, StartupWarmup
+from src.services.cloud_staging import CloudStager
+from src.services.ingestion import IngestionPipeline, IngestionError, IncompleteStep
+from src.services.media_probe import MediaProbe, MediaProbeError, VideoPolicyError
+from src.services.transcoder import ProxyTranscoder, TranscodeError
+from src.services.video_metadata import VideoMetadataService, VideoMetadataError, YT_DLP_AVAILABLE
+from src.services.search_cache import SearchResultCache
+from src.services.analytics_refresher import AnalyticsRefresher
+from src.services.event_stream import EventBroadcaster, compute_delta
+from src.services.mob_classifier import MobClassifier
+from src.services.bulk_reclassifier import BulkReclassifier
+from src.services.semantic_search import SemanticSearchIndex
+from src.services.mob_embeddings import EmbeddingMobClassifier, build_embedding_provider
+from src.models.database import SQLiteDatabase
+from src.models.video import VideoStore
+from src.models.embedding import EmbeddingStore
+from src.models.staged_object import StagedObjectStore
+from src.models.ingestion import IngestionStore
+from src.models.job import JobStore
+from src.models.batch import BatchStore
+from src.models.stream_event import EventLog
+from src.models.mob import CampaignStore
+from src.utils.upload_stream import StreamingUploadRequest, HashingFileStream
+from werkzeug.exceptions import RequestEntityTooLarge
+
+# Twelve Labs SDK: only checked for here; it's imported when the client is first needed
+TWELVE_LABS_AVAILABLE = importlib.util.find_spec('twelvelabs') is not None
+if not TWELVE_LABS_AVAILABLE:
+    print("⚠️ Twelve Labs SDK not available: No module named 'twelvelabs'")
 
 app = Flask(__name__)
+# Multipart file parts are hashed and written straight into UPLOAD_FOLDER while the body is read
+app.request_class = StreamingUploadRequest
 
 config = Config()
 
-# ADD DEBUG CODE HERE:
-print("🔧 DEBUG: Twelve Labs Configuration")
-print(f"   API Key from config: '{config.TWELVE_LABS_API_KEY}'")  
-print(f"   API Key length: {len(config.TWELVE_LABS_API_KEY) if config.TWELVE_LABS_API_KEY else 0}")
-print(f"   API Key starts with 'tlk_': {config.TWELVE_LABS_API_KEY.startswith('tlk_') if config.TWELVE_LABS_API_KEY else False}")
-print(f"   SDK Available: {TWELVE_LABS_AVAILABLE}")
-
-# Test client initialization manually
-if TWELVE_LABS_AVAILABLE and config.TWELVE_LABS_API_KEY:
-    print("🔧 Testing manual client initialization...")
-    try:
-        test_client = TwelveLabs(api_key=config.TWELVE_LABS_API_KEY)
-        print("   ✅ Client created successfully")
-        
-        # Test API call
-        try:
-            indexes = test_client.index.list()
-            print(f"   ✅ API call successful - found {len(list(indexes))} indexes")
-        except Exception as api_error:
-            print(f"   ❌ API call failed: {api_error}")
-            
-    except Exception as client_error:
-        print(f"   ❌ Client creation failed: {client_error}")
-
 print(f"🔑 Loaded API Key: {config.TWELVE_LABS_API_KEY[:20]}..." if config.TWELVE_LABS_API_KEY and config.TWELVE_LABS_API_KEY != 'tlk_0DJGJCW3CE8G5X2PMFTDD24S1A8D' else "❌ No API Key loaded")
 app.config['UPLOAD_FOLDER'] = config.UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = config.MAX_CONTENT_LENGTH
+app.config['MAX_UPLOAD_FILE_SIZE'] = config.MAX_UPLOAD_FILE_SIZE
+app.config['UPLOAD_CHUNK_SIZE'] = config.UPLOAD_CHUNK_SIZE
+app.config['ALLOWED_EXTENSIONS'] = config.ALLOWED_EXTENSIONS
 
-# Initialize Twelve Labs client
-twelve_labs_client = None
-if TWELVE_LABS_AVAILABLE and config.TWELVE_LABS_API_KEY:
-    try:
-        twelve_labs_client = TwelveLabs(api_key=config.TWELVE_LABS_API_KEY)
-        print("✅ Twelve Labs client initialized successfully")
-    except Exception as e:
-        print(f"⚠️ Warning: Twelve Labs client initialization failed: {e}")
-        twelve_labs_client = None
+# Every Twelve Labs call from this process draws from the same token buckets
+api_rate_limiter = ApiRateLimiter(config.TWELVE_LABS_RATE_LIMITS, max_wait=config.RATE_LIMIT_MAX_WAIT)
+
+
+
+def _create_twelve_labs_client():
+    from twelvelabs import TwelveLabs
+    return RateLimitedClient(TwelveLabs(api_key=config.TWELVE_LABS_API_KEY), api_rate_limiter)
+
+
+# Twelve Labs client: built on first use or by the startup warmup thread, never during import
+twelve_labs_client = LazyTwelveLabsClient(
+    _create_twelve_labs_client,
+    configured=TWELVE_LABS_AVAILABLE and bool(config.TWELVE_LABS_API_KEY)
+)
 
 os.makedirs(config.UPLOAD_FOLDER, exist_ok=True)
 
+# Per-video milk queries run concurrently, each under its own deadline, instead of back to back
+search_fanout = SearchFanout(max_workers=config.SEARCH_WORKERS, limiter=api_rate_limiter)
+
+# Uploads are probed (container header only) and checked against the upload policy before staging/indexing
+media_probe = MediaProbe(
+    min_duration=config.VIDEO_MIN_DURATION_SECONDS,
+    max_duration=config.VIDEO_MAX_DURATION_SECONDS,
+    min_resolution=config.VIDEO_MIN_RESOLUTION,
+    max_resolution=config.VIDEO_MAX_RESOLUTION
+)
+
+# Oversized uploads (4K phone clips) are indexed from a bounded-resolution/bitrate proxy
+proxy_transcoder = ProxyTranscoder(
+    config.TRANSCODE_FOLDER,
+    max_height=config.TRANSCODE_MAX_HEIGHT,
+    max_bitrate_kbps=config.TRANSCODE_MAX_BITRATE_KBPS,
+    workers=config.TRANSCODE_WORKERS,
+    timeout=config.TRANSCODE_TIMEOUT
+)
+
+# URL previews: warm yt-dlp extractors, TTL + negative caching, one extraction per URL at a time
+video_metadata = VideoMetadataService(
+    ttl_seconds=config.VIDEO_METADATA_TTL,
+    negative_ttl_seconds=config.VIDEO_METADATA_NEGATIVE_TTL,
+    max_entries=config.VIDEO_METADATA_MAX_ENTRIES,
+    pool_size=config.VIDEO_METADATA_EXTRACTORS
+)
+
 # Your milk campaign index ID - UPDATED WITH ACTUAL INDEX ID
 MILK_CAMPAIGN_INDEX_ID = "683614a96f9b4a86a7c2f743"  # ✅ Real ID from your Twelve Labs account
 
-MOB_VIDEOS = {
+# Per-video searches pass filter={"id": [video_id]}; flipped off if the SDK/API rejects it
+VIDEO_FILTER_SUPPORTED = True
+
+# Very broad query used to tell "indexed but no milk" apart from "not indexed yet"
+BROAD_PROBE_QUERY = "person"
+
+# Demo videos loaded into an empty database on first start
+SEED_MOB_VIDEOS = {
     'mob001': [  # Extreme Milk
         {'title': 'Skateboarding while drinking milk challenge!', 'user': 'SkaterMike23', 'duration': 23, 'confidence': 0.89},
         {'title': 'Parkour milk run - extreme edition', 'user': 'ParkourPro', 'duration': 45, 'confidence': 0.92}
@@ -198,6 +246,67 @@ MOB_VIDEOS = {
     ]
 }
 
+# Classified videos and campaign counters live in SQLite (WAL) so they survive restarts
+# and every worker process sees the same state
+database = SQLiteDatabase(config.DATABASE_PATH)
+
+# Content-addressed cache of Twelve Labs validation results (repeat submissions skip indexing)
+validation_cache = ValidationResultCache(
+    database,
+    ttl_seconds=config.VALIDATION_CACHE_TTL,
+    max_entries=config.VALIDATION_CACHE_MAX_ENTRIES
+)
+
+# Background worker pool for upload validation - keeps request threads off indexing waits.
+# Job state is mirrored to the database, so /api/jobs/<id> works whichever worker serves it
+validation_jobs = ValidationJobQueue(
+    max_workers=config.VALIDATION_WORKERS,
+    max_pending=config.VALIDATION_MAX_PENDING,
+    retention_seconds=config.JOB_RETENTION_SECONDS,
+    store=JobStore(database)
+)
+
+video_store = VideoStore(database)
+
+# Uploads staged for Twelve Labs go through one long-lived storage client, big files in parallel parts.
+# Objects are named by content hash; bytes already in the bucket are never uploaded again
+cloud_stager = CloudStager(
+    config.GCS_BUCKET,
+    prefix=config.GCS_PREFIX,
+    part_size=config.STAGING_PART_SIZE,
+    composite_threshold=config.STAGING_COMPOSITE_THRESHOLD,
+    max_workers=config.STAGING_WORKERS,
+    index=StagedObjectStore(database),
+    file_hash=validation_cache.file_hash
+)
+
+# Mob keyword/hashtag patterns are compiled once at startup
+mob_classifier = MobClassifier()
+bulk_reclassifier = BulkReclassifier(mob_classifier)
+
+# Indexed videos are assigned to the nearest mob centroid by embedding; keyword rules are the fallback
+embedding_store = EmbeddingStore(database)
+embedding_provider = build_embedding_provider(config.EMBEDDING_PROVIDER, twelve_labs_client, MILK_CAMPAIGN_INDEX_ID,
+                                              config.EMBEDDING_MODEL, limiter=api_rate_limiter)
+
+embedding_mob_classifier = None
+if config.MOB_CLASSIFIER == 'embedding' and embedding_provider is not None:
+    embedding_mob_classifier = EmbeddingMobClassifier(
+        embedding_provider, embedding_store,
+        min_similarity=config.MOB_EMBEDDING_MIN_SIMILARITY, max_cached=config.EMBEDDING_CACHE_MAX_ENTRIES,
+        unavailable_ttl=config.EMBEDDING_UNAVAILABLE_TTL
+    )
+elif config.MOB_CLASSIFIER == 'embedding':
+    print("⚠️ No embedding provider (NumPy missing or no Twelve Labs client) - using keyword mob classification")
+
+# Memory-mapped IVF index over segment embeddings answers common searches without a remote call
+semantic_index = None
+if config.LOCAL_SEARCH_ENABLED and embedding_provider is not None:
+    semantic_index = SemanticSearchIndex(
+        embedding_provider, embedding_store, config.VECTOR_INDEX_FOLDER,
+        nlist=config.VECTOR_INDEX_NLIST, nprobe=config.VECTOR_INDEX_NPROBE, min_score=config.LOCAL_SEARCH_MIN_SCORE
+    )
+
 
 def _is_valid_video_url(url):
     """Validate if URL is a valid video URL for Twelve Labs API"""
@@ -244,6 +353,17 @@ def _is_valid_video_url(url):
         return False
 
 
+def with_api_priority(priority_class: str):
+    """Decorator: Twelve Labs calls made inside the function use the given rate-limit priority class"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapped(*args, **kwargs):
+            with api_rate_limiter.priority(priority_class):
+                return fn(*args, **kwargs)
+        return wrapped
+    return decorator
+
+
 def _allowed_file(filename):
     """Check if file extension is allowed - based on FFmpeg supported formats"""
     if not filename or '.' not in filename:
@@ -316,289 +436,469 @@ def clean_video_url(url: str) -> str:
     return url
 
 
-def upload_file_to_cloud_and_process(file_path: str, hashtags: str) -> Dict[str, Any]:
+def _fetch_task_statuses(task_ids: list) -> Dict[str, Any]:
     """
-    Enhanced processing for uploaded files - supports both Twelve Labs direct upload and cloud storage
+    Fetch current Task objects for the poller.
+    Several due tasks share one task.list() scan (newest first), which stops as soon as every due
+    task has been seen or after TASK_LIST_MAX_PAGES pages; anything not found is retrieved individually.
     """
+    tasks_by_id = {}
     
-    print(f"🔄 Enhanced processing for uploaded file: {file_path}")
-    
-    # Option 1: Direct Twelve Labs file upload (NEW!)
-    if twelve_labs_client:
+    if len(task_ids) > 1:
+        wanted = set(task_ids)
+        page_limit = max(50, len(task_ids))
         try:
-            print("   🎯 Attempting direct Twelve Labs file upload...")
-            return twelve_labs_validate_video_file(file_path, hashtags)
+            for scanned, listed_task in enumerate(twelve_labs_client.task.list(index_id=MILK_CAMPAIGN_INDEX_ID,
+                                                                               page_limit=page_limit)):
+                if scanned >= page_limit * config.TASK_LIST_MAX_PAGES:
+                    break
+                if listed_task.id in wanted:
+                    tasks_by_id[listed_task.id] = listed_task
+                    if len(tasks_by_id) == len(wanted):
+                        break
         except Exception as e:
-            print(f"   ⚠️ Direct Twelve Labs upload failed: {e}")
-            print("   🔄 Falling back to cloud storage or enhanced validation...")
-    
-    # Option 2: Cloud storage upload (if configured)
-    cloud_url = upload_to_cloud_storage(file_path)
-    if cloud_url:
-        print(f"   ☁️ File uploaded to cloud: {cloud_url}")
-        print("   🔍 Processing with Twelve Labs API via cloud URL...")
-        return twelve_labs_validate_video_url(cloud_url, hashtags)
-    
-    # Option 3: Enhanced fallback validation
-    print("   📁 Using enhanced local file validation...")
-    try:
-        # Enhanced fallback validation for uploaded files
-        validation_result = simple_validate_video_fallback(file_path, hashtags)
-        
-        # Boost confidence for actual file uploads (they're more likely to be genuine)
-        if validation_result['is_valid']:
-            validation_result['confidence'] = min(validation_result['confidence'] + 0.2, 1.0)
-            validation_result['reason'] = "✅ File upload validated (Enhanced processing)"
-            validation_result['method'] = "enhanced_file_validation"
-        
-        return validation_result
-        
-    except Exception as e:
-        print(f"   ❌ Enhanced processing failed: {e}")
-        return simple_validate_video_fallback(file_path, hashtags)
+            print(f"   ⚠️ Batched task listing failed, polling individually: {e}")
+    
+    for task_id in task_ids:
+        if task_id not in tasks_by_id:
+            try:
+                tasks_by_id[task_id] = twelve_labs_client.task.retrieve(task_id)
+            except Exception as e:
+                print(f"   ⚠️ Status check failed for task {task_id}: {e}")
+    
+    return tasks_by_id
+
+
+# Single background poller for every in-flight indexing task (replaces per-upload wait_for_done loops)
+task_poller = TaskPoller(
+    _fetch_task_statuses,
+    initial_interval=config.TASK_POLL_INITIAL_INTERVAL,
+    max_interval=config.TASK_POLL_MAX_INTERVAL
+)
+
+# Dashboard and social feed searches are served from here; polling tabs share one upstream call
+search_cache = SearchResultCache(
+    ttl_seconds=config.SEARCH_CACHE_TTL,
+    max_entries=config.SEARCH_CACHE_MAX_ENTRIES
+)
+
+
+def _invalidate_search_cache(task_obj):
+    """A newly indexed video changes what index-wide searches return"""
+    if task_status(task_obj) == 'ready':
+        index_id = getattr(task_obj, 'index_id', None) or MILK_CAMPAIGN_INDEX_ID
+        search_cache.invalidate_index(index_id)
+
+
+task_poller.add_listener(_invalidate_search_cache)
 
 
-def upload_to_cloud_storage(file_path: str) -> str:
-    """Upload file to cloud storage and return public URL
-    This is a placeholder - implement with your preferred cloud service
+def _add_to_semantic_index(task_obj):
+    """Newly indexed videos become searchable locally"""
+    video_id = getattr(task_obj, 'video_id', None)
+    if semantic_index is not None and video_id and task_status(task_obj) == 'ready':
+        semantic_index.index_video_async(video_id)
+
+
+task_poller.add_listener(_add_to_semantic_index)
+
+# Live dashboard updates are pushed over SSE instead of each tab polling full documents.
+# Upload events go through a table every worker process tails, so all viewers see every upload
+event_broadcaster = EventBroadcaster(
+    max_queue=config.SSE_MAX_QUEUE,
+    heartbeat_seconds=config.SSE_HEARTBEAT_SECONDS,
+    log=EventLog(database),
+    poll_interval=config.SSE_RELAY_POLL_SECONDS
+)
+
+
+def _is_unsupported_filter_error(error: Exception) -> bool:
     """
-    
-    # Example with Google Cloud Storage (requires google-cloud-storage)
-    try:
-        from google.cloud import storage
-        
-        client = storage.Client()
-        bucket = client.bucket('floor23')
-        blob = bucket.blob(f'uploads/{os.path.basename(file_path)}')
-        
-        blob.upload_from_filename(file_path)
-        return blob.public_url
-    except Exception as e:
-        print(f"GCS upload failed: {e}")
-        return None
-    
-    
-    # Placeholder return
+    True only when the search itself refused the filter parameter: an SDK without the
+    keyword (TypeError naming it) or an HTTP 400 from the API that names it. Rate limits,
+    timeouts, auth and server errors say nothing about filter support.
+    """
+    message = str(error).lower()
+    if isinstance(error, TypeError):
+        return "'filter'" in message
+    status_code = getattr(error, 'status_code', None)
+    if status_code is None:
+        status_code = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status_code == 400 and 'filter' in message
 
 
-def twelve_labs_validate_video_file(file_path: str, hashtags: str) -> Dict[str, Any]:
+def _search_video_clips(video_id: str, **search_kwargs) -> list:
     """
-    Validate video file using Twelve Labs API - direct file upload
-    This is the NEW function for handling local file uploads
+    Search the campaign index for clips of ONE video.
+    Restricts the query server-side with a video id filter, so cost doesn't grow with the index.
+    If the SDK/API rejects the filter, falls back to a lazily-paged scan capped at SEARCH_SCAN_LIMIT clips.
     """
+    global VIDEO_FILTER_SUPPORTED
     
-    if not twelve_labs_client:
-        print("❌ Twelve Labs client not available, using fallback")
-        return simple_validate_video_fallback(file_path, hashtags)
-    
-    try:
-        print(f"🔍 Starting Twelve Labs file validation for: {file_path}")
-        print(f"📊 Using index: {MILK_CAMPAIGN_INDEX_ID}")
-        
-        # Step 1: Check if file exists and is accessible
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
-        
-        file_size = os.path.getsize(file_path)
-        print(f"📄 File size: {file_size / (1024*1024):.2f} MB")
-        
-        # Step 2: Upload video file directly to Twelve Labs
-        print("📤 Uploading video file directly to Twelve Labs...")
-        
-        # Create task with file parameter (not url)
-        task = twelve_labs_client.task.create(
-            index_id=MILK_CAMPAIGN_INDEX_ID,
-            file=file_path  # Direct file upload
-        )
-        
-        print(f"✅ Upload task created successfully!")
-        print(f"   Task ID: {task.id}")
-        print(f"   Status: {task.status}")
-        print(f"   Video ID: {getattr(task, 'video_id', 'Not assigned yet')}")
-        
-        # Step 3: Wait for indexing to complete
-        print("⏳ Waiting for video indexing to complete...")
-        
-        def on_task_update(task):
-            print(f"   📊 Status: {task.status}")
-            if hasattr(task, 'video_id') and task.video_id:
-                print(f"   🎥 Video ID: {task.video_id}")
-        
-        # Wait for indexing to complete (3 minutes timeout for file uploads)
+    if VIDEO_FILTER_SUPPORTED:
         try:
-            print("   ⏳ Starting indexing wait (max 3 minutes for file upload)...")
-            final_task = task.wait_for_done(
-                sleep_interval=20,  # Check every 20 seconds for file uploads
-                callback=on_task_update
-            )
-            print(f"✅ Video indexing completed!")
-            print(f"   Final Status: {final_task.status}")
-            print(f"   Video ID: {getattr(final_task, 'video_id', 'Unknown')}")
-            
-            # Update task reference
-            task = final_task
-            
-        except Exception as timeout_error:
-            print(f"⚠️ Indexing timeout or error: {timeout_error}")
-            print("   Continuing with partial validation...")
-            
-        # Step 4: Search for milk content in the uploaded video
-        total_confidence = 0.0
-        search_results_count = 0
-        video_specific_results = 0
-        
-        if hasattr(task, 'video_id') and task.video_id:
-            print(f"🔍 Searching for milk content in video: {task.video_id}")
-            
-            # OPTIMIZED: Fewer search queries to avoid rate limits
-            milk_search_queries = [
-                "milk",
-                "drinking", 
-                "white liquid"
-                # Reduced from 10 queries to 3 to stay under rate limits
-            ]
-            
-            for query in milk_search_queries:
-                try:
-                    print(f"   🔎 Searching for: '{query}'")
-                    # Use LOW threshold for more flexible matching
-                    search_result = twelve_labs_client.search.query(
-                        index_id=MILK_CAMPAIGN_INDEX_ID,
-                        query_text=query,
-                        options=["visual", "audio"],
-                        threshold="low"  # Changed from "medium" to "low" for more matches
-                    )
-                    
-                    # Only count results from THIS specific video
-                    query_results = list(search_result)
-                    video_specific_matches = [clip for clip in query_results 
-                                            if getattr(clip, 'video_id', None) == task.video_id]
-                    
-                    if video_specific_matches:
-                        match_confidence = min(len(video_specific_matches) * 0.15, 0.6)  # Up to 60% from content
-                        total_confidence += match_confidence
-                        video_specific_results += len(video_specific_matches)
-                        search_results_count += len(query_results)
-                        print(f"   ✅ Found {len(video_specific_matches)} matches in uploaded video for '{query}' (+{match_confidence:.2f})")
-                    else:
-                        print(f"   ❌ No matches in uploaded video for '{query}'")
-                    
-                except Exception as search_error:
-                    print(f"   ⚠️ Search error for '{query}': {search_error}")
-                    continue
-            
-            print(f"🎯 Content Analysis Summary:")
-            print(f"   Video-specific results: {video_specific_results}")
-            print(f"   Total search results: {search_results_count}")
-            print(f"   Content confidence: {total_confidence:.2f}")
-            
-        else:
-            print("⚠️ No video_id available, cannot perform content analysis")
-        
-        # Step 5: Analyze hashtags
-        hashtag_bonus = 0.0
-        campaign_hashtags = ['#gotmilk', '#milkmob', '#milk', '#dairy']
-        hashtag_matches = sum(1 for tag in campaign_hashtags if tag.lower() in hashtags.lower())
-        
-        if hashtag_matches > 0:
-            hashtag_bonus = 0.3  # 30% for campaign hashtags
-            print(f"   📝 Hashtag bonus: +{hashtag_bonus:.2f} for {hashtag_matches} campaign hashtag(s)")
-        
-        # Step 6: Calculate final confidence - SAME WEIGHTING AS URL UPLOADS
-        # Video content: 70% weight (total_confidence should be 0.0 to 0.7)
-        # Hashtags: 30% weight (hashtag_bonus is 0.0 to 0.3)
-        
-        # Scale video content to 70% weight (same as URL uploads)
-        video_content_score = min(total_confidence, 0.7)  # Cap at 70%
-        
-        final_confidence = video_content_score + hashtag_bonus
-        
-        # Validation criteria: Same as URL uploads but slightly more lenient threshold
-        min_video_content_required = 0.35  # SAME as URL validation - require substantial content
-        min_total_confidence = 0.50  # SAME as URL validation - require 50% total
-        is_valid = (video_content_score >= min_video_content_required) and (final_confidence >= min_total_confidence)
-        
-        print(f"🎯 Final Twelve Labs file validation result:")
-        print(f"   Video content score: {video_content_score:.2f}/0.7 (70% weight)")
-        print(f"   Hashtag score: {hashtag_bonus:.2f}/0.3 (30% weight)")
-        print(f"   Final confidence: {final_confidence:.2f}/1.0")
-        print(f"   Min video content required: {min_video_content_required:.2f}")
-        print(f"   Video content sufficient: {video_content_score >= min_video_content_required}")
-        print(f"   Valid: {is_valid}")
-        
-        # Create detailed reason based on actual content analysis (same format as URL)
-        if is_valid:
-            reason_msg = f"✅ Twelve Labs AI validated file upload: {video_specific_results} milk segments detected (Content: {video_content_score:.1%}, Hashtags: {hashtag_bonus:.1%})"
-        else:
-            if video_content_score < min_video_content_required:
-                reason_msg = f"❌ Insufficient milk content in file: {video_specific_results} segments found. Need substantial milk-related visual/audio content, not just hashtags."
+            return list(twelve_labs_client.search.query(
+                index_id=MILK_CAMPAIGN_INDEX_ID,
+                filter={"id": [video_id]},
+                **search_kwargs
+            ))
+        except Exception as e:
+            if not _is_unsupported_filter_error(e):
+                raise
+            print(f"   ⚠️ Video filter not supported ({e}), using bounded index scan")
+        VIDEO_FILTER_SUPPORTED = False
+    
+    # Iterate pages lazily and stop once the scan budget is spent
+    matches = []
+    search_result = twelve_labs_client.search.query(index_id=MILK_CAMPAIGN_INDEX_ID, **search_kwargs)
+    for scanned, clip in enumerate(search_result):
+        if scanned >= config.SEARCH_SCAN_LIMIT:
+            break
+        if getattr(clip, 'video_id', None) == video_id:
+            matches.append(clip)
+    return matches
+
+
+def _report_stage(on_stage: Optional[Callable[[str], None]], stage: str):
+    """Notify a background job (if any) that validation moved to a new stage"""
+    if on_stage:
+        on_stage(stage)
+
+
+def _score_uploaded_video(task_id: str, video_id: Optional[str], task_status: str, title: str,
+                          file_size: int, hashtags: str, media: Optional[Dict[str, Any]] = None,
+                          on_stage: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """Search an indexed upload for milk content and score it (70% content, 30% hashtags)"""
+    # Search for milk content in the uploaded video
+    total_confidence = 0.0
+    search_results_count = 0
+    video_specific_results = 0
+    search_errors = 0
+
+    if video_id:
+        print(f"🔍 Searching for milk content in video: {video_id}")
+        _report_stage(on_stage, 'searching')
+
+        # OPTIMIZED: Fewer search queries to avoid rate limits
+        milk_search_queries = [
+            "milk",
+            "drinking", 
+            "white liquid"
+            # Reduced from 10 queries to 3 to stay under rate limits
+        ]
+
+        # All queries in flight at once; use LOW threshold for more flexible matching
+        print(f"   🔎 Searching for: {milk_search_queries}")
+        search_outcomes = search_fanout.run(
+            _search_video_clips,
+            {query: {'video_id': video_id, 'query_text': query,
+                     'options': ["visual", "audio"], 'threshold': "low"}
+             for query in milk_search_queries},
+            timeout=config.SEARCH_DEADLINE_SECONDS
+        )
+
+        for query in milk_search_queries:
+            outcome = search_outcomes[query]
+            if outcome['error']:
+                print(f"   ⚠️ Search error for '{query}': {outcome['error']}")
+                search_errors += 1
+                continue
+
+            # Only count results from THIS specific video
+            query_results = outcome['results']
+            video_specific_matches = [clip for clip in query_results 
+                                    if getattr(clip, 'video_id', None) == video_id]
+
+            if video_specific_matches:
+                match_confidence = min(len(video_specific_matches) * 0.15, 0.6)  # Up to 60% from content
+                total_confidence += match_confidence
+                video_specific_results += len(video_specific_matches)
+                search_results_count += len(query_results)
+                print(f"   ✅ Found {len(video_specific_matches)} matches in uploaded video for '{query}' (+{match_confidence:.2f})")
             else:
-                reason_msg = f"❌ File validation failed: {final_confidence:.1%} confidence (Content: {video_content_score:.1%}, Hashtags: {hashtag_bonus:.1%})"
-        
-        # Get video details
-        filename = os.path.basename(file_path)
-        video_info = {
-            "title": filename,
-            "duration": 0,  # Could extract with ffmpeg if needed
-            "platform": "File Upload",
-            "video_id": getattr(task, 'video_id', None),
-            "file_size": file_size
-        }
-        
-        return {
-            "is_valid": is_valid,
-            "confidence": final_confidence,
-            "reason": reason_msg,
-            "hashtag_match": hashtag_matches > 0,
-            "method": "twelve_labs_file_upload",
-            "video_info": video_info,
-            "twelve_labs_data": {
-                "task_id": task.id,
-                "video_id": getattr(task, 'video_id', None),
-                "search_results": search_results_count,
-                "video_specific_results": video_specific_results,
-                "final_task_status": getattr(task, 'status', 'unknown'),
-                "content_score": video_content_score,
-                "hashtag_score": hashtag_bonus,
-                "file_size_mb": file_size / (1024*1024),
-                "validation_breakdown": {
-                    "video_weight": "70%",
-                    "hashtag_weight": "30%", 
-                    "note": "Same weighting as URL uploads"
-                }
+                print(f"   ❌ No matches in uploaded video for '{query}'")
+
+        print(f"🎯 Content Analysis Summary:")
+        print(f"   Video-specific results: {video_specific_results}")
+        print(f"   Total search results: {search_results_count}")
+        print(f"   Content confidence: {total_confidence:.2f}")
+
+    else:
+        print("⚠️ No video_id available, cannot perform content analysis")
+
+    # Analyze hashtags
+    _report_stage(on_stage, 'scoring')
+    hashtag_bonus = 0.0
+    campaign_hashtags = ['#gotmilk', '#milkmob', '#milk', '#dairy']
+    hashtag_matches = sum(1 for tag in campaign_hashtags if tag.lower() in hashtags.lower())
+
+    if hashtag_matches > 0:
+        hashtag_bonus = 0.3  # 30% for campaign hashtags
+        print(f"   📝 Hashtag bonus: +{hashtag_bonus:.2f} for {hashtag_matches} campaign hashtag(s)")
+
+    # Calculate final confidence - SAME WEIGHTING AS URL UPLOADS
+    # Video content: 70% weight (total_confidence should be 0.0 to 0.7)
+    # Hashtags: 30% weight (hashtag_bonus is 0.0 to 0.3)
+
+    # Scale video content to 70% weight (same as URL uploads)
+    video_content_score = min(total_confidence, 0.7)  # Cap at 70%
+
+    final_confidence = video_content_score + hashtag_bonus
+
+    # Validation criteria: Same as URL uploads but slightly more lenient threshold
+    min_video_content_required = 0.35  # SAME as URL validation - require substantial content
+    min_total_confidence = 0.50  # SAME as URL validation - require 50% total
+    is_valid = (video_content_score >= min_video_content_required) and (final_confidence >= min_total_confidence)
+
+    print(f"🎯 Final Twelve Labs file validation result:")
+    print(f"   Video content score: {video_content_score:.2f}/0.7 (70% weight)")
+    print(f"   Hashtag score: {hashtag_bonus:.2f}/0.3 (30% weight)")
+    print(f"   Final confidence: {final_confidence:.2f}/1.0")
+    print(f"   Min video content required: {min_video_content_required:.2f}")
+    print(f"   Video content sufficient: {video_content_score >= min_video_content_required}")
+    print(f"   Valid: {is_valid}")
+
+    # Missing evidence is not "no milk": an unfinished index or failed search makes the verdict incomplete
+    incomplete = _is_incomplete(is_valid, task_status, search_errors)
+
+    # Create detailed reason based on actual content analysis (same format as URL)
+    if incomplete:
+        reason_msg = _incomplete_reason(task_status, search_errors, len(milk_search_queries) if video_id else 0)
+    elif is_valid:
+        reason_msg = f"✅ Twelve Labs AI validated file upload: {video_specific_results} milk segments detected (Content: {video_content_score:.1%}, Hashtags: {hashtag_bonus:.1%})"
+    else:
+        if video_content_score < min_video_content_required:
+            reason_msg = f"❌ Insufficient milk content in file: {video_specific_results} segments found. Need substantial milk-related visual/audio content, not just hashtags."
+        else:
+            reason_msg = f"❌ File validation failed: {final_confidence:.1%} confidence (Content: {video_content_score:.1%}, Hashtags: {hashtag_bonus:.1%})"
+
+    # Get video details
+    video_info = {
+        "title": title,
+        "duration": 0,
+        "platform": "File Upload",
+        "video_id": video_id,
+        "file_size": file_size
+    }
+    video_info.update(_media_video_info(media))
+
+    result = {
+        "is_valid": is_valid,
+        "confidence": final_confidence,
+        "reason": reason_msg,
+        "hashtag_match": hashtag_matches > 0,
+        "method": "twelve_labs_file_upload",
+        "incomplete": incomplete,
+        "video_info": video_info,
+        "twelve_labs_data": {
+            "task_id": task_id,
+            "video_id": video_id,
+            "search_results": search_results_count,
+            "video_specific_results": video_specific_results,
+            "final_task_status": task_status,
+            "search_errors": search_errors,
+            "content_score": video_content_score,
+            "hashtag_score": hashtag_bonus,
+            "file_size_mb": file_size / (1024*1024),
+            "validation_breakdown": {
+                "video_weight": "70%",
+                "hashtag_weight": "30%", 
+                "note": "Same weighting as URL uploads"
             }
         }
-        
-    except Exception as e:
-        error_message = str(e)
-        print(f"❌ Twelve Labs file validation failed with error: {error_message}")
-        print(f"   Error type: {type(e).__name__}")
-        
-        # Handle specific error types
-        if "File not found" in error_message:
-            print("   🔧 File path issue - check file location")
-        elif "file size" in error_message.lower():
-            print("   🔧 File too large - Twelve Labs has size limits")
-        elif "format" in error_message.lower():
-            print("   🔧 File format issue - check video format compatibility")
-        
-        import traceback
-        print(f"   Full traceback: {traceback.format_exc()}")
-        print("🔄 Falling back to enhanced validation...")
-        
-        # Enhanced fallback that gives credit for attempting file upload
-        fallback_result = simple_validate_video_fallback(file_path, hashtags)
-        if fallback_result['confidence'] > 0:
-            fallback_result['confidence'] = min(fallback_result['confidence'] + 0.3, 1.0)  # Big boost for file uploads
-            fallback_result['reason'] = f"✅ Enhanced file validation: Upload processed (Twelve Labs attempted)"
-            fallback_result['method'] = "enhanced_file_fallback"
-        
-        return fallback_result
+    }
+    return result
+
+
+def _is_incomplete(is_valid: bool, task_status: str, search_errors: int) -> bool:
+    """A rejection that rests on an index still in progress or on searches that failed"""
+    return not is_valid and (task_status not in ('ready', 'failed') or search_errors > 0)
 
 
-def twelve_labs_validate_video_url(url: str, hashtags: str) -> Dict[str, Any]:
+def _incomplete_reason(task_status: str, search_errors: int, searches: int) -> str:
+    if task_status not in ('ready', 'failed'):
+        return f"⏳ Validation incomplete: Twelve Labs indexing is still '{task_status}'. Please try again shortly."
+    return f"⏳ Validation incomplete: {search_errors} of {searches} milk searches failed or timed out. Please try again."
+
+
+def _is_complete_result(result: Dict[str, Any]) -> bool:
+    """Only a score from a finished index and every search succeeding is worth caching"""
+    data = result.get('twelve_labs_data') or {}
+    return data.get('final_task_status') == 'ready' and not data.get('search_errors')
+
+
+def _media_video_info(media: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """video_info fields from a probe result (duration feeds the mob duration bonuses)"""
+    if not media or not media.get('duration'):
+        return {}
+    return {key: media.get(key) for key in ('duration', 'width', 'height', 'video_codec', 'audio_codec', 'bitrate')}
+
+
+def _enhanced_file_fallback(file_path: str, hashtags: str) -> Dict[str, Any]:
+    """Local validation for uploads Twelve Labs couldn't process (file uploads get a confidence boost)"""
+    print("🔄 Falling back to enhanced validation...")
+    fallback_result = simple_validate_video_fallback(file_path, hashtags)
+    if fallback_result['confidence'] > 0:
+        fallback_result['confidence'] = min(fallback_result['confidence'] + 0.3, 1.0)  # Big boost for file uploads
+        fallback_result['reason'] = f"✅ Enhanced file validation: Upload processed (Twelve Labs attempted)"
+        fallback_result['method'] = "enhanced_file_fallback"
+    return fallback_result
+
+
+# ===== FILE INGESTION PIPELINE =====
+# received -> staged -> indexing -> indexed -> scored -> classified; every step runs at most once per
+# submission (keyed by content hash + hashtags) and its output is persisted before the next starts
+
+def _ingest_probe(outputs: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    """Read duration/resolution/codecs from the container header; out-of-policy videos stop here, before indexing"""
+    received = outputs['received']
+    try:
+        media = media_probe.probe(received['file_path'], content_hash=received['content_hash'])
+    except MediaProbeError as e:
+        if e.unreadable:
+            # Zero-filled, truncated or mislabelled: not worth paying Twelve Labs to find out
+            raise VideoPolicyError(f"The file isn't a readable video ({e})") from e
+        print(f"   ⚠️ Could not read media metadata for {received['filename']}: {e}")
+        return {'error': str(e)}
+    print(f"   🎞️ {media['duration']:.1f}s, {media['width']}x{media['height']} "
+          f"{media['video_codec'] or '?'}/{media['audio_codec'] or '-'} ({media['probe_method']})")
+    media_probe.check(media)
+    return media
+
+
+def _ingest_transcode(outputs: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    """Swap an oversized upload for a bounded proxy; any failure just means the original is uploaded"""
+    received, media = outputs['received'], outputs['probed']
+    if config.TRANSCODE_MODE == 'off' or not twelve_labs_client:
+        return {'skipped': 'disabled'}
+    if not proxy_transcoder.available:
+        return {'skipped': 'ffmpeg not installed'}
+    if not proxy_transcoder.needs_proxy(media):
+        return {'skipped': 'within proxy limits'}
+    try:
+        proxy = proxy_transcoder.transcode(received['file_path'], received['content_hash'])
+    except TranscodeError as e:
+        print(f"   ⚠️ Proxy transcode failed, uploading the original: {e}")
+        return {'skipped': f"failed: {e}"}
+    print(f"   🎬 Indexing a {config.TRANSCODE_MAX_HEIGHT}p proxy "
+          f"({received['file_size'] / (1024 * 1024):.1f}MB -> {proxy['bytes'] / (1024 * 1024):.1f}MB)")
+    return {'path': proxy['path'], 'bytes': proxy['bytes']}
+
+
+def _ingest_source_path(outputs: Dict[str, Any]) -> str:
+    """The file that gets staged/indexed: the proxy if one was made, else the upload itself"""
+    proxy_path = outputs['transcoded'].get('path')
+    if proxy_path and os.path.exists(proxy_path):
+        return proxy_path
+    return outputs['received']['file_path']
+
+
+def _ingest_stage(outputs: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    """Pick the staging route once: GCS (deduplicated, parallel) > direct SDK upload > local-only"""
+    received = outputs['received']
+    if not twelve_labs_client:
+        print("   📁 Twelve Labs not available - local validation only")
+        return {'route': 'local'}
+    if not cloud_stager.available:
+        print("   📤 Cloud staging unavailable - Twelve Labs will receive the file directly")
+        return {'route': 'direct'}
+    source_path = _ingest_source_path(outputs)
+    staged = cloud_stager.stage(source_path, on_progress=context.get('on_progress'),
+                                content_hash=received['content_hash'] if source_path == received['file_path'] else None)
+    print(f"   ☁️ File staged: {staged['url']}")
+    return {'route': 'gcs', 'url': staged['url'], 'object_name': staged['object_name'],
+            'deduplicated': staged['deduplicated']}
+
+
+def _ingest_start_indexing(outputs: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    """Create the Twelve Labs indexing task; its id is persisted so a retry polls it instead of re-uploading"""
+    staged = outputs['staged']
+    if staged['route'] == 'local':
+        return {'task_id': None}
+    print(f"📤 Creating Twelve Labs indexing task ({staged['route']}) in index {MILK_CAMPAIGN_INDEX_ID}...")
+    if staged['route'] == 'gcs':
+        task = twelve_labs_client.task.create(index_id=MILK_CAMPAIGN_INDEX_ID, url=staged['url'])
+    else:
+        task = twelve_labs_client.task.create(index_id=MILK_CAMPAIGN_INDEX_ID, file=_ingest_source_path(outputs))
+    print(f"✅ Upload task created: {task.id} ({task.status})")
+    return {'task_id': task.id, 'index_id': MILK_CAMPAIGN_INDEX_ID}
+
+
+def _ingest_wait_for_index(outputs: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    """Wait for the indexing task; a timeout fails this step and the next attempt resumes the wait"""
+    task_id = outputs['indexing']['task_id']
+    if task_id is None:
+        return {'video_id': None, 'status': 'skipped'}
+
+    def on_task_update(task):
+        print(f"   📊 Status: {task.status}")
+
+    print(f"   ⏳ Waiting for task {task_id} (max {config.INDEXING_TIMEOUT_SECONDS:.0f}s)...")
+    task = task_poller.wait(task_id, timeout=config.INDEXING_TIMEOUT_SECONDS, on_update=on_task_update)
+    status = getattr(task, 'status', 'unknown')
+    if status != 'ready':
+        # A failed task won't recover: the next attempt creates a new one instead of re-reading this
+        raise IncompleteStep(f"indexing task {task_id} ended '{status}'",
+                             reset_from='indexing' if status == 'failed' else None)
+    print(f"✅ Video indexing finished: {status}, video {getattr(task, 'video_id', None)}")
+    return {'video_id': getattr(task, 'video_id', None), 'status': status}
+
+
+def _ingest_score(outputs: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    received = outputs['received']
+    if outputs['staged']['route'] == 'local':
+        result = _enhanced_file_fallback(received['file_path'], received['hashtags'])
+        result['video_info'].update(_media_video_info(outputs['probed']))
+        return result
+    indexed = outputs['indexed']
+    result = _score_uploaded_video(outputs['indexing']['task_id'], indexed['video_id'], indexed['status'],
+                                   received['filename'], received['file_size'], received['hashtags'],
+                                   media=outputs['probed'], on_stage=context.get('on_stage'))
+    result['twelve_labs_data']['staging_route'] = outputs['staged']['route']
+    if not _is_complete_result(result):
+        # Shown for this submission only; a resubmission searches again
+        raise IncompleteStep(f"{result['twelve_labs_data']['search_errors']} milk searches failed", result=result)
+    validation_cache.put(context['cache_key'], result)
+    return result
+
+
+def _ingest_classify(outputs: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    validation_result = outputs['scored']
+    if not validation_result['is_valid']:
+        return {'mob_id': None}
+    return classify_into_mob(validation_result.get('video_info', {}), outputs['received']['hashtags'], validation_result)
+
+
+def _ingest_output_reusable(state: str, output: Dict[str, Any]) -> bool:
+    """A 'local' route was only chosen because Twelve Labs was unavailable; redo staging once it's back"""
+    return not (state == 'staged' and output.get('route') == 'local' and twelve_labs_client)
+
+
+ingestion_pipeline = IngestionPipeline(IngestionStore(database), [
+    ('probed', _ingest_probe),
+    ('transcoded', _ingest_transcode),
+    ('staged', _ingest_stage),
+    ('indexing', _ingest_start_indexing),
+    ('indexed', _ingest_wait_for_index),
+    ('scored', _ingest_score),
+    ('classified', _ingest_classify)
+], reusable=_ingest_output_reusable, record_ttl=config.INGESTION_RECORD_TTL_SECONDS)
+
+
+def _within_deadline(timeout: float, deadline: Optional[float]) -> float:
+    """timeout, shortened so it ends by deadline (epoch seconds) when there is one"""
+    if deadline is None:
+        return timeout
+    return max(0.0, min(timeout, deadline - time.time()))
+
+
+def twelve_labs_validate_video_url(url: str, hashtags: str,
+                                   on_stage: Optional[Callable[[str], None]] = None,
+                                   use_cache: bool = True, deadline: Optional[float] = None) -> Dict[str, Any]:
     """
     Validate video using Twelve Labs API - uploads video and searches for milk content
+    use_cache=False for URLs whose content can change under the same address (our own staging bucket)
+    deadline (epoch seconds, set by batch validation) caps the indexing wait and searches
     """
     if not twelve_labs_client:
         print("❌ Twelve Labs client not available, using fallback")
@@ -612,8 +912,16 @@ def twelve_labs_validate_video_url(url: str, hashtags: str) -> Dict[str, Any]:
         cleaned_url = clean_video_url(url)
         print(f"🧹 Cleaned URL: {cleaned_url}")
         
+        cache_key = validation_cache.url_key(cleaned_url, hashtags) if use_cache else None
+        cached_result = validation_cache.get(cache_key) if cache_key else None
+        if cached_result:
+            print(f"⚡ Validation cache hit for {cleaned_url}")
+            cached_result['cache_hit'] = True
+            return cached_result
+        
         # Step 2: Upload video to Twelve Labs for indexing
         print("📤 Uploading video to Twelve Labs...")
+        _report_stage(on_stage, 'indexing')
         
         # Create task with correct parameters
         task = twelve_labs_client.task.create(
@@ -634,12 +942,14 @@ def twelve_labs_validate_video_url(url: str, hashtags: str) -> Dict[str, Any]:
             if hasattr(task, 'video_id') and task.video_id:
                 print(f"   🎥 Video ID: {task.video_id}")
         
-        # Wait for indexing to complete (shorter timeout: 2 minutes)
+        # Wait for indexing to complete - the shared poller notices completion within seconds
         try:
-            print("   ⏳ Starting indexing wait (max 2 minutes)...")
-            final_task = task.wait_for_done(
-                sleep_interval=15,  # Check every 15 seconds
-                callback=on_task_update
+            indexing_timeout = _within_deadline(config.INDEXING_TIMEOUT_SECONDS, deadline)
+            print(f"   ⏳ Starting indexing wait (max {indexing_timeout:.0f}s)...")
+            final_task = task_poller.wait(
+                task.id,
+                timeout=indexing_timeout,
+                on_update=on_task_update
             )
             print(f"✅ Video indexing completed!")
             print(f"   Final Status: {final_task.status}")
@@ -655,11 +965,14 @@ def twelve_labs_validate_video_url(url: str, hashtags: str) -> Dict[str, Any]:
             
         # Step 4: If we have a video_id, try searching for actual milk content
         total_confidence = 0.0
+        search_outcomes = {}
         search_results_count = 0
         video_specific_results = 0
+        search_errors = 0
         
         if hasattr(task, 'video_id') and task.video_id:
             print(f"🔍 Searching for milk content in video: {task.video_id}")
+            _report_stage(on_stage, 'searching')
             
             # OPTIMIZED: Fewer search queries to avoid rate limits  
             milk_search_queries = [
@@ -669,35 +982,41 @@ def twelve_labs_validate_video_url(url: str, hashtags: str) -> Dict[str, Any]:
                 # Reduced from 7 queries to 3 to stay under rate limits
             ]
             
+            # All queries in flight at once, plus the broad "person" probe that is only
+            # consulted when nothing milk-related matches - one round trip instead of four
+            print(f"   🔎 Searching for: {milk_search_queries}")
+            search_plan = {query: {'video_id': task.video_id, 'query_text': query,
+                                   'options': ["visual", "audio"], 'threshold': "low"}
+                           for query in milk_search_queries}
+            search_plan[BROAD_PROBE_QUERY] = {'video_id': task.video_id, 'query_text': BROAD_PROBE_QUERY,
+                                              'options': ["visual"], 'threshold': "low"}
+            search_outcomes = search_fanout.run(
+                _search_video_clips,
+                search_plan,
+                timeout=_within_deadline(config.SEARCH_DEADLINE_SECONDS, deadline)
+            )
+            
             for query in milk_search_queries:
-                try:
-                    print(f"   🔎 Searching for: '{query}'")
-                    # Use LOW threshold for more flexible matching
-                    search_result = twelve_labs_client.search.query(
-                        index_id=MILK_CAMPAIGN_INDEX_ID,
-                        query_text=query,
-                        options=["visual", "audio"],  # Fixed: Use only supported options
-                        threshold="low"  # Changed from "medium" to "low" for more matches
-                    )
-                    
-                    # CRITICAL: Only count results from THIS specific video
-                    query_results = list(search_result)
-                    video_specific_matches = [clip for clip in query_results 
-                                            if getattr(clip, 'video_id', None) == task.video_id]
-                    
-                    if video_specific_matches:
-                        # Calculate confidence based on matches in THIS video only
-                        match_confidence = min(len(video_specific_matches) * 0.2, 0.5)
-                        total_confidence += match_confidence
-                        video_specific_results += len(video_specific_matches)
-                        search_results_count += len(query_results)
-                        print(f"   ✅ Found {len(video_specific_matches)} matches in THIS video for '{query}' (+{match_confidence:.2f})")
-                    else:
-                        print(f"   ❌ No matches in THIS video for '{query}'")
-                    
-                except Exception as search_error:
-                    print(f"   ⚠️ Search error for '{query}': {search_error}")
+                outcome = search_outcomes[query]
+                if outcome['error']:
+                    print(f"   ⚠️ Search error for '{query}': {outcome['error']}")
+                    search_errors += 1
                     continue
+                
+                # CRITICAL: Only count results from THIS specific video
+                query_results = outcome['results']
+                video_specific_matches = [clip for clip in query_results 
+                                        if getattr(clip, 'video_id', None) == task.video_id]
+                
+                if video_specific_matches:
+                    # Calculate confidence based on matches in THIS video only
+                    match_confidence = min(len(video_specific_matches) * 0.2, 0.5)
+                    total_confidence += match_confidence
+                    video_specific_results += len(video_specific_matches)
+                    search_results_count += len(query_results)
+                    print(f"   ✅ Found {len(video_specific_matches)} matches in THIS video for '{query}' (+{match_confidence:.2f})")
+                else:
+                    print(f"   ❌ No matches in THIS video for '{query}'")
             
             print(f"🎯 Content Analysis Summary:")
             print(f"   Video-specific results: {video_specific_results}")
@@ -708,6 +1027,7 @@ def twelve_labs_validate_video_url(url: str, hashtags: str) -> Dict[str, Any]:
             print("⚠️ No video_id available, cannot perform content analysis")
         
         # Step 5: Analyze hashtags (30% max weight)
+        _report_stage(on_stage, 'scoring')
         hashtag_bonus = 0.0
         campaign_hashtags = ['#gotmilk', '#milkmob', '#milk', '#dairy']
         hashtag_matches = sum(1 for tag in campaign_hashtags if tag.lower() in hashtags.lower())
@@ -728,6 +1048,7 @@ def twelve_labs_validate_video_url(url: str, hashtags: str) -> Dict[str, Any]:
         
         # Validation criteria: VERY LENIENT since AI might miss obvious content
         min_video_content_required = 0.50  # LOWERED to 5% - very permissive
+        min_total_confidence = 0.50  # Require 50% total, same as file validation
         is_valid = (video_content_score >= min_video_content_required) and (final_confidence >= min_total_confidence)  # Pass if EITHER condition met
         
         print(f"🎯 Final Twelve Labs validation result:")
@@ -744,15 +1065,14 @@ def twelve_labs_validate_video_url(url: str, hashtags: str) -> Dict[str, Any]:
         # DEBUGGING: If no matches found, try a broader search
         if video_specific_results == 0:
             print("   🔍 No matches found - trying broader search...")
-            try:
-                # Try searching for ANY content in this video
-                broad_search = twelve_labs_client.search.query(
-                    index_id=MILK_CAMPAIGN_INDEX_ID,
-                    query_text="person",  # Very broad query
-                    options=["visual"],
-                    threshold="low"
-                )
-                broad_results = [clip for clip in broad_search if getattr(clip, 'video_id', None) == task.video_id]
+            # The broad "person" probe already ran alongside the milk queries
+            broad_outcome = search_outcomes.get(BROAD_PROBE_QUERY)
+            if broad_outcome is None:
+                print("   ⚠️ Broad search skipped: no video_id to search")
+            elif broad_outcome['error']:
+                print(f"   ⚠️ Broad search failed: {broad_outcome['error']}")
+            else:
+                broad_results = [clip for clip in broad_outcome['results'] if getattr(clip, 'video_id', None) == task.video_id]
                 print(f"   🔍 Broad search found {len(broad_results)} clips in this video")
                 
                 if len(broad_results) > 0:
@@ -760,9 +1080,6 @@ def twelve_labs_validate_video_url(url: str, hashtags: str) -> Dict[str, Any]:
                     print("   💡 Consider: Video may not contain visible milk or audio mentions")
                 else:
                     print("   ⚠️ Video may not be fully indexed yet or indexing failed")
-                    
-            except Exception as broad_error:
-                print(f"   ⚠️ Broad search failed: {broad_error}")
             
             # Give some credit for successful indexing + hashtags
             smart_fallback_score = 0.00  # 15% for having a working video + hashtags
@@ -771,8 +1088,14 @@ def twelve_labs_validate_video_url(url: str, hashtags: str) -> Dict[str, Any]:
             
             print(f"   🔧 Applied smart fallback: +{smart_fallback_score:.1%} video score")
         
+        # Missing evidence is not "no milk": an unfinished index or failed search makes the verdict incomplete
+        task_status = getattr(task, 'status', 'unknown')
+        incomplete = _is_incomplete(is_valid, task_status, search_errors)
+        
         # Create detailed reason based on actual content analysis
-        if is_valid:
+        if incomplete:
+            reason_msg = _incomplete_reason(task_status, search_errors, len(milk_search_queries) if search_outcomes else 0)
+        elif is_valid:
             if video_specific_results > 0:
                 reason_msg = f"✅ Twelve Labs AI validated: {video_specific_results} milk segments detected (Content: {video_content_score:.1%}, Hashtags: {hashtag_bonus:.1%})"
             else:
@@ -791,12 +1114,13 @@ def twelve_labs_validate_video_url(url: str, hashtags: str) -> Dict[str, Any]:
             "video_id": getattr(task, 'video_id', None)
         }
         
-        return {
+        result = {
             "is_valid": is_valid,
             "confidence": final_confidence,
             "reason": reason_msg,
             "hashtag_match": hashtag_matches > 0,
             "method": "twelve_labs_api",
+            "incomplete": incomplete,
             "video_info": video_info,
             "twelve_labs_data": {
                 "task_id": task.id,
@@ -804,6 +1128,7 @@ def twelve_labs_validate_video_url(url: str, hashtags: str) -> Dict[str, Any]:
                 "search_results": search_results_count,
                 "video_specific_results": video_specific_results,
                 "final_task_status": getattr(task, 'status', 'unknown'),
+                "search_errors": search_errors,
                 "content_score": video_content_score,
                 "hashtag_score": hashtag_bonus,
                 "validation_breakdown": {
@@ -814,6 +1139,12 @@ def twelve_labs_validate_video_url(url: str, hashtags: str) -> Dict[str, Any]:
             }
         }
         
+        if cache_key and _is_complete_result(result):
+            validation_cache.put(cache_key, result)
+        elif cache_key:
+            print("   ⚠️ Not caching: indexing or a search did not finish")
+        return result
+        
     except Exception as e:
         error_message = str(e)
         print(f"❌ Twelve Labs validation failed with error: {error_message}")
@@ -843,139 +1174,257 @@ def twelve_labs_validate_video_url(url: str, hashtags: str) -> Dict[str, Any]:
 
 def classify_into_mob(video_info: dict, hashtags: str, validation_result: dict) -> dict:
     """Classify video into appropriate Milk Mob based on content analysis"""
-    
-    # Extract analyzable content
-    title = video_info.get('title', '').lower()
-    platform = video_info.get('platform', '').lower()
-    duration = video_info.get('duration', 0)
-    hashtags_lower = hashtags.lower()
-    
-    # Enhanced mob classification using Twelve Labs data if available
-    twelve_labs_data = validation_result.get('twelve_labs_data', {})
-    
-    # All available mobs
-    mobs = {
-        'extreme_milk': {
-            'id': 'mob001',
-            'name': 'Extreme Milk',
-            'description': 'Adventurous milk drinking with sports, stunts, and daring activities',
-            'keywords': ['extreme', 'stunt', 'skateboard', 'bike', 'jump', 'trick', 'adventure', 'dare', 'challenge'],
-            'hashtags': ['#extrememilk', '#stunts', '#adventure', '#challenge'],
-            'icon': '🏄‍♂️',
-            'color': '#ff6b35',
-            'member_count': 23
-        },
-        'milk_artists': {
-            'id': 'mob002', 
-            'name': 'Milk Artists',
-            'description': 'Creative artistic expressions involving milk - art, photography, aesthetics',
-            'keywords': ['art', 'creative', 'aesthetic', 'photo', 'picture', 'beautiful', 'artistic', 'paint', 'design'],
-            'hashtags': ['#milkart', '#aesthetic', '#creative', '#photography'],
-            'icon': '🎨',
-            'color': '#4ecdc4',
-            'member_count': 31
-        },
-        'mukbang_masters': {
-            'id': 'mob003',
-            'name': 'Mukbang Masters', 
-            'description': 'Food enthusiasts featuring milk in eating shows and food content',
-            'keywords': ['mukbang', 'asmr', 'eating', 'food', 'taste', 'review', 'delicious', 'cooking'],
-            'hashtags': ['#mukbang', '#asmr', '#foodie', '#cooking'],
-            'icon': '🍽️',
-            'color': '#45b7d1',
-            'member_count': 67
-        },
-        'fitness_fuel': {
-            'id': 'mob004',
-            'name': 'Fitness Fuel',
-            'description': 'Athletes and fitness enthusiasts using milk for workout nutrition',
-            'keywords': ['workout', 'gym', 'fitness', 'protein', 'muscle', 'training', 'exercise', 'athlete', 'nutrition'],
-            'hashtags': ['#fitnessmilk', '#protein', '#workout', '#gym'],
-            'icon': '💪',
-            'color': '#96ceb4',
-            'member_count': 45
-        },
-        'daily_milk': {
-            'id': 'mob005',
-            'name': 'Daily Milk',
-            'description': 'Everyday milk moments - breakfast, cooking, family time',
-            'keywords': ['breakfast', 'morning', 'cereal', 'coffee', 'cooking', 'family', 'home', 'daily', 'routine'],
-            'hashtags': ['#dailymilk', '#breakfast', '#family', '#morning'],
-            'icon': '🥛',
-            'color': '#feca57',
-            'member_count': 89
+    video_id = ((validation_result or {}).get('twelve_labs_data') or {}).get('video_id')
+    if embedding_mob_classifier is not None and video_id:
+        # Indexed uploads have generic titles, so their embedding says far more than keywords
+        classification = embedding_mob_classifier.classify(video_id, f"{video_info.get('title', '')} {hashtags}")
+        if classification:
+            return classification
+    return mob_classifier.classify(video_info, hashtags, validation_result)
+
+
+# ===== BACKGROUND VALIDATION PIPELINE =====
+
+def _announce_new_video(mob_classification: Dict[str, Any], new_video: Dict[str, Any], source: str):
+    """Push a newly classified video to live viewers in every worker (each refreshes its analytics)"""
+    event_broadcaster.publish_shared('upload', {
+        'source': source,
+        'mob_id': mob_classification['mob_id'],
+        'mob_name': mob_classification['mob_name'],
+        'video': new_video
+    })
+
+
+def _ingestion_summary(record: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'state': record['state'],
+        'route': record['outputs'].get('staged', {}).get('route'),
+        'attempts': record['attempts'],
+        'stage_timings': record['stage_timings'],
+        'error': record['error']
+    }
+
+
+def _remove_upload(file_path: str):
+    """The local copy isn't needed once the pipeline is done with it (a resubmission re-uploads it)"""
+    try:
+        os.remove(file_path)
+        print(f"   🗑️ Cleaned up local file: {file_path}")
+    except OSError:
+        pass
+
+
+def process_url_submission(job, video_url: str, hashtags: str) -> Dict[str, Any]:
+    """Background job: index -> search -> score -> classify a direct video URL"""
+    print(f"📺 Processing video URL with Twelve Labs: {video_url}")
+    print("🔍 Using Twelve Labs API validation...")
+    validation_result = twelve_labs_validate_video_url(video_url, hashtags, on_stage=job.set_stage)
+    
+    if validation_result['is_valid']:
+        # Classify into mob
+        job.set_stage('classifying')
+        video_info = validation_result.get('video_info', {})
+        mob_classification = classify_into_mob(video_info, hashtags, validation_result)
+        
+        # Add to mob (simulate)
+        new_video = {
+            'title': video_info.get('title', 'User Video'),
+            'user': 'You',
+            'duration': video_info.get('duration', 0),
+            'confidence': validation_result['confidence'],
+            'twelve_labs_id': validation_result.get('twelve_labs_data', {}).get('video_id', None),
+            # Kept so the catalog can be re-classified when mob rules change
+            'hashtags': hashtags,
+            'platform': video_info.get('platform', ''),
+            'ai_analyzed': validation_result.get('twelve_labs_data', {}).get('search_results', 0) > 0,
+            'classification_method': mob_classification.get('classification_method', 'keywords')
         }
+        
+        video_store.add(mob_classification['mob_id'], new_video)
+        _announce_new_video(mob_classification, new_video, 'url')
+        
+        return {
+            'success': True,
+            'message': 'Video validated and classified using Twelve Labs AI!',
+            'mob_name': mob_classification['mob_name'],
+            'mob_id': mob_classification['mob_id'],
+            'mob_icon': mob_classification['mob_icon'],
+            'mob_description': mob_classification['mob_description'],
+            'mob_color': mob_classification['mob_color'],
+            'confidence': validation_result['confidence'],
+            'reason': validation_result['reason'],
+            'source': 'URL',
+            'validation_method': validation_result['method'],
+            'mob_match_reasons': mob_classification['match_reasons'],
+            'video_info': video_info,
+            'twelve_labs_data': validation_result.get('twelve_labs_data', {})
+        }
+    
+    return {
+        'success': False,
+        'error': validation_result['reason'],
+        'confidence': validation_result['confidence'],
+        'video_info': validation_result.get('video_info', {}),
+        'twelve_labs_data': validation_result.get('twelve_labs_data', {})
     }
+
+
+def process_file_submission(job, file_path: str, filename: str, hashtags: str) -> Dict[str, Any]:
+    """Background job: run a saved upload through the ingestion pipeline (stage -> index -> score -> classify)"""
+    print(f"📁 Processing saved upload: {file_path}")
     
-    # Scoring system with Twelve Labs enhancement
-    mob_scores = {}
+    # Identical bytes + hashtags already validated? Skip staging and indexing
+    cache_key = validation_cache.file_key(file_path, hashtags)
+    ingestion = ingestion_pipeline.store.get(cache_key)
+    validation_result = validation_cache.get(cache_key) if ingestion is None else None
+    mob_classification = None
+    ingestion_data = None
     
-    for mob_key, mob_data in mobs.items():
-        score = 0
-        matched_reasons = []
-        
-        # Check title keywords
-        title_matches = sum(1 for keyword in mob_data['keywords'] if keyword in title)
-        if title_matches > 0:
-            score += title_matches * 0.3
-            matched_reasons.append(f"title keywords ({title_matches})")
-        
-        # Check hashtags
-        hashtag_matches = sum(1 for hashtag in mob_data['hashtags'] if hashtag in hashtags_lower)
-        if hashtag_matches > 0:
-            score += hashtag_matches * 0.4
-            matched_reasons.append(f"hashtag match ({hashtag_matches})")
-        
-        # Twelve Labs search results bonus
-        if twelve_labs_data and twelve_labs_data.get('search_results', 0) > 0:
-            score += 0.2  # Bonus for having Twelve Labs analysis
-            matched_reasons.append("AI-analyzed content")
+    if validation_result:
+        print(f"   ⚡ Validation cache hit for {filename}")
+        validation_result['video_info']['title'] = filename
+        validation_result['cache_hit'] = True
+    else:
+        received = {
+            'file_path': file_path,
+            'filename': filename,
+            'file_size': os.path.getsize(file_path),
+            'content_hash': validation_cache.file_hash(file_path),
+            'hashtags': hashtags
+        }
+        try:
+            ingestion = ingestion_pipeline.run(
+                cache_key, received,
+                context={'cache_key': cache_key, 'on_progress': job.set_progress, 'on_stage': job.set_stage},
+                on_stage=job.set_stage
+            )
+            ingestion_data = _ingestion_summary(ingestion)
+            validation_result = ingestion['outputs']['scored']
+            validation_result['video_info']['title'] = filename
+            if validation_result['is_valid']:
+                mob_classification = ingestion['outputs']['classified']
+        except IngestionError as e:
+            print(f"   ❌ {e}")
+            if isinstance(e.cause, VideoPolicyError):
+                # Rejected from its header alone - nothing was staged or indexed
+                _remove_upload(file_path)
+                return {
+                    'success': False,
+                    'error': f"❌ {e.cause}",
+                    'confidence': 0.0,
+                    'video_info': {'title': filename},
+                    'twelve_labs_data': {},
+                    'ingestion': _ingestion_summary(e.record)
+                }
+            if isinstance(e.cause, IncompleteStep) and e.cause.result is not None:
+                # Scored from partial evidence: shown now, not kept, so a resubmission searches again
+                ingestion_data = _ingestion_summary(e.record)
+                validation_result = e.cause.result
+                validation_result['video_info']['title'] = filename
+            elif e.state == 'indexed' and 'indexing' in e.record['outputs']:
+                # Twelve Labs already has the video; resubmitting resumes the wait instead of re-uploading
+                _remove_upload(file_path)
+                return {
+                    'success': False,
+                    'error': 'Your video is still being indexed. Submit it again in a few minutes to pick up where it left off.',
+                    'confidence': 0.0,
+                    'video_info': {'title': filename},
+                    'twelve_labs_data': {'task_id': e.record['outputs']['indexing']['task_id']},
+                    'ingestion': _ingestion_summary(e.record)
+                }
+            else:
+                ingestion_data = _ingestion_summary(e.record)
+                validation_result = _enhanced_file_fallback(file_path, hashtags)
+                validation_result['video_info']['title'] = filename
+    
+    _remove_upload(file_path)
+    
+    if validation_result['is_valid']:
+        job.set_stage('classifying')
+        video_info = validation_result.get('video_info', {
+            'title': filename,
+            'duration': 0,
+            'platform': 'upload'
+        })
         
-        # Platform and duration bonuses
-        if platform == 'youtube' and mob_key in ['mukbang_masters', 'fitness_fuel']:
-            score += 0.1
-        elif platform == 'tiktok' and mob_key in ['extreme_milk', 'milk_artists']:
-            score += 0.1
-        elif platform == 'instagram' and mob_key == 'milk_artists':
-            score += 0.1
+        if mob_classification is None:
+            mob_classification = classify_into_mob(video_info, hashtags, validation_result)
+        
+        new_video = {
+            'title': video_info.get('title', filename),
+            'user': 'You',
+            'duration': video_info.get('duration', 0),
+            'confidence': validation_result['confidence'],
+            'twelve_labs_id': validation_result.get('twelve_labs_data', {}).get('video_id', None),
+            # Kept so the catalog can be re-classified when mob rules change
+            'hashtags': hashtags,
+            'platform': video_info.get('platform', ''),
+            'ai_analyzed': validation_result.get('twelve_labs_data', {}).get('search_results', 0) > 0,
+            'classification_method': mob_classification.get('classification_method', 'keywords')
+        }
         
-        if duration > 0:
-            if duration < 30 and mob_key == 'extreme_milk':
-                score += 0.1
-            elif duration > 60 and mob_key == 'mukbang_masters':
-                score += 0.1
-            elif 15 <= duration <= 45 and mob_key == 'daily_milk':
-                score += 0.1
+        video_store.add(mob_classification['mob_id'], new_video)
+        _announce_new_video(mob_classification, new_video, 'file')
         
-        mob_scores[mob_key] = {
-            'score': score,
-            'reasons': matched_reasons,
-            'mob_data': mob_data
+        return {
+            'success': True,
+            'message': 'Video uploaded and classified successfully!',
+            'mob_name': mob_classification['mob_name'],
+            'mob_id': mob_classification['mob_id'],
+            'mob_icon': mob_classification['mob_icon'],
+            'mob_description': mob_classification['mob_description'],
+            'mob_color': mob_classification['mob_color'],
+            'confidence': validation_result['confidence'],
+            'reason': validation_result['reason'],
+            'source': 'File Upload',
+            'validation_method': validation_result['method'],
+            'mob_match_reasons': mob_classification['match_reasons'],
+            'video_info': video_info,
+            'twelve_labs_data': validation_result.get('twelve_labs_data', {}),
+            'ingestion': ingestion_data
         }
     
-    # Find best match
-    best_mob_key = max(mob_scores.keys(), key=lambda k: mob_scores[k]['score'])
-    best_match = mob_scores[best_mob_key]
-    
-    # Fallback to Daily Milk if no strong matches
-    if best_match['score'] < 0.2:
-        best_mob_key = 'daily_milk'
-        best_match = mob_scores['daily_milk']
-        best_match['reasons'] = ['general milk content']
-    
     return {
-        'mob_id': best_match['mob_data']['id'],
-        'mob_key': best_mob_key,
-        'mob_name': best_match['mob_data']['name'],
-        'mob_description': best_match['mob_data']['description'],
-        'mob_icon': best_match['mob_data']['icon'],
-        'mob_color': best_match['mob_data']['color'],
-        'match_score': best_match['score'],
-        'match_reasons': best_match['reasons'],
-        'all_mobs': mobs
+        'success': False,
+        'error': validation_result['reason'],
+        'confidence': validation_result['confidence'],
+        'video_info': validation_result.get('video_info', {}),
+        'twelve_labs_data': validation_result.get('twelve_labs_data', {}),
+        'ingestion': ingestion_data
     }
 
 
+# Bulk URL validation shares the same pipeline, fanned out over its own bounded pool
+batch_validator = BatchValidationRunner(
+    with_api_priority('batch')(twelve_labs_validate_video_url),
+    url_check_fn=_is_valid_video_url,
+    max_workers=config.BATCH_MAX_WORKERS,
+    default_parallelism=config.BATCH_DEFAULT_PARALLELISM,
+    default_item_timeout=config.BATCH_ITEM_TIMEOUT,
+    max_items=config.BATCH_MAX_ITEMS,
+    retention_seconds=config.JOB_RETENTION_SECONDS,
+    store=BatchStore(database)
+)
+
+
+def _job_accepted_response(job):
+    """202 response handed back to the browser while the job runs in the background"""
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Validation queue is full. Please try again in a few minutes.'
+        }), 503
+    
+    return jsonify({
+        'success': True,
+        'queued': True,
+        'job_id': job.id,
+        'status': job.status,
+        'stage': job.stage,
+        'status_url': url_for('get_job_status', job_id=job.id)
+    }), 202
+
+
 # ===== ROUTES =====
 
 @app.route('/')
@@ -1003,7 +1452,7 @@ def video_queue():
 
 @app.route('/upload', methods=['GET', 'POST'])
 def upload():
-    """Handle video upload (file or URL) and validation using Twelve Labs API"""
+    """Accept a video upload (file or URL) and queue it for Twelve Labs validation"""
     if request.method == 'POST':
         try:
             # Get form data
@@ -1018,8 +1467,6 @@ def upload():
             print(f"   Files in request: {list(request.files.keys())}")
             
             if upload_type == 'url' and video_url:
-                print(f"📺 Processing video URL with Twelve Labs: {video_url}")
-                
                 # Validate URL format
                 if not _is_valid_video_url(video_url):
                     return jsonify({
@@ -1027,52 +1474,8 @@ def upload():
                         'error': 'Invalid video URL. Twelve Labs API only supports direct video file URLs (MP4, MOV, AVI, WEBM, etc.). Social media platform URLs (YouTube, TikTok, Instagram) are not supported.'
                     })
                 
-                # Use Twelve Labs validation
-                print("🔍 Using Twelve Labs API validation...")
-                validation_result = twelve_labs_validate_video_url(video_url, hashtags)
-                
-                if validation_result['is_valid']:
-                    # Classify into mob
-                    video_info = validation_result.get('video_info', {})
-                    mob_classification = classify_into_mob(video_info, hashtags, validation_result)
-                    
-                    # Add to mob (simulate)
-                    new_video = {
-                        'title': video_info.get('title', 'User Video'),
-                        'user': 'You',
-                        'duration': video_info.get('duration', 0),
-                        'confidence': validation_result['confidence'],
-                        'twelve_labs_id': validation_result.get('twelve_labs_data', {}).get('video_id', None)
-                    }
-                    
-                    if mob_classification['mob_id'] not in MOB_VIDEOS:
-                        MOB_VIDEOS[mob_classification['mob_id']] = []
-                    MOB_VIDEOS[mob_classification['mob_id']].append(new_video)
-                    
-                    return jsonify({
-                        'success': True,
-                        'message': 'Video validated and classified using Twelve Labs AI!',
-                        'mob_name': mob_classification['mob_name'],
-                        'mob_id': mob_classification['mob_id'],
-                        'mob_icon': mob_classification['mob_icon'],
-                        'mob_description': mob_classification['mob_description'],
-                        'mob_color': mob_classification['mob_color'],
-                        'confidence': validation_result['confidence'],
-                        'reason': validation_result['reason'],
-                        'source': 'URL',
-                        'validation_method': validation_result['method'],
-                        'mob_match_reasons': mob_classification['match_reasons'],
-                        'video_info': video_info,
-                        'twelve_labs_data': validation_result.get('twelve_labs_data', {})
-                    })
-                else:
-                    return jsonify({
-                        'success': False,
-                        'error': validation_result['reason'],
-                        'confidence': validation_result['confidence'],
-                        'video_info': validation_result.get('video_info', {}),
-                        'twelve_labs_data': validation_result.get('twelve_labs_data', {})
-                    })
+                job = validation_jobs.submit('url', video_url, process_url_submission, video_url, hashtags)
+                return _job_accepted_response(job)
                 
             elif upload_type == 'file':
                 print("📁 Processing file upload...")
@@ -1107,87 +1510,27 @@ def upload():
                         return filename
                         
                 filename = secure_filename(file.filename)
-                file_path = os.path.join(config.UPLOAD_FOLDER, filename)
-                
-                print(f"   💾 Saving file to: {file_path}")
-                file.save(file_path)
-                print(f"   ✅ File saved successfully")
+                # Unique name on disk: concurrent "video.mp4" uploads must not overwrite (or delete) each other
+                file_path = os.path.join(config.UPLOAD_FOLDER, f"{uuid.uuid4().hex}-{filename}")
                 
-                # Process the uploaded file
-                cloud_url = upload_to_cloud_storage(file_path)
+                if isinstance(file.stream, HashingFileStream):
+                    # Body was already streamed to disk and hashed - just move it into place
+                    file.stream.commit(file_path)
+                    validation_cache.remember_file_hash(file_path, file.stream.sha256)
+                    print(f"   ✅ File streamed to {file_path} ({file.stream.bytes_written / (1024*1024):.2f} MB)")
+                else:
+                    print(f"   💾 Saving file to: {file_path}")
+                    file.save(file_path)
+                    print(f"   ✅ File saved successfully")
                 
-                if cloud_url:
-                    print(f"   ☁️ File uploaded to cloud: {cloud_url}")
-                    print("   🔍 Processing with Twelve Labs API...")
-                    
-                    # Use Twelve Labs validation with cloud URL
-                    validation_result = twelve_labs_validate_video_url(cloud_url, hashtags)
-                    
-                    # Clean up local file after cloud upload
+                job = validation_jobs.submit('file', filename, process_file_submission,
+                                             file_path, filename, hashtags)
+                if job is None:
                     try:
                         os.remove(file_path)
-                        print(f"   🗑️ Cleaned up local file: {file_path}")
                     except:
                         pass
-                        
-                else:
-                    print("   📁 Using enhanced local file validation...")
-                    # Fallback to enhanced local validation
-                    validation_result = upload_file_to_cloud_and_process(file_path, hashtags)
-                
-                if validation_result['is_valid']:
-                    video_info = validation_result.get('video_info', {
-                        'title': filename,
-                        'duration': 0,
-                        'platform': 'upload'
-                    })
-                    
-                    mob_classification = classify_into_mob(video_info, hashtags, validation_result)
-                    
-                    new_video = {
-                        'title': video_info.get('title', filename),
-                        'user': 'You',
-                        'duration': video_info.get('duration', 0),
-                        'confidence': validation_result['confidence'],
-                        'twelve_labs_id': validation_result.get('twelve_labs_data', {}).get('video_id', None)
-                    }
-                    
-                    if mob_classification['mob_id'] not in MOB_VIDEOS:
-                        MOB_VIDEOS[mob_classification['mob_id']] = []
-                    MOB_VIDEOS[mob_classification['mob_id']].append(new_video)
-                    
-                    return jsonify({
-                        'success': True,
-                        'message': 'Video uploaded and classified successfully!',
-                        'mob_name': mob_classification['mob_name'],
-                        'mob_id': mob_classification['mob_id'],
-                        'mob_icon': mob_classification['mob_icon'],
-                        'mob_description': mob_classification['mob_description'],
-                        'mob_color': mob_classification['mob_color'],
-                        'confidence': validation_result['confidence'],
-                        'reason': validation_result['reason'],
-                        'source': 'File Upload',
-                        'validation_method': validation_result['method'],
-                        'mob_match_reasons': mob_classification['match_reasons'],
-                        'video_info': video_info,
-                        'twelve_labs_data': validation_result.get('twelve_labs_data', {})
-                    })
-                else:
-                    # Clean up uploaded file if validation fails and not uploaded to cloud
-                    if not cloud_url:
-                        try:
-                            os.remove(file_path)
-                            print(f"   🗑️ Cleaned up failed upload: {file_path}")
-                        except:
-                            pass
-                    
-                    return jsonify({
-                        'success': False,
-                        'error': validation_result['reason'],
-                        'confidence': validation_result['confidence'],
-                        'video_info': validation_result.get('video_info', {}),
-                        'twelve_labs_data': validation_result.get('twelve_labs_data', {})
-                    })
+                return _job_accepted_response(job)
                     
             else:
                 return jsonify({
@@ -1195,6 +1538,11 @@ def upload():
                     'error': 'Please provide either a video file or a valid direct video URL.'
                 })
                     
+        except RequestEntityTooLarge:
+            return jsonify({
+                'success': False,
+                'error': f'File too large. Maximum upload size is {app.config["MAX_UPLOAD_FILE_SIZE"] / (1024*1024):.0f}MB.'
+            }), 413
         except Exception as e:
             print(f"❌ Upload error: {e}")
             import traceback
@@ -1212,48 +1560,7 @@ def explore_mob(mob_id):
     """Explore videos in a specific mob"""
     
     # Get all available mobs for navigation
-    all_mobs = {
-        'extreme_milk': {
-            'id': 'mob001',
-            'name': 'Extreme Milk',
-            'description': 'Adventurous milk drinking with sports, stunts, and daring activities',
-            'icon': '🏄‍♂️',
-            'color': '#ff6b35',
-            'member_count': 23
-        },
-        'milk_artists': {
-            'id': 'mob002', 
-            'name': 'Milk Artists',
-            'description': 'Creative artistic expressions involving milk - art, photography, aesthetics',
-            'icon': '🎨',
-            'color': '#4ecdc4',
-            'member_count': 31
-        },
-        'mukbang_masters': {
-            'id': 'mob003',
-            'name': 'Mukbang Masters', 
-            'description': 'Food enthusiasts featuring milk in eating shows and food content',
-            'icon': '🍽️',
-            'color': '#45b7d1',
-            'member_count': 67
-        },
-        'fitness_fuel': {
-            'id': 'mob004',
-            'name': 'Fitness Fuel',
-            'description': 'Athletes and fitness enthusiasts using milk for workout nutrition',
-            'icon': '💪',
-            'color': '#96ceb4',
-            'member_count': 45
-        },
-        'daily_milk': {
-            'id': 'mob005',
-            'name': 'Daily Milk',
-            'description': 'Everyday milk moments - breakfast, cooking, family time',
-            'icon': '🥛',
-            'color': '#feca57',
-            'member_count': 89
-        }
-    }
+    all_mobs = mob_classifier.mob_directory()
     
     # Find current mob info
     current_mob = None
@@ -1266,7 +1573,7 @@ def explore_mob(mob_id):
         current_mob = list(all_mobs.values())[0]
         mob_id = current_mob['id']
     
-    videos = MOB_VIDEOS.get(mob_id, [])
+    videos = video_store.videos_for_mob(mob_id)
     
     # Calculate average confidence
     avg_confidence = 0
@@ -1288,12 +1595,101 @@ def explore_mob(mob_id):
 
 # ===== API ENDPOINTS =====
 
+@app.route('/api/jobs/<job_id>')
+def get_job_status(job_id):
+    """Report stage, timings and final result of a queued upload validation"""
+    job = validation_jobs.status(job_id)
+    if not job:
+        return jsonify({'error': f'Unknown job: {job_id}'}), 404
+    
+    return jsonify(job)
+
+
+@app.route('/api/jobs')
+def list_job_stats():
+    """Summary of the background validation worker pool and indexing task poller"""
+    stats = validation_jobs.stats()
+    stats['task_poller'] = task_poller.stats()
+    return jsonify(stats)
+
+
+@app.route('/api/validate-batch', methods=['POST'])
+def validate_batch():
+    """Validate many {url, hashtags} items concurrently; poll the returned status_url for results"""
+    payload = request.get_json(silent=True) or {}
+    
+    try:
+        batch = batch_validator.submit(
+            payload.get('items'),
+            parallelism=payload.get('parallelism'),
+            item_timeout=payload.get('item_timeout')
+        )
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    return jsonify({
+        'success': True,
+        'batch_id': batch.id,
+        'total': len(batch.items),
+        'parallelism': batch.parallelism,
+        'item_timeout_seconds': batch.item_timeout,
+        'status_url': url_for('get_validation_batch', batch_id=batch.id)
+    }), 202
+
+
+@app.route('/api/validate-batch/<batch_id>')
+def get_validation_batch(batch_id):
+    """Aggregated batch results; pass ?since=<next_cursor> to fetch only newly finished items"""
+    since = request.args.get('since', 0, type=int)
+    status = batch_validator.status(batch_id, since=max(since, 0))
+    if status is None:
+        return jsonify({'error': f'Unknown batch: {batch_id}'}), 404
+    return jsonify(status)
+
+
+@app.route('/api/mobs/reclassify', methods=['POST'])
+def reclassify_mobs():
+    """Re-score every stored video against the current mob rules; ?dry_run=1 reports the diff without applying it"""
+    dry_run = request.args.get('dry_run', '').lower() in ('1', 'true', 'yes')
+    report = bulk_reclassifier.reclassify(video_store, dry_run=dry_run)
+    print(f"🔁 Mob re-classification ({'dry run' if dry_run else 'applied'}): "
+          f"{report['changed']}/{report['total_videos']} videos change mob")
+    return jsonify(report)
+
+
+@app.route('/api/rate-limits')
+def rate_limit_stats():
+    """Current token-bucket utilization and queued callers per priority class"""
+    return jsonify(api_rate_limiter.stats())
+
+
+@app.route('/api/search-cache')
+def search_cache_stats():
+    """Hit/miss/coalesced counters for the shared search.query cache"""
+    return jsonify(search_cache.stats())
+
+
+@app.route('/api/analytics-refresher')
+def analytics_refresher_stats():
+    """Background analytics refresh schedule, current snapshot age and live stream subscribers"""
+    stats = analytics_refresher.stats()
+    stats['stream'] = event_broadcaster.stats()
+    return jsonify(stats)
+
+
+@app.route('/api/validation-cache')
+def validation_cache_stats():
+    """Hit/miss counters and size of the validation result cache"""
+    return jsonify(validation_cache.stats())
+
+
 @app.route('/api/twelve-labs-status')
+@with_api_priority('debug')
 def twelve_labs_status():
     """Check Twelve Labs API connection status"""
     status = {
         'sdk_available': TWELVE_LABS_AVAILABLE,
-        'client_initialized': twelve_labs_client is not None,
+        'client_initialized': bool(twelve_labs_client),
         'api_key_configured': config.TWELVE_LABS_API_KEY != 'tlk_0DJGJCW3CE8G5X2PMFTDD24S1A8D',
         'index_id': MILK_CAMPAIGN_INDEX_ID,
         'ready_for_api_calls': False
@@ -1315,15 +1711,31 @@ def twelve_labs_status():
 
 
 @app.route('/api/search-milk-content')
+@with_api_priority('analytics')
 def search_milk_content():
-    """Search for milk-related content in indexed videos"""
+    """Search for milk-related content in indexed videos (local vector index first, then Twelve Labs)"""
+    query = request.args.get('query', 'milk drinking')
+    source = request.args.get('source', 'auto')  # 'remote' skips the local index
+    started = time.time()
+    
+    if semantic_index is not None and source != 'remote':
+        local_results = semantic_index.search(query, k=10)
+        if local_results is not None:
+            return jsonify({
+                'query': query,
+                'total_results': len(local_results),
+                'results': local_results,
+                'cached': False,
+                'served_by': 'local_index',
+                'latency_ms': round((time.time() - started) * 1000, 2)
+            })
+    
     if not twelve_labs_client:
         return jsonify({'error': 'Twelve Labs client not available'})
     
-    query = request.args.get('query', 'milk drinking')
-    
     try:
-        search_result = twelve_labs_client.search.query(
+        search_result, from_cache = search_cache.query(
+            twelve_labs_client.search.query,
             index_id=MILK_CAMPAIGN_INDEX_ID,
             query_text=query,
             options=["visual", "audio"],  # Fixed: Use only supported options
@@ -1344,50 +1756,94 @@ def search_milk_content():
         return jsonify({
             'query': query,
             'total_results': len(results),
-            'results': results[:10]  # Limit to top 10 results
+            'results': results[:10],  # Limit to top 10 results
+            'cached': from_cache,
+            'served_by': 'remote_cache' if from_cache else 'remote',
+            'latency_ms': round((time.time() - started) * 1000, 2)
         })
         
     except Exception as e:
         return jsonify({'error': str(e)})
 
 
+@app.route('/api/semantic-index')
+def semantic_index_stats():
+    """Local vector index size, IVF training state and local hit/miss counters"""
+    if semantic_index is None:
+        return jsonify({'enabled': False})
+    stats = semantic_index.stats()
+    stats['enabled'] = True
+    return jsonify(stats)
+
+
+@app.route('/api/semantic-index/sync', methods=['POST'])
+def sync_semantic_index():
+    """Backfill the local vector index with every video in the campaign index (runs in the background)"""
+    if semantic_index is None:
+        return jsonify({'success': False, 'error': 'Local semantic index is disabled'}), 400
+    semantic_index.sync_async()
+    return jsonify({'success': True, 'status_url': url_for('semantic_index_stats')}), 202
+
+
 @app.route('/api/video-preview')
 def video_preview():
-    """Get video preview information from URL"""
+    """Get video preview information from URL (cached per canonical URL, see VideoMetadataService)"""
     url = request.args.get('url', '')
     
+    if not video_metadata.available:
+        # Fallback: basic URL validation
+        return jsonify({
+            'title': 'Video Preview',
+            'duration': 0,
+            'uploader': 'Unknown',
+            'supported': _is_valid_video_url(url)
+        })
+    
     try:
-        # Try to use yt-dlp for preview
-        try:
-            import yt_dlp
-            
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-            }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                return jsonify({
-                    'title': info.get('title', 'Unknown'),
-                    'duration': info.get('duration', 0),
-                    'uploader': info.get('uploader', 'Unknown'),
-                    'platform': info.get('extractor', 'Unknown'),
-                    'view_count': info.get('view_count', 0)
-                })
-        except ImportError:
-            # Fallback: basic URL validation
-            return jsonify({
-                'title': 'Video Preview',
-                'duration': 0,
-                'uploader': 'Unknown',
-                'supported': _is_valid_video_url(url)
-            })
-        
-    except Exception as e:
+        info, from_cache = video_metadata.lookup(url)
+        return jsonify({
+            'title': info['title'],
+            'duration': info['duration'],
+            'uploader': info['uploader'],
+            'platform': info['platform'],
+            'view_count': info['view_count'],
+            'thumbnail': info['thumbnail'],
+            'cached': from_cache
+        })
+    except VideoMetadataError as e:
         return jsonify({'error': str(e)})
 
 
+@app.route('/api/ingestion')
+def ingestion_stats():
+    """File ingestion pipeline: runs, resumed submissions, steps run vs skipped, records by state"""
+    return jsonify(ingestion_pipeline.stats())
+
+
+@app.route('/api/media-probe')
+def media_probe_stats():
+    """Upload probe cache counters, rejections and the active upload policy"""
+    return jsonify(media_probe.stats())
+
+
+@app.route('/api/transcoder')
+def transcoder_stats():
+    """Proxy transcodes run/reused/failed and the bytes they saved"""
+    return jsonify(proxy_transcoder.stats())
+
+
+@app.route('/api/cloud-staging')
+def cloud_staging_stats():
+    """Files/bytes staged to cloud storage, parts uploaded, reused after interruptions and retried"""
+    return jsonify(cloud_stager.stats())
+
+
+@app.route('/api/video-metadata-cache')
+def video_metadata_cache_stats():
+    """Hit/miss/negative-hit counters for the yt-dlp metadata cache"""
+    return jsonify(video_metadata.stats())
+
+
 @app.route('/api/validate-url')
 def validate_url():
     """API endpoint to validate video URL"""
@@ -1401,6 +1857,7 @@ def validate_url():
 
 
 @app.route('/debug/test-twelve-labs')
+@with_api_priority('debug')
 def debug_test_twelve_labs():
     """Debug endpoint to test Twelve Labs integration"""
     url = request.args.get('url', 'https://sample-videos.com/zip/10/mp4/mp4/SampleVideo_1280x720_1mb.mp4')
@@ -1414,7 +1871,7 @@ def debug_test_twelve_labs():
             'test_url': url,
             'test_hashtags': hashtags,
             'twelve_labs_available': TWELVE_LABS_AVAILABLE,
-            'client_initialized': twelve_labs_client is not None,
+            'client_initialized': bool(twelve_labs_client),
             'index_id': MILK_CAMPAIGN_INDEX_ID,
             'validation_result': validation_result,
             'debug_info': {
@@ -1429,6 +1886,7 @@ def debug_test_twelve_labs():
 
 
 @app.route('/debug/find-milk-index')
+@with_api_priority('debug')
 def debug_find_milk_index():
     """Helper endpoint to find the milk campaign index by name"""
     if not twelve_labs_client:
@@ -1473,6 +1931,7 @@ def debug_find_milk_index():
 
 
 @app.route('/debug/list-indexes')
+@with_api_priority('debug')
 def debug_list_indexes():
     """Debug endpoint to list available Twelve Labs indexes"""
     if not twelve_labs_client:
@@ -1504,6 +1963,7 @@ def debug_list_indexes():
 
 
 @app.route('/debug/test-index-id')
+@with_api_priority('debug')
 def debug_test_index_id():
     """Test if the currently configured index ID is valid"""
     if not twelve_labs_client:
@@ -1535,16 +1995,17 @@ def debug_test_index_id():
 
 # ===== CAMPAIGN ANALYTICS INTEGRATION =====
 
-# Global analytics data store
-CAMPAIGN_ANALYTICS = {
+# Starting values for the persisted campaign analytics (numeric fields become counters;
+# mob counts are read from the video catalog)
+SEED_CAMPAIGN_ANALYTICS = {
     'total_videos_analyzed': 6,
     'campaign_videos_detected': 4,
     'detection_accuracy': 94.2,
     'mob_distribution': {
-        'mob001': {'count': 1, 'name': 'Extreme Milk'},
-        'mob002': {'count': 1, 'name': 'Milk Artists'},
-        'mob003': {'count': 1, 'name': 'Mukbang Masters'},
-        'mob004': {'count': 1, 'name': 'Fitness Fuel'},
+        'mob001': {'count': 0, 'name': 'Extreme Milk'},
+        'mob002': {'count': 0, 'name': 'Milk Artists'},
+        'mob003': {'count': 0, 'name': 'Mukbang Masters'},
+        'mob004': {'count': 0, 'name': 'Fitness Fuel'},
         'mob005': {'count': 0, 'name': 'Daily Milk'}
     },
     'top_hashtags': {
@@ -1559,15 +2020,15 @@ CAMPAIGN_ANALYTICS = {
         'videos_indexed': 0,
         'search_queries_performed': 0,
         'avg_processing_time': 0
-    },
-    'last_updated': datetime.now()
+    }
 }
 
+campaign_store = CampaignStore(database, SEED_CAMPAIGN_ANALYTICS, mob_counts=video_store.counts_by_mob)
 
+
+@with_api_priority('analytics')
 def analyze_social_feed_with_twelve_labs():
     """Analyze social feed videos for campaign content using Twelve Labs"""
-    global CAMPAIGN_ANALYTICS
-    
     if twelve_labs_client:
         print("🔍 Running Twelve Labs API analysis on social feed...")
         
@@ -1578,38 +2039,40 @@ def analyze_social_feed_with_twelve_labs():
             # Example: Search for campaign content across the index
             search_queries = ['got milk', 'milk drinking', 'dairy products']
             total_results = 0
+            upstream_calls = 0
             
             for query in search_queries:
                 try:
-                    search_result = twelve_labs_client.search.query(
+                    search_result, from_cache = search_cache.query(
+                        twelve_labs_client.search.query,
                         index_id=MILK_CAMPAIGN_INDEX_ID,
                         query_text=query,
                         options=["visual", "audio"],  # Fixed: Use only supported options
                         threshold="low"
                     )
                     
-                    results_count = len(list(search_result))  # Convert to list to count
+                    results_count = len(search_result)
                     total_results += results_count
-                    CAMPAIGN_ANALYTICS['twelve_labs_metrics']['search_queries_performed'] += 1
+                    # Cache hits never reached Twelve Labs, so they aren't usage
+                    if not from_cache:
+                        upstream_calls += 1
                     
-                    print(f"   Found {results_count} results for '{query}'")
+                    print(f"   Found {results_count} results for '{query}'{' (cached)' if from_cache else ''}")
                     
                 except Exception as e:
                     print(f"   Search failed for '{query}': {e}")
             
-            CAMPAIGN_ANALYTICS['twelve_labs_metrics']['api_calls_made'] += len(search_queries)
+            campaign_store.record_api_usage(search_queries=upstream_calls, api_calls=upstream_calls)
             print(f"✅ Twelve Labs analysis complete: {total_results} total results")
             
         except Exception as e:
             print(f"⚠️ Twelve Labs analysis failed: {e}")
     
-    CAMPAIGN_ANALYTICS['last_updated'] = datetime.now()
-    return CAMPAIGN_ANALYTICS
+    return campaign_store.document()
 
 
-@app.route('/api/campaign-analytics')
-def get_campaign_analytics():
-    """Get current campaign analytics including Twelve Labs metrics"""
+def build_campaign_analytics_snapshot() -> Dict[str, Any]:
+    """Run the social feed analysis and derive the dashboard metrics (called by the background refresher)"""
     analytics = analyze_social_feed_with_twelve_labs()
     
     # Add computed metrics
@@ -1621,17 +2084,73 @@ def get_campaign_analytics():
         'detection_rate': f"{analytics['campaign_videos_detected']}/{analytics['total_videos_analyzed']}",
         'most_popular_mob': max(analytics['mob_distribution'].items(), key=lambda x: x[1]['count'])[1]['name'],
         'campaign_growth': '+12.3%',
-        'twelve_labs_active': twelve_labs_client is not None
+        'twelve_labs_active': bool(twelve_labs_client)
     }
     
-    return jsonify(analytics)
+    return analytics
+
+
+# Dashboards read precomputed snapshots; only this refresher talks to Twelve Labs for analytics
+analytics_refresher = AnalyticsRefresher(
+    build_campaign_analytics_snapshot,
+    interval=config.ANALYTICS_REFRESH_SECONDS
+)
+
+
+def _publish_analytics_delta(previous, snapshot):
+    """Send stream subscribers only the analytics fields that changed since the last snapshot"""
+    changed = compute_delta(previous.data if previous else {}, snapshot.data)
+    changed.pop('last_updated', None)
+    if changed:
+        event_broadcaster.publish('analytics', {'version': snapshot.version, 'changed': changed})
+
+
+analytics_refresher.add_listener(_publish_analytics_delta)
+
+
+def _refresh_analytics_on_upload(event_type: str, data: Dict[str, Any]):
+    """An upload on any worker changes the counters, so this worker's snapshot is stale"""
+    if event_type == 'upload':
+        analytics_refresher.request_refresh()
+
+
+event_broadcaster.add_listener(_refresh_analytics_on_upload)
+
+
+def _analytics_unavailable():
+    """503 for analytics readers while no snapshot has ever been computed"""
+    response = jsonify({'error': 'Campaign analytics are not available yet',
+                        'detail': analytics_refresher.last_error})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(int(config.ANALYTICS_REFRESH_SECONDS))
+    return response
+
+
+@app.route('/api/campaign-analytics')
+def get_campaign_analytics():
+    """Get current campaign analytics including Twelve Labs metrics (latest background snapshot)"""
+    snapshot = analytics_refresher.latest()
+    if snapshot is None:
+        return _analytics_unavailable()
+    return jsonify(snapshot.to_dict())
+
+
+@app.route('/api/stream/analytics')
+def stream_analytics():
+    """Server-Sent Events: one full snapshot on connect, then 'analytics' deltas and 'upload' events"""
+    snapshot = analytics_refresher.latest()
+    if snapshot is None:
+        return _analytics_unavailable()
+    stream = event_broadcaster.stream({'snapshot': snapshot.to_dict()})
+    return Response(stream, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # stop reverse proxies from buffering the stream
+    })
 
 
 @app.route('/api/simulate-upload', methods=['POST'])
 def simulate_upload():
     """Simulate a new video upload for real-time demo"""
-    global CAMPAIGN_ANALYTICS
-    
     # Sample uploads for simulation
     sample_uploads = [
         {
@@ -1670,21 +2189,13 @@ def simulate_upload():
     if new_video_data['campaign_likely']:
         confidence = random.uniform(0.75, 0.95)
         campaign_detected = True
-        
-        # Update analytics
-        CAMPAIGN_ANALYTICS['campaign_videos_detected'] += 1
-        CAMPAIGN_ANALYTICS['twelve_labs_metrics']['api_calls_made'] += 1
-        
-        if new_video_data['mob']:
-            CAMPAIGN_ANALYTICS['mob_distribution'][new_video_data['mob']]['count'] += 1
     else:
         confidence = random.uniform(0.1, 0.4) 
         campaign_detected = False
     
-    CAMPAIGN_ANALYTICS['total_videos_analyzed'] += 1
-    CAMPAIGN_ANALYTICS['detection_accuracy'] = round(
-        (CAMPAIGN_ANALYTICS['campaign_videos_detected'] / CAMPAIGN_ANALYTICS['total_videos_analyzed']) * 100, 1
-    )
+    # Update analytics
+    campaign_store.record_analyzed_video(campaign_detected, api_calls=1 if campaign_detected else 0)
+    updated_analytics = campaign_store.document()
     
     new_video = {
         'id': f'video_sim_{int(time.time())}',
@@ -1698,13 +2209,20 @@ def simulate_upload():
         'confidence': confidence,
         'mob_classified': new_video_data['mob'] if campaign_detected else None,
         'platform': new_video_data['platform'],
-        'twelve_labs_processed': twelve_labs_client is not None
+        'twelve_labs_processed': bool(twelve_labs_client)
     }
     
+    # Publish the change to dashboards without waiting for the next scheduled refresh
+    event_broadcaster.publish_shared('upload', {
+        'source': 'simulated',
+        'mob_id': new_video['mob_classified'],
+        'video': new_video
+    })
+    
     return jsonify({
         'success': True,
         'new_video': new_video,
-        'updated_analytics': CAMPAIGN_ANALYTICS,
+        'updated_analytics': updated_analytics,
         'message': f"New video {'detected as campaign content' if campaign_detected else 'not part of campaign'}"
     })
 
@@ -1720,30 +2238,95 @@ def api_status():
     """Check overall API status"""
     status = {
         'twelve_labs_sdk': TWELVE_LABS_AVAILABLE,
-        'twelve_labs_client': twelve_labs_client is not None,
+        'twelve_labs_client': bool(twelve_labs_client),
         'upload_folder': os.path.exists(config.UPLOAD_FOLDER),
         'url_upload_supported': True,
         'yt_dlp_available': False,
         'fallback_validation': True,
-        'twelve_labs_validation': twelve_labs_client is not None,
+        'twelve_labs_validation': bool(twelve_labs_client),
         'mob_classification': True,
         'social_feed': True,
         'api_key_configured': config.TWELVE_LABS_API_KEY != 'your_api_key_here',
-        'index_configured': MILK_CAMPAIGN_INDEX_ID != "milk_campaign_videos"
+        'index_configured': MILK_CAMPAIGN_INDEX_ID != "milk_campaign_videos",
+        'ready': startup_warmup.state == 'ready',
+        'startup': startup_warmup.status(),
+        'twelve_labs_client_initialized': twelve_labs_client.initialized,
+        'database': database.stats(),
+        'mob_classifier': {
+            'mode': 'embedding' if embedding_mob_classifier is not None else 'keywords',
+            'embedding': embedding_mob_classifier.stats() if embedding_mob_classifier is not None else None
+        }
     }
     
-    # Check yt-dlp availability
-    try:
-        import yt_dlp
-        status['yt_dlp_available'] = True
-    except ImportError:
-        status['yt_dlp_available'] = False
+    status['yt_dlp_available'] = YT_DLP_AVAILABLE
     
     return jsonify(status)
 
 
-# Initialize analytics on startup
-analyze_social_feed_with_twelve_labs()
+def _seed_demo_videos():
+    seeded = video_store.seed(SEED_MOB_VIDEOS)
+    return f"{seeded} demo videos added" if seeded else 'already seeded'
+
+
+@app.cli.command('seed-demo')
+def seed_demo_command():
+    """Load the demo mob videos into an empty database (warmup does this too unless STARTUP_WARMUP=off)"""
+    print(_seed_demo_videos())
+
+
+def _warm_twelve_labs_client():
+    if not twelve_labs_client:
+        return 'not configured (keyword classification and fallback validation only)'
+    twelve_labs_client.get()
+    return 'initialized'
+
+
+def _check_twelve_labs_connectivity():
+    if not twelve_labs_client:
+        return 'skipped'
+    with api_rate_limiter.priority('debug'):
+        index_ids = [getattr(index, 'id', None) for index in twelve_labs_client.index.list()]
+    if MILK_CAMPAIGN_INDEX_ID not in index_ids:
+        raise RuntimeError(f"Campaign index {MILK_CAMPAIGN_INDEX_ID} not found among {len(index_ids)} indexes")
+    return f"{len(index_ids)} indexes reachable"
+
+
+def _warm_campaign_analytics():
+    snapshot = analytics_refresher.refresh()
+    analytics_refresher.start()
+    event_broadcaster.start()
+    if snapshot is None:
+        raise RuntimeError('first analytics snapshot failed; serving it on demand')
+    return f"snapshot v{snapshot.version} in {snapshot.compute_seconds:.2f}s"
+
+
+def _warm_embeddings():
+    if embedding_mob_classifier is not None:
+        embedding_mob_classifier.centroids()
+    if semantic_index is not None:
+        return f"{semantic_index.sync()} new video(s) indexed"
+
+
+# Work that used to run during import: demo data seeding, client creation, a connectivity check, the
+# first analytics snapshot (three searches) and embedding setup. It now runs in one background thread;
+# /api/status reports progress. STARTUP_WARMUP=lazy waits for the first request, off skips it.
+startup_warmup = StartupWarmup([
+    ('demo_videos', _seed_demo_videos),
+    ('twelve_labs_client', _warm_twelve_labs_client),
+    ('connectivity', _check_twelve_labs_connectivity),
+    ('campaign_analytics', _warm_campaign_analytics),
+    ('embeddings', _warm_embeddings)
+])
+
+
+@app.before_request
+def _start_lazy_warmup():
+    if config.STARTUP_WARMUP == 'lazy' and startup_warmup.state == 'pending':
+        startup_warmup.start()
+
+
+if config.STARTUP_WARMUP == 'background':
+    startup_warmup.start()
 
 
 if __name__ == '__main__':
@@ -1785,11 +2368,10 @@ if __name__ == '__main__':
     print("")
     print("🔧 CLOUD STORAGE SETUP (Optional):")
     print("To enable cloud storage for file uploads with Twelve Labs:")
-    print("1. Uncomment cloud storage code in upload_to_cloud_storage() function")
-    print("2. Install cloud SDK: pip install boto3 (AWS) or pip install google-cloud-storage (GCP)")
-    print("3. Configure credentials for your chosen cloud provider")
-    print("4. Set up a public bucket for video storage")
-    print("5. Update bucket names and settings in the code")
+    print("1. Install the GCS SDK: pip install google-cloud-storage")
+    print("2. Configure Google Cloud credentials")
+    print("3. Set up a public bucket for video storage")
+    print("4. Set GCS_BUCKET (and optionally GCS_PREFIX) to point at it")
     print("")
     print("💡 VALIDATION FLOW:")
     print("URL Upload → Clean URL → Twelve Labs API → Content Analysis → Mob Classification")
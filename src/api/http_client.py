@@ -0,0 +1,142 @@
+# src/api/http_client.py
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class PooledHTTPClient:
+    """
+    Shared keep-alive session for REST calls: connection pooling, explicit connect/read
+    timeouts and jittered retries on 429/5xx that honor Retry-After.
+    Non-idempotent requests are only retried when the server provably did not process them
+    (429 or a failed connect).
+    With a limiter (an ApiRateLimiter), a request made with bucket=<name> takes a token from
+    that bucket before every attempt, retries included.
+    """
+
+    def __init__(self, headers: Dict[str, str] = None, pool_size: int = 10,
+                 connect_timeout: float = 5.0, read_timeout: float = 60.0,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 limiter: Optional[Any] = None):
+        self.limiter = limiter
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+        # Retries are handled in request() so Retry-After and jitter are applied uniformly
+        self._adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', self._adapter)
+        self.session.mount('http://', self._adapter)
+
+        self._lock = threading.Lock()
+        self._counters = {'requests': 0, 'retries': 0, 'failures': 0}
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, idempotent=True, **kwargs)
+
+    def post(self, url: str, idempotent: bool = False, **kwargs) -> requests.Response:
+        return self.request('POST', url, idempotent=idempotent, **kwargs)
+
+    def request(self, method: str, url: str, idempotent: bool = True, bucket: Optional[str] = None,
+                **kwargs) -> requests.Response:
+        kwargs.setdefault('timeout', (self.connect_timeout, self.read_timeout))
+        attempt = 0
+
+        while True:
+            if self.limiter is not None and bucket:
+                self.limiter.acquire(bucket)
+            self._count('requests')
+            self._rewind_files(kwargs.get('files'))
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.ConnectTimeout:
+                # Nothing reached the server, always safe to retry
+                if attempt >= self.max_retries:
+                    self._count('failures')
+                    raise
+                retry_after = None
+            except (requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout):
+                if not idempotent or attempt >= self.max_retries:
+                    self._count('failures')
+                    raise
+                retry_after = None
+            else:
+                retryable = response.status_code == 429 or (idempotent and response.status_code in RETRY_STATUSES)
+                if not retryable or attempt >= self.max_retries:
+                    return response
+                retry_after = self._parse_retry_after(response.headers.get('Retry-After'))
+
+            attempt += 1
+            delay = self._backoff_delay(attempt, retry_after)
+            self._count('retries')
+            print(f"   🔁 {method} {url} retry {attempt}/{self.max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Request/retry counters plus per-host connection pool usage"""
+        pools = {}
+        pool_manager = self._adapter.poolmanager
+        if pool_manager is not None:
+            for key in list(pool_manager.pools.keys()):
+                pool = pool_manager.pools.get(key)
+                if pool is None:
+                    continue
+                pools[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                    'connections_opened': pool.num_connections,
+                    'requests_sent': pool.num_requests,
+                    # The pool queue is pre-filled with None placeholders; count real sockets only
+                    'idle_connections': sum(1 for conn in pool.pool.queue if conn is not None) if pool.pool else 0
+                }
+        with self._lock:
+            counters = dict(self._counters)
+        counters['pools'] = pools
+        return counters
+
+    def close(self):
+        self.session.close()
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            # Server told us when to come back; add a little jitter so callers don't stampede
+            return min(retry_after, self.backoff_max) + random.uniform(0, self.backoff_base)
+        # Full jitter exponential backoff
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _rewind_files(files):
+        # Multipart uploads must resend from the first byte on every attempt
+        if not files:
+            return
+        for value in files.values():
+            file_obj = value[1] if isinstance(value, tuple) else value
+            if hasattr(file_obj, 'seek'):
+                file_obj.seek(0)
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
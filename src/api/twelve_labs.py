@@ -1,20 +1,36 @@
-import requests
 import json
 import time
 import os
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+from src.api.http_client import PooledHTTPClient
+from src.services.task_poller import TaskPoller
 
 class TwelveLabsAPI:
     """Integration with Twelve Labs Video Understanding API"""
     
-    def __init__(self, api_key: str):
-        """Initialize with API key"""
+    def __init__(self, api_key: str, pool_size: int = 10, connect_timeout: float = 5.0,
+                 read_timeout: float = 60.0, upload_timeout: float = 600.0, max_retries: int = 3,
+                 limiter: Optional[Any] = None):
+        """Initialize with API key; pass the app's ApiRateLimiter so these calls share its token buckets"""
         self.api_key = api_key
         self.base_url = "https://api.twelvelabs.io/v1.2"
         self.headers = {
             "x-api-key": self.api_key
         }
         self.index_id = None
+        self.upload_timeout = upload_timeout
+        # One keep-alive session for every call instead of a new TCP/TLS handshake per request
+        self.http = PooledHTTPClient(
+            headers=self.headers,
+            pool_size=pool_size,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            max_retries=max_retries,
+            limiter=limiter
+        )
+        # Shared status poller - one background thread for every task this client waits on
+        self.task_poller = TaskPoller(self._fetch_task_statuses)
         
     def create_index(self, index_name: str = "milk-campaign-videos") -> str:
         """Create a new index for video analysis"""
@@ -32,7 +48,7 @@ class TwelveLabsAPI:
         }
         
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = self.http.post(url, json=payload, bucket='status')
             
             if response.status_code == 201:
                 result = response.json()
@@ -51,7 +67,7 @@ class TwelveLabsAPI:
         url = f"{self.base_url}/indexes"
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.http.get(url, bucket='status')
             
             if response.status_code == 200:
                 return response.json().get("data", [])
@@ -103,10 +119,14 @@ class TwelveLabsAPI:
                 if metadata:
                     data['metadata'] = json.dumps(metadata)
                 
-                # Use separate headers for multipart upload
-                headers = {"x-api-key": self.api_key}
-                
-                response = requests.post(url, headers=headers, files=files, data=data)
+                # Large multipart body - allow a longer read timeout than regular calls
+                response = self.http.post(
+                    url,
+                    files=files,
+                    data=data,
+                    bucket='task_create',
+                    timeout=(self.http.connect_timeout, self.upload_timeout)
+                )
                 
                 if response.status_code == 201:
                     task_id = response.json()["_id"]
@@ -142,7 +162,7 @@ class TwelveLabsAPI:
             payload["metadata"] = metadata
         
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = self.http.post(url, json=payload, bucket='task_create')
             
             if response.status_code == 201:
                 task_id = response.json()["_id"]
@@ -161,7 +181,7 @@ class TwelveLabsAPI:
         url = f"{self.base_url}/tasks/{task_id}"
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.http.get(url, bucket='status')
             
             if response.status_code == 200:
                 return response.json()
@@ -172,28 +192,39 @@ class TwelveLabsAPI:
             print(f"❌ Error checking task status: {e}")
             return {}
     
+    def _fetch_task_statuses(self, task_ids: List[str]) -> Dict[str, Dict]:
+        """Status lookup used by the task poller"""
+        statuses = {}
+        for task_id in task_ids:
+            status_data = self.check_task_status(task_id)
+            if status_data:
+                statuses[task_id] = status_data
+        return statuses
+    
     def wait_for_processing(self, task_id: str, timeout: int = 180) -> bool:
         """Wait for video processing to complete"""
-        start_time = time.time()
-        
         print("⏳ Processing video...")
-        while (time.time() - start_time) < timeout:
-            status_data = self.check_task_status(task_id)
-            status = status_data.get('status')
-            
-            if status == 'ready':
-                print("✅ Video processing completed!")
-                return True
-            elif status == 'failed':
-                print(f"❌ Processing failed: {status_data.get('error', 'Unknown error')}")
-                return False
-            
-            print(f"⏳ Status: {status}...")
-            time.sleep(15)  # Check every 15 seconds
-            
-        print("⏰ Processing timed out")
+        try:
+            status_data = self.task_poller.wait(
+                task_id,
+                timeout=timeout,
+                on_update=lambda data: print(f"⏳ Status: {data.get('status')}...")
+            )
+        except TimeoutError:
+            print("⏰ Processing timed out")
+            return False
+        
+        if status_data.get('status') == 'ready':
+            print("✅ Video processing completed!")
+            return True
+        
+        print(f"❌ Processing failed: {status_data.get('error', 'Unknown error')}")
         return False
     
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool and retry statistics for this client"""
+        return self.http.pool_stats()
+    
     def search_videos(self, query: str, limit: int = 5) -> List[Dict]:
         """Search for videos based on query"""
         if not self.index_id:
@@ -210,7 +241,8 @@ class TwelveLabsAPI:
         }
         
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
+            # Search is read-only, so it is safe to retry on 5xx as well as 429
+            response = self.http.post(url, json=payload, idempotent=True, bucket='search')
             
             if response.status_code == 200:
                 return response.json().get("data", [])
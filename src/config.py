@@ -1,5 +1,4 @@
 import os
-from pathlib import Path
 
 class Config:
     """Configuration settings for Got Milk Campaign Detection System"""
@@ -11,6 +10,8 @@ class Config:
         # Upload Configuration
         self.UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'uploads')
         self.MAX_CONTENT_LENGTH = 2 * 1024 * 1024 * 1024  # 2GB max file size (Twelve Labs limit)
+        self.MAX_UPLOAD_FILE_SIZE = int(os.getenv('MAX_UPLOAD_FILE_SIZE', str(self.MAX_CONTENT_LENGTH)))
+        self.UPLOAD_CHUNK_SIZE = 1024 * 1024  # Streamed straight to UPLOAD_FOLDER in 1MB writes
         
         # Allowed video extensions (FFmpeg supported formats)
         self.ALLOWED_EXTENSIONS = {
@@ -23,12 +24,115 @@ class Config:
         self.SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
         self.DEBUG = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
         
-        # Ensure upload directory exists
-        Path(self.UPLOAD_FOLDER).mkdir(parents=True, exist_ok=True)
+        # Background validation queue
+        self.VALIDATION_WORKERS = int(os.getenv('VALIDATION_WORKERS', '4'))
+        self.VALIDATION_MAX_PENDING = int(os.getenv('VALIDATION_MAX_PENDING', '200'))
+        self.JOB_RETENTION_SECONDS = int(os.getenv('JOB_RETENTION_SECONDS', '3600'))
         
-        print(f"📁 Upload folder configured: {self.UPLOAD_FOLDER}")
-        print(f"📊 Max file size: {self.MAX_CONTENT_LENGTH / (1024*1024):.0f}MB")
-        print(f"📋 Allowed extensions: {', '.join(sorted(self.ALLOWED_EXTENSIONS))}")
+        # Bulk URL validation (/api/validate-batch)
+        self.BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', '16'))
+        self.BATCH_DEFAULT_PARALLELISM = int(os.getenv('BATCH_DEFAULT_PARALLELISM', '8'))
+        self.BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', '500'))
+        
+        # Process-wide Twelve Labs rate limits (token buckets, requests per minute)
+        self.TWELVE_LABS_RATE_LIMITS = {
+            'search': {
+                'rate_per_minute': float(os.getenv('SEARCH_RATE_PER_MINUTE', '60')),
+                'capacity': int(os.getenv('SEARCH_BURST', '10'))
+            },
+            'task_create': {
+                'rate_per_minute': float(os.getenv('TASK_CREATE_RATE_PER_MINUTE', '10')),
+                'capacity': int(os.getenv('TASK_CREATE_BURST', '3'))
+            },
+            'status': {
+                'rate_per_minute': float(os.getenv('STATUS_RATE_PER_MINUTE', '120')),
+                'capacity': int(os.getenv('STATUS_BURST', '20'))
+            }
+        }
+        self.RATE_LIMIT_MAX_WAIT = float(os.getenv('RATE_LIMIT_MAX_WAIT', '120'))
+        
+        # Shared indexing task poller
+        self.TASK_POLL_INITIAL_INTERVAL = float(os.getenv('TASK_POLL_INITIAL_INTERVAL', '2'))
+        self.TASK_POLL_MAX_INTERVAL = float(os.getenv('TASK_POLL_MAX_INTERVAL', '20'))
+        self.TASK_LIST_MAX_PAGES = int(os.getenv('TASK_LIST_MAX_PAGES', '2'))  # pages scanned per batched status poll
+        self.INDEXING_TIMEOUT_SECONDS = float(os.getenv('INDEXING_TIMEOUT_SECONDS', '600'))
+        
+        # Concurrent per-video search queries
+        self.SEARCH_WORKERS = int(os.getenv('SEARCH_WORKERS', '8'))
+        self.SEARCH_DEADLINE_SECONDS = float(os.getenv('SEARCH_DEADLINE_SECONDS', '30'))
+        self.SEARCH_SCAN_LIMIT = int(os.getenv('SEARCH_SCAN_LIMIT', '200'))  # clips, when video filter unsupported
+        # A batch item covers a full indexing wait plus its searches, with a minute to spare
+        self.BATCH_ITEM_TIMEOUT = float(os.getenv(
+            'BATCH_ITEM_TIMEOUT', str(self.INDEXING_TIMEOUT_SECONDS + self.SEARCH_DEADLINE_SECONDS + 60)
+        ))
+        
+        # Content-addressed validation result cache
+        self.VALIDATION_CACHE_TTL = int(os.getenv('VALIDATION_CACHE_TTL', str(7 * 24 * 3600)))
+        self.VALIDATION_CACHE_MAX_ENTRIES = int(os.getenv('VALIDATION_CACHE_MAX_ENTRIES', '5000'))
+        
+        # Durable store for classified videos and campaign counters (shared by all workers)
+        self.DATA_FOLDER = os.getenv('DATA_FOLDER', os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data'))
+        self.DATABASE_PATH = os.path.join(self.DATA_FOLDER, 'milk_mob.sqlite3')
+        # Upload ingestion records untouched this long are dropped and the submission starts over
+        self.INGESTION_RECORD_TTL_SECONDS = float(os.getenv('INGESTION_RECORD_TTL_SECONDS', str(24 * 3600)))
+        
+        # In-process cache for dashboard / analytics search.query results
+        self.SEARCH_CACHE_TTL = float(os.getenv('SEARCH_CACHE_TTL', '60'))
+        self.SEARCH_CACHE_MAX_ENTRIES = int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', '256'))
+        
+        # Background campaign analytics refresh
+        self.ANALYTICS_REFRESH_SECONDS = float(os.getenv('ANALYTICS_REFRESH_SECONDS', '15'))
+        self.SSE_HEARTBEAT_SECONDS = float(os.getenv('SSE_HEARTBEAT_SECONDS', '15'))
+        self.SSE_MAX_QUEUE = int(os.getenv('SSE_MAX_QUEUE', '100'))  # events buffered per slow viewer
+        self.SSE_RELAY_POLL_SECONDS = float(os.getenv('SSE_RELAY_POLL_SECONDS', '0.5'))  # shared event table tail
+        
+        # Mob assignment: 'embedding' (nearest mob centroid, keyword fallback) or 'keywords'
+        self.MOB_CLASSIFIER = os.getenv('MOB_CLASSIFIER', 'embedding').lower()
+        # 'twelvelabs' (default, needs a client), or 'local' for the offline hashing stand-in used in tests
+        self.EMBEDDING_PROVIDER = os.getenv('EMBEDDING_PROVIDER', '').lower()
+        self.EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'Marengo-retrieval-2.7')
+        self.MOB_EMBEDDING_MIN_SIMILARITY = float(os.getenv('MOB_EMBEDDING_MIN_SIMILARITY', '0.05'))
+        self.EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv('EMBEDDING_CACHE_MAX_ENTRIES', '2048'))
+        # How long a video with no embeddings in the index skips straight to the keyword rules
+        self.EMBEDDING_UNAVAILABLE_TTL = float(os.getenv('EMBEDDING_UNAVAILABLE_TTL', '3600'))
+        
+        # Local ANN (IVF) index answering /api/search-milk-content before the remote search API
+        self.LOCAL_SEARCH_ENABLED = os.getenv('LOCAL_SEARCH_ENABLED', 'True').lower() == 'true'
+        self.VECTOR_INDEX_FOLDER = os.path.join(self.DATA_FOLDER, 'vector_index')
+        self.VECTOR_INDEX_NLIST = int(os.getenv('VECTOR_INDEX_NLIST', '64'))
+        self.VECTOR_INDEX_NPROBE = int(os.getenv('VECTOR_INDEX_NPROBE', '8'))
+        self.LOCAL_SEARCH_MIN_SCORE = float(os.getenv('LOCAL_SEARCH_MIN_SCORE', '0.2'))
+        
+        # yt-dlp metadata for /api/video-preview
+        self.VIDEO_METADATA_TTL = float(os.getenv('VIDEO_METADATA_TTL', '3600'))
+        self.VIDEO_METADATA_NEGATIVE_TTL = float(os.getenv('VIDEO_METADATA_NEGATIVE_TTL', '60'))
+        self.VIDEO_METADATA_MAX_ENTRIES = int(os.getenv('VIDEO_METADATA_MAX_ENTRIES', '2048'))
+        self.VIDEO_METADATA_EXTRACTORS = int(os.getenv('VIDEO_METADATA_EXTRACTORS', '4'))
+        
+        # Cloud staging of uploads for Twelve Labs
+        self.GCS_BUCKET = os.getenv('GCS_BUCKET', 'floor23')
+        self.GCS_PREFIX = os.getenv('GCS_PREFIX', 'uploads/')
+        self.STAGING_PART_SIZE = int(os.getenv('STAGING_PART_SIZE_MB', '64')) * 1024 * 1024
+        self.STAGING_COMPOSITE_THRESHOLD = int(os.getenv('STAGING_COMPOSITE_THRESHOLD_MB', '128')) * 1024 * 1024
+        self.STAGING_WORKERS = int(os.getenv('STAGING_WORKERS', '8'))
+        
+        # Upload policy, checked against the file's container header before anything is indexed
+        self.VIDEO_MIN_DURATION_SECONDS = float(os.getenv('VIDEO_MIN_DURATION_SECONDS', '4'))
+        self.VIDEO_MAX_DURATION_SECONDS = float(os.getenv('VIDEO_MAX_DURATION_SECONDS', '7200'))
+        self.VIDEO_MIN_RESOLUTION = int(os.getenv('VIDEO_MIN_RESOLUTION', '360'))    # shorter side, px
+        self.VIDEO_MAX_RESOLUTION = int(os.getenv('VIDEO_MAX_RESOLUTION', '3840'))   # longer side, px
+        
+        # Optional proxy transcode before staging (needs ffmpeg): 'auto' uses it when ffmpeg is installed
+        self.TRANSCODE_MODE = os.getenv('TRANSCODE_MODE', 'auto').lower()
+        self.TRANSCODE_FOLDER = os.path.join(self.DATA_FOLDER, 'proxies')
+        self.TRANSCODE_MAX_HEIGHT = int(os.getenv('TRANSCODE_MAX_HEIGHT', '720'))  # shorter side, px
+        self.TRANSCODE_MAX_BITRATE_KBPS = int(os.getenv('TRANSCODE_MAX_BITRATE_KBPS', '2500'))
+        self.TRANSCODE_WORKERS = int(os.getenv('TRANSCODE_WORKERS', '0')) or None  # default: CPU count / 2
+        self.TRANSCODE_TIMEOUT = float(os.getenv('TRANSCODE_TIMEOUT', '900'))
+        
+        # Startup: 'background' warms the Twelve Labs client up right after import,
+        # 'lazy' on the first request, 'off' only when a request needs it
+        self.STARTUP_WARMUP = os.getenv('STARTUP_WARMUP', 'background').lower()
         
     def is_allowed_file(self, filename):
         """Check if file extension is allowed"""
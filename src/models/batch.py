@@ -0,0 +1,50 @@
+# src/models/batch.py
+import json
+import time
+from typing import Dict, Any, Optional
+
+from src.models.database import SQLiteDatabase
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS validation_batches (
+    batch_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    snapshot TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_validation_batches_updated ON validation_batches(updated_at);
+"""
+
+SELECT_BATCH = "SELECT snapshot FROM validation_batches WHERE batch_id = ?"
+UPSERT_BATCH = """
+INSERT OR REPLACE INTO validation_batches (batch_id, status, snapshot, created_at, updated_at)
+VALUES (?, ?, ?, ?, ?)
+"""
+DELETE_EXPIRED_BATCHES = "DELETE FROM validation_batches WHERE status = 'completed' AND updated_at < ?"
+
+
+class BatchStore:
+    """Latest to_dict() of every validation batch, so any worker process can answer /api/validate-batch/<id>"""
+
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+        self.db.executescript(SCHEMA)
+
+    def get(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        rows = self.db.query(SELECT_BATCH, (batch_id,))
+        return json.loads(rows[0]['snapshot']) if rows else None
+
+    def save(self, snapshot: Dict[str, Any], now: bool = False):
+        """Item updates ride the write queue; now=True (a new or finished batch) commits immediately"""
+        statement = (UPSERT_BATCH, (
+            snapshot['batch_id'], snapshot['status'], json.dumps(snapshot, default=str),
+            snapshot['created_at'], time.time()
+        ))
+        if now:
+            self.db.execute_now([statement])
+        else:
+            self.db.enqueue(*statement)
+
+    def prune(self, finished_before: float):
+        self.db.enqueue(DELETE_EXPIRED_BATCHES, (finished_before,))
@@ -0,0 +1,170 @@
+# src/models/database.py
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Callable, Iterable, List, Tuple
+
+# Errors that say nothing about the statements themselves: the same batch can commit later
+TRANSIENT_ERRORS = ('SQLITE_BUSY', 'SQLITE_LOCKED', 'SQLITE_IOERR', 'SQLITE_FULL', 'SQLITE_PROTOCOL')
+
+
+def _is_transient(error: sqlite3.DatabaseError) -> bool:
+    name = getattr(error, 'sqlite_errorname', None)
+    if name is not None:
+        return name.startswith(TRANSIENT_ERRORS)
+    return 'locked' in str(error) or 'busy' in str(error)
+
+
+class SQLiteDatabase:
+    """
+    Shared SQLite file in WAL mode, safe to open from several threads and worker processes.
+    Reads use a per-thread connection, so sqlite3's statement cache reuses the prepared statements.
+    Writes are queued and committed in batches (one transaction per batch) by a background
+    writer; flush() forces the queue out, and readers call it first to see their own writes.
+    A batch whose commit fails on a busy/locked database stays at the head of the queue until it
+    goes through (a statement that can never commit, like a constraint violation, is dropped on its
+    own with a warning), and a last flush runs at interpreter exit so a worker restart doesn't lose queued writes.
+    """
+
+    def __init__(self, db_path: str, flush_interval: float = 0.25, batch_size: int = 200):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.batches_written = 0
+        self.statements_written = 0
+        self.statements_dropped = 0
+        self._local = threading.local()
+        self._pending = queue.Queue()
+        self._write_lock = threading.Lock()
+        self._writer_start_lock = threading.Lock()
+        self._writer = None
+        self._flush_sources = []
+        self._unsent = []  # drained batch whose commit failed; retried before anything newer
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self.connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        atexit.register(self._final_flush)
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            # NORMAL is durable across app crashes in WAL mode; only an OS crash can lose the last commit
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def executescript(self, script: str):
+        conn = self.connection()
+        conn.executescript(script)
+        conn.commit()
+
+    def query(self, sql: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        self.flush()
+        return self.connection().execute(sql, params).fetchall()
+
+    def execute_now(self, statements: Iterable[Tuple[str, Tuple]]):
+        """Run statements in one transaction immediately (bypasses the write queue)"""
+        self.flush()
+        self._commit(list(statements))
+
+    def enqueue(self, sql: str, params: Tuple = ()):
+        """Queue a write for the next batch"""
+        self._pending.put((sql, params))
+        self._ensure_writer()
+
+    def add_flush_source(self, source: Callable[[Callable[[List[Tuple[str, Tuple]]], None]], None]):
+        """
+        Register source(commit), called on every flush; it passes the statements it wants
+        written to commit(), which runs them in one transaction (and raises if that fails).
+        """
+        self._flush_sources.append(source)
+        self._ensure_writer()
+
+    def flush(self):
+        """Commit everything queued so far"""
+        if self._flush_sources:
+            with self._write_lock:
+                for source in self._flush_sources:
+                    source(self._commit)
+        while self._unsent or not self._pending.empty():
+            with self._write_lock:
+                batch = self._unsent or self._drain()
+                self._unsent = []
+                if batch:
+                    self._commit_batch(batch)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'path': self.db_path,
+            'pending_writes': self._pending.qsize() + len(self._unsent),
+            'batches_written': self.batches_written,
+            'statements_written': self.statements_written,
+            'statements_dropped': self.statements_dropped
+        }
+
+    def _drain(self) -> List[Tuple[str, Tuple]]:
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._pending.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _commit_batch(self, batch: List[Tuple[str, Tuple]]):
+        """Commit a drained batch; caller holds _write_lock"""
+        try:
+            self._commit(batch)
+            return
+        except sqlite3.DatabaseError as e:
+            if _is_transient(e):
+                self._unsent = batch  # nothing wrong with the statements; retried on the next flush
+                raise
+        # One bad statement must not take the rest of the batch down with it
+        for index, statement in enumerate(batch):
+            try:
+                self._commit([statement])
+            except sqlite3.DatabaseError as e:
+                if _is_transient(e):
+                    self._unsent = batch[index:]
+                    raise
+                self.statements_dropped += 1
+                print(f"⚠️ Dropped queued write that cannot commit ({e}): {statement[0].strip()[:80]}")
+
+    def _final_flush(self):
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"⚠️ Final database flush failed, {self._pending.qsize() + len(self._unsent)} writes lost: {e}")
+
+    def _commit(self, statements: List[Tuple[str, Tuple]]):
+        conn = self.connection()
+        with conn:
+            for sql, params in statements:
+                conn.execute(sql, params)
+        self.batches_written += 1
+        self.statements_written += len(statements)
+
+    def _ensure_writer(self):
+        if self._writer is None or not self._writer.is_alive():
+            with self._writer_start_lock:
+                if self._writer is None or not self._writer.is_alive():
+                    self._writer = threading.Thread(target=self._run_writer, name='sqlite-writer', daemon=True)
+                    self._writer.start()
+
+    def _run_writer(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ Batched database write failed: {e}")
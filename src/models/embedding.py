@@ -0,0 +1,52 @@
+# src/models/embedding.py
+import time
+from typing import Dict, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src.models.database import SQLiteDatabase
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    key TEXT NOT NULL,
+    dim INTEGER NOT NULL,
+    vector BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (model, key)
+);
+"""
+
+SELECT_EMBEDDING = "SELECT dim, vector FROM embeddings WHERE model = ? AND key = ?"
+SELECT_EMBEDDINGS_BY_PREFIX = "SELECT key, dim, vector FROM embeddings WHERE model = ? AND key >= ? AND key < ? ORDER BY key"
+UPSERT_EMBEDDING = "INSERT OR REPLACE INTO embeddings (model, key, dim, vector, created_at) VALUES (?, ?, ?, ?, ?)"
+
+
+class EmbeddingStore:
+    """
+    Embedding vectors persisted in SQLite as float32 blobs, keyed by (model, key),
+    so each video or mob prompt is embedded once per model and survives restarts.
+    """
+
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+        self.db.executescript(SCHEMA)
+
+    def get(self, model: str, key: str) -> Optional['np.ndarray']:
+        rows = self.db.query(SELECT_EMBEDDING, (model, key))
+        if not rows:
+            return None
+        return np.frombuffer(rows[0]['vector'], dtype=np.float32, count=rows[0]['dim'])
+
+    def put(self, model: str, key: str, vector: 'np.ndarray'):
+        """Queued with the next write batch"""
+        vector = np.ascontiguousarray(vector, dtype=np.float32)
+        self.db.enqueue(UPSERT_EMBEDDING, (model, key, int(vector.shape[0]), vector.tobytes(), time.time()))
+
+    def with_prefix(self, model: str, prefix: str) -> Dict[str, 'np.ndarray']:
+        """Every stored vector whose key starts with prefix (e.g. 'video:')"""
+        rows = self.db.query(SELECT_EMBEDDINGS_BY_PREFIX, (model, prefix, prefix + '\uffff'))
+        return {row['key']: np.frombuffer(row['vector'], dtype=np.float32, count=row['dim']) for row in rows}
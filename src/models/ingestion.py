@@ -0,0 +1,74 @@
+# src/models/ingestion.py
+import json
+import time
+from typing import Dict, Any, Optional
+
+from src.models.database import SQLiteDatabase
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingestions (
+    ingestion_key TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    outputs TEXT NOT NULL,
+    stage_timings TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ingestions_state ON ingestions(state);
+CREATE INDEX IF NOT EXISTS idx_ingestions_updated ON ingestions(updated_at);
+"""
+
+SELECT_INGESTION = """
+SELECT ingestion_key, state, outputs, stage_timings, attempts, error, created_at, updated_at
+FROM ingestions WHERE ingestion_key = ?
+"""
+UPSERT_INGESTION = """
+INSERT OR REPLACE INTO ingestions (ingestion_key, state, outputs, stage_timings, attempts, error, created_at, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+COUNT_BY_STATE = "SELECT state, COUNT(*) AS count FROM ingestions GROUP BY state"
+COUNT_FAILED = "SELECT COUNT(*) AS count FROM ingestions WHERE error IS NOT NULL"
+DELETE_EXPIRED_INGESTIONS = "DELETE FROM ingestions WHERE updated_at < ?"
+
+
+class IngestionStore:
+    """Ingestion records (state, per-stage outputs and timings) persisted so a resubmission can resume"""
+
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+        self.db.executescript(SCHEMA)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        rows = self.db.query(SELECT_INGESTION, (key,))
+        if not rows:
+            return None
+        row = rows[0]
+        return {
+            'key': row['ingestion_key'],
+            'state': row['state'],
+            'outputs': json.loads(row['outputs']),
+            'stage_timings': json.loads(row['stage_timings']),
+            'attempts': row['attempts'],
+            'error': row['error'],
+            'created_at': row['created_at'],
+            'updated_at': row['updated_at']
+        }
+
+    def save(self, record: Dict[str, Any]):
+        """Written through immediately - a completed stage must survive a crash right after it"""
+        record['updated_at'] = time.time()
+        self.db.execute_now([(UPSERT_INGESTION, (
+            record['key'], record['state'],
+            json.dumps(record['outputs'], default=str), json.dumps(record['stage_timings']),
+            record['attempts'], record['error'], record['created_at'], record['updated_at']
+        ))])
+
+    def counts(self) -> Dict[str, Any]:
+        by_state = {row['state']: row['count'] for row in self.db.query(COUNT_BY_STATE)}
+        return {'by_state': by_state, 'with_error': self.db.query(COUNT_FAILED)[0]['count']}
+
+    def prune(self, updated_before: float):
+        """Forget records untouched since updated_before; their submissions start over"""
+        self.db.enqueue(DELETE_EXPIRED_INGESTIONS, (updated_before,))
@@ -0,0 +1,50 @@
+# src/models/job.py
+import json
+import time
+from typing import Dict, Any, Optional
+
+from src.models.database import SQLiteDatabase
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS validation_jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    snapshot TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_validation_jobs_created ON validation_jobs(created_at);
+"""
+
+SELECT_JOB = "SELECT snapshot FROM validation_jobs WHERE job_id = ?"
+UPSERT_JOB = """
+INSERT OR REPLACE INTO validation_jobs (job_id, status, snapshot, created_at, updated_at)
+VALUES (?, ?, ?, ?, ?)
+"""
+DELETE_EXPIRED_JOBS = "DELETE FROM validation_jobs WHERE status IN ('completed', 'failed') AND updated_at < ?"
+
+
+class JobStore:
+    """Latest to_dict() of every validation job, so any worker process can answer /api/jobs/<id>"""
+
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+        self.db.executescript(SCHEMA)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        rows = self.db.query(SELECT_JOB, (job_id,))
+        return json.loads(rows[0]['snapshot']) if rows else None
+
+    def save(self, snapshot: Dict[str, Any], now: bool = False):
+        """Progress updates ride the write queue; now=True (a finished job) commits immediately"""
+        statement = (UPSERT_JOB, (
+            snapshot['job_id'], snapshot['status'], json.dumps(snapshot, default=str),
+            snapshot['created_at'], time.time()
+        ))
+        if now:
+            self.db.execute_now([statement])
+        else:
+            self.db.enqueue(*statement)
+
+    def prune(self, finished_before: float):
+        self.db.enqueue(DELETE_EXPIRED_JOBS, (finished_before,))
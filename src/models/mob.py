@@ -0,0 +1,129 @@
+# src/models/mob.py
+import copy
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Callable, Optional
+
+from src.models.database import SQLiteDatabase
+from src.services.metrics_counters import ShardedCounters
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS campaign_counters (
+    key TEXT PRIMARY KEY,
+    value NUMERIC NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+SEED_COUNTER = "INSERT OR IGNORE INTO campaign_counters (key, value, updated_at) VALUES (?, ?, ?)"
+INCREMENT_COUNTER = "UPDATE campaign_counters SET value = value + ?, updated_at = ? WHERE key = ?"
+SELECT_COUNTERS = "SELECT key, value, updated_at FROM campaign_counters"
+RECOMPUTE_ACCURACY = """
+UPDATE campaign_counters SET updated_at = ?, value = ROUND(
+    100.0 * (SELECT value FROM campaign_counters WHERE key = 'campaign_videos_detected')
+          / MAX((SELECT value FROM campaign_counters WHERE key = 'total_videos_analyzed'), 1), 1)
+WHERE key = 'detection_accuracy'
+"""
+
+
+def _flatten(document: Dict[str, Any], prefix: str = '') -> Dict[str, float]:
+    """Numeric leaves of a nested dict as {'a.b.c': value}"""
+    flat = {}
+    for key, value in document.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{path}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def _assign(document: Dict[str, Any], path: str, value: Any):
+    *parents, leaf = path.split('.')
+    node = document
+    for key in parents:
+        node = node.setdefault(key, {})
+    node[leaf] = value
+
+
+class CampaignStore:
+    """
+    Campaign analytics (mob distribution, detection totals, API usage) persisted in SQLite.
+    Numeric fields of the template document are stored as counters. Request threads only bump
+    lock-free per-thread shards; each database flush writes the accumulated deltas with
+    `value = value + ?` and recomputes detection_accuracy in the same transaction, so neither
+    concurrent threads nor concurrent workers lose increments and readers never see a torn document.
+    Non-numeric fields (mob names) come from the template. Mob member counts aren't counters:
+    mob_counts() (the video catalog's per-mob totals) is read with every document, so uploads
+    and re-classifications are reflected without a second copy to keep in step.
+    """
+
+    def __init__(self, db: SQLiteDatabase, template: Dict[str, Any],
+                 mob_counts: Optional[Callable[[], Dict[str, int]]] = None):
+        self.db = db
+        self.template = copy.deepcopy(template)
+        self.mob_counts = mob_counts
+        self.counters = ShardedCounters()
+        # Cumulative counter totals already written to the database
+        self._flushed = {}
+        self._flush_lock = threading.Lock()
+        self.db.executescript(SCHEMA)
+
+        now = time.time()
+        self.db.execute_now([(SEED_COUNTER, (key, value, now)) for key, value in _flatten(self.template).items()
+                             if not key.startswith('mob_distribution.')])
+        self.db.add_flush_source(self._flush_counters)
+
+    def record_analyzed_video(self, campaign_detected: bool, api_calls: int = 0):
+        """Count one analyzed video and keep detection_accuracy in step with the totals"""
+        deltas = {'total_videos_analyzed': 1}
+        if campaign_detected:
+            deltas['campaign_videos_detected'] = 1
+        if api_calls:
+            deltas['twelve_labs_metrics.api_calls_made'] = api_calls
+        self.increment(deltas)
+
+    def record_api_usage(self, search_queries: int = 0, api_calls: int = 0):
+        deltas = {}
+        if search_queries:
+            deltas['twelve_labs_metrics.search_queries_performed'] = search_queries
+        if api_calls:
+            deltas['twelve_labs_metrics.api_calls_made'] = api_calls
+        self.increment(deltas)
+
+    def increment(self, deltas: Dict[str, float]):
+        """Lock-free; reaches the database with the next flush"""
+        self.counters.add_many(deltas)
+
+    def _flush_counters(self, commit):
+        with self._flush_lock:
+            totals = self.counters.snapshot()
+            pending = {key: value - self._flushed.get(key, 0) for key, value in totals.items()}
+            pending = {key: delta for key, delta in pending.items() if delta}
+            if not pending:
+                return
+
+            now = time.time()
+            statements = [(INCREMENT_COUNTER, (delta, now, key)) for key, delta in pending.items()]
+            if 'total_videos_analyzed' in pending or 'campaign_videos_detected' in pending:
+                statements.append((RECOMPUTE_ACCURACY, (now,)))
+            commit(statements)
+            # Only advance after a successful commit; a failed flush is retried with the next one
+            self._flushed = totals
+
+    def document(self) -> Dict[str, Any]:
+        """The analytics document in CAMPAIGN_ANALYTICS shape, read fresh from the database"""
+        document = copy.deepcopy(self.template)
+        last_update = 0.0
+        for row in self.db.query(SELECT_COUNTERS):
+            if row['key'].startswith('mob_distribution.'):
+                continue  # left over from when mob counts were counters
+            _assign(document, row['key'], row['value'])
+            last_update = max(last_update, row['updated_at'])
+        if self.mob_counts is not None:
+            counts = self.mob_counts()
+            for mob_id, mob in document.get('mob_distribution', {}).items():
+                mob['count'] = counts.get(mob_id, 0)
+        document['last_updated'] = datetime.fromtimestamp(last_update) if last_update else datetime.now()
+        return document
@@ -0,0 +1,53 @@
+# src/models/staged_object.py
+import time
+from typing import Dict, Any, Optional
+
+from src.models.database import SQLiteDatabase
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS staged_objects (
+    content_hash TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    object_name TEXT NOT NULL,
+    url TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    staged_at REAL NOT NULL,
+    verified_at REAL NOT NULL,
+    PRIMARY KEY (content_hash, bucket)
+);
+"""
+
+SELECT_STAGED = """
+SELECT object_name, url, bytes, staged_at, verified_at FROM staged_objects WHERE content_hash = ? AND bucket = ?
+"""
+UPSERT_STAGED = """
+INSERT OR REPLACE INTO staged_objects (content_hash, bucket, object_name, url, bytes, staged_at, verified_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+DELETE_STAGED = "DELETE FROM staged_objects WHERE content_hash = ? AND bucket = ?"
+COUNT_STAGED = "SELECT COUNT(*) AS count, COALESCE(SUM(bytes), 0) AS bytes FROM staged_objects WHERE bucket = ?"
+
+
+class StagedObjectStore:
+    """Which content hashes are already staged in which bucket, so repeat uploads skip the network"""
+
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+        self.db.executescript(SCHEMA)
+
+    def get(self, content_hash: str, bucket: str) -> Optional[Dict[str, Any]]:
+        rows = self.db.query(SELECT_STAGED, (content_hash, bucket))
+        return dict(rows[0]) if rows else None
+
+    def put(self, content_hash: str, bucket: str, object_name: str, url: str, size: int,
+            staged_at: Optional[float] = None):
+        now = time.time()
+        self.db.execute_now([(UPSERT_STAGED, (content_hash, bucket, object_name, url, size, staged_at or now, now))])
+
+    def forget(self, content_hash: str, bucket: str):
+        """The object was found missing remotely (e.g. removed by a lifecycle rule)"""
+        self.db.execute_now([(DELETE_STAGED, (content_hash, bucket))])
+
+    def summary(self, bucket: str) -> Dict[str, int]:
+        row = self.db.query(COUNT_STAGED, (bucket,))[0]
+        return {'objects': row['count'], 'bytes': row['bytes']}
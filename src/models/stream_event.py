@@ -0,0 +1,45 @@
+# src/models/stream_event.py
+import json
+import time
+from typing import Dict, Any, List
+
+from src.models.database import SQLiteDatabase
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stream_events (
+    event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_type TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_stream_events_created ON stream_events(created_at);
+"""
+
+INSERT_EVENT = "INSERT INTO stream_events (event_type, data, created_at) VALUES (?, ?, ?)"
+SELECT_EVENTS_AFTER = """
+SELECT event_id, event_type, data FROM stream_events WHERE event_id > ? ORDER BY event_id LIMIT ?
+"""
+SELECT_LAST_EVENT_ID = "SELECT COALESCE(MAX(event_id), 0) AS event_id FROM stream_events"
+DELETE_OLD_EVENTS = "DELETE FROM stream_events WHERE created_at < ?"
+
+
+class EventLog:
+    """Short-lived log of stream events in the shared database; each worker process tails it"""
+
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+        self.db.executescript(SCHEMA)
+
+    def append(self, event_type: str, data: Dict[str, Any]):
+        self.db.execute_now([(INSERT_EVENT, (event_type, json.dumps(data, default=str), time.time()))])
+
+    def after(self, event_id: int, limit: int = 500) -> List[Dict[str, Any]]:
+        """Events newer than event_id, oldest first"""
+        return [{'event_id': row['event_id'], 'event_type': row['event_type'], 'data': json.loads(row['data'])}
+                for row in self.db.query(SELECT_EVENTS_AFTER, (event_id, limit))]
+
+    def last_id(self) -> int:
+        return self.db.query(SELECT_LAST_EVENT_ID)[0]['event_id']
+
+    def prune(self, older_than: float):
+        self.db.enqueue(DELETE_OLD_EVENTS, (time.time() - older_than,))
@@ -0,0 +1,114 @@
+# src/models/video.py
+import sqlite3
+import time
+from typing import Dict, Any, List
+
+from src.models.database import SQLiteDatabase
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mob_videos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mob_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    user TEXT,
+    duration REAL DEFAULT 0,
+    confidence REAL DEFAULT 0,
+    twelve_labs_id TEXT,
+    hashtags TEXT DEFAULT '',
+    platform TEXT DEFAULT '',
+    ai_analyzed INTEGER DEFAULT 0,
+    classification_method TEXT DEFAULT 'keywords',  -- 'keywords' or 'embedding'
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_mob_videos_mob_created ON mob_videos(mob_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_mob_videos_confidence ON mob_videos(confidence);
+CREATE INDEX IF NOT EXISTS idx_mob_videos_created ON mob_videos(created_at);
+CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY);
+"""
+
+INSERT_VIDEO = """
+INSERT INTO mob_videos (mob_id, title, user, duration, confidence, twelve_labs_id,
+                        hashtags, platform, ai_analyzed, classification_method, created_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SELECT_MOB_VIDEOS = """
+SELECT title, user, duration, confidence, twelve_labs_id, created_at
+FROM mob_videos WHERE mob_id = ? ORDER BY created_at, id
+"""
+SELECT_MOB_SUMMARY = "SELECT COUNT(*) AS count, AVG(confidence) AS avg_confidence FROM mob_videos WHERE mob_id = ?"
+SELECT_COUNTS_BY_MOB = "SELECT mob_id, COUNT(*) AS count FROM mob_videos GROUP BY mob_id"
+SELECT_CLASSIFICATION_INPUTS = """
+SELECT id, mob_id, title, hashtags, platform, duration, ai_analyzed, classification_method FROM mob_videos ORDER BY id
+"""
+UPDATE_MOB = "UPDATE mob_videos SET mob_id = ? WHERE id = ? AND mob_id = ?"
+
+
+class VideoStore:
+    """Classified videos per mob, persisted in SQLite so they survive restarts and are shared by workers"""
+
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+        self.db.executescript(SCHEMA)
+
+    def seed(self, mob_videos: Dict[str, List[Dict[str, Any]]]) -> int:
+        """Load the demo videos the first time this database is used; returns how many were inserted"""
+        now = time.time()
+        # The marker row makes seeding happen once even when several workers start together
+        statements = [("INSERT INTO store_meta (key) VALUES (?)", ('mob_videos_seeded',))]
+        for mob_id, videos in mob_videos.items():
+            for offset, video in enumerate(videos):
+                statements.append((INSERT_VIDEO, self._row(mob_id, video, now + offset * 1e-3)))
+        try:
+            self.db.execute_now(statements)
+        except sqlite3.IntegrityError:
+            return 0
+        print(f"🗄️ Seeded {len(statements) - 1} demo videos into {self.db.db_path}")
+        return len(statements) - 1
+
+    def add(self, mob_id: str, video: Dict[str, Any]):
+        """Record a classified video; committed with the next write batch"""
+        self.db.enqueue(INSERT_VIDEO, self._row(mob_id, video, time.time()))
+
+    def videos_for_mob(self, mob_id: str) -> List[Dict[str, Any]]:
+        """A mob's videos, oldest first"""
+        return [dict(row) for row in self.db.query(SELECT_MOB_VIDEOS, (mob_id,))]
+
+    def mob_summary(self, mob_id: str) -> Dict[str, Any]:
+        row = self.db.query(SELECT_MOB_SUMMARY, (mob_id,))[0]
+        return {'count': row['count'], 'avg_confidence': row['avg_confidence'] or 0.0}
+
+    def counts_by_mob(self) -> Dict[str, int]:
+        return {row['mob_id']: row['count'] for row in self.db.query(SELECT_COUNTS_BY_MOB)}
+
+    def classification_inputs(self) -> List[sqlite3.Row]:
+        """Every stored video with the fields mob classification looks at"""
+        return self.db.query(SELECT_CLASSIFICATION_INPUTS)
+
+    def reassign(self, moves: List[tuple]) -> int:
+        """
+        Apply [(video_id, old_mob_id, new_mob_id), ...] in one transaction.
+        Rows whose mob changed since they were read are left alone; returns how many moved.
+        """
+        conn = self.db.connection()
+        self.db.flush()
+        moved = 0
+        with conn:
+            for video_id, old, new in moves:
+                moved += conn.execute(UPDATE_MOB, (new, video_id, old)).rowcount
+        return moved
+
+    @staticmethod
+    def _row(mob_id: str, video: Dict[str, Any], created_at: float) -> tuple:
+        return (
+            mob_id,
+            video.get('title', 'User Video'),
+            video.get('user'),
+            video.get('duration') or 0,
+            video.get('confidence') or 0,
+            video.get('twelve_labs_id'),
+            video.get('hashtags') or '',
+            video.get('platform') or '',
+            1 if video.get('ai_analyzed') else 0,
+            video.get('classification_method') or 'keywords',
+            created_at
+        )
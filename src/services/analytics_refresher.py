@@ -0,0 +1,129 @@
+# src/services/analytics_refresher.py
+import copy
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Callable, Optional
+
+
+class AnalyticsSnapshot:
+    """One precomputed analytics document; never mutated after it is published"""
+
+    def __init__(self, data: Dict[str, Any], version: int, compute_seconds: float):
+        self.data = data
+        self.version = version
+        self.compute_seconds = compute_seconds
+        self.created_at = time.time()
+
+    def age_seconds(self) -> float:
+        return round(time.time() - self.created_at, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The analytics document plus snapshot metadata (shallow copy; nested data is shared)"""
+        document = dict(self.data)
+        document['snapshot'] = {
+            'version': self.version,
+            'generated_at': datetime.fromtimestamp(self.created_at).isoformat(),
+            'age_seconds': self.age_seconds(),
+            'compute_seconds': self.compute_seconds
+        }
+        return document
+
+
+class AnalyticsRefresher:
+    """
+    Recomputes the campaign analytics document on a background thread every `interval` seconds.
+    Readers get the latest published snapshot from memory and never wait on the Twelve Labs API,
+    except for the very first read before any snapshot exists.
+    """
+
+    def __init__(self, compute_fn: Callable[[], Dict[str, Any]], interval: float = 15.0):
+        self.compute_fn = compute_fn
+        self.interval = interval
+        self.refreshes = 0
+        self.failures = 0
+        self.last_error = None
+        self._snapshot = None
+        self._listeners = []
+        self._version = 0
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._thread = None
+
+    def latest(self) -> AnalyticsSnapshot:
+        """Most recent snapshot; computes one inline only if nothing has been published yet"""
+        self._ensure_thread()
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            # Another thread may have published while we waited for the lock
+            return self._snapshot or self._refresh_locked()
+
+    def start(self):
+        """Start the periodic refresh thread (no-op if it's running)"""
+        self._ensure_thread()
+
+    def request_refresh(self):
+        """Ask the background thread to recompute now instead of waiting for the next tick"""
+        self._ensure_thread()
+        self._wake.set()
+
+    def refresh(self) -> Optional[AnalyticsSnapshot]:
+        """Compute and publish a new snapshot; keeps serving the previous one if computing fails"""
+        with self._lock:
+            return self._refresh_locked()
+
+    def add_listener(self, listener: Callable[[Optional[AnalyticsSnapshot], AnalyticsSnapshot], None]):
+        """Call listener(previous, new) every time a new snapshot is published"""
+        self._listeners.append(listener)
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            'interval_seconds': self.interval,
+            'refreshes': self.refreshes,
+            'failures': self.failures,
+            'last_error': self.last_error,
+            'snapshot_version': snapshot.version if snapshot else None,
+            'snapshot_age_seconds': snapshot.age_seconds() if snapshot else None
+        }
+
+    def _refresh_locked(self) -> Optional[AnalyticsSnapshot]:
+        started = time.time()
+        try:
+            # Deep copy so later mutation of the source data can't leak into a published snapshot
+            data = copy.deepcopy(self.compute_fn())
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            print(f"⚠️ Analytics refresh failed, serving previous snapshot: {e}")
+            return self._snapshot
+
+        previous = self._snapshot
+        self._version += 1
+        self._snapshot = AnalyticsSnapshot(data, self._version, round(time.time() - started, 3))
+        self.refreshes += 1
+        self.last_error = None
+
+        for listener in self._listeners:
+            try:
+                listener(previous, self._snapshot)
+            except Exception as e:
+                print(f"⚠️ Analytics snapshot listener failed: {e}")
+        return self._snapshot
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._thread_lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name='analytics-refresher', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            if self._snapshot is None or self._wake.is_set() or self._snapshot.age_seconds() >= self.interval:
+                self._wake.clear()
+                self.refresh()
+            self._wake.wait(timeout=self.interval)
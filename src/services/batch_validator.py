@@ -0,0 +1,240 @@
+# src/services/batch_validator.py
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, List, Optional
+
+from src.models.batch import BatchStore
+
+
+class BatchItem:
+    """One {url, hashtags} entry of a validation batch"""
+
+    def __init__(self, index: int, url: str, hashtags: str):
+        self.index = index
+        self.url = url
+        self.hashtags = hashtags
+        self.status = 'pending'  # pending -> running -> completed | failed | timed_out | invalid
+        self.started_at = None
+        self.finished_at = None
+        self.deadline = None
+        self.result = None
+        self.error = None
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            'index': self.index,
+            'url': self.url,
+            'hashtags': self.hashtags,
+            'status': self.status,
+            'duration_seconds': round((self.finished_at or now) - self.started_at, 3) if self.started_at else None,
+            'result': self.result,
+            'error': self.error
+        }
+
+
+class ValidationBatch:
+    """A set of URLs validated together with bounded parallelism"""
+
+    def __init__(self, items: List[BatchItem], parallelism: int, item_timeout: float):
+        self.id = uuid.uuid4().hex
+        self.items = items
+        self.parallelism = parallelism
+        self.item_timeout = item_timeout
+        self.created_at = time.time()
+        self.finished_at = None
+        # Item indexes in the order they finished - lets clients fetch results incrementally
+        self.completion_order = []
+        self._done = set()
+        self._pending = list(reversed(items))
+        self._lock = threading.Lock()
+        self._store = None  # BatchStore that mirrors every finished item, set by the runner
+
+    def _next_pending(self) -> Optional[BatchItem]:
+        with self._lock:
+            return self._pending.pop() if self._pending else None
+
+    def _mark_done(self, item: BatchItem, status: str, result: Dict[str, Any] = None, error: str = None) -> bool:
+        """Record an item's outcome once; returns False if it had already timed out"""
+        with self._lock:
+            if item.index in self._done:
+                return False
+            item.status = status
+            item.result = result
+            item.error = error
+            item.finished_at = item.finished_at or time.time()
+            self._record_done_locked(item)
+            finished = self.finished_at is not None
+        self._save(now=finished)
+        return True
+
+    def _save(self, now: bool = False):
+        if self._store is None:
+            return
+        try:
+            self._store.save(self.to_dict(), now=now)
+        except Exception as e:
+            print(f"⚠️ Could not persist batch {self.id}: {e}")
+
+    def _record_done_locked(self, item: BatchItem):
+        self._done.add(item.index)
+        self.completion_order.append(item.index)
+        if len(self.completion_order) == len(self.items):
+            self.finished_at = time.time()
+
+    def _expire_overdue_locked(self, now: float):
+        # Deadlines are enforced on read: a late worker thread can't be killed, but its result is dropped
+        for item in self.items:
+            if item.status == 'running' and item.deadline and now > item.deadline and item.index not in self._done:
+                item.status = 'timed_out'
+                item.error = f'Exceeded {self.item_timeout:.0f}s deadline'
+                item.finished_at = item.deadline
+                self._record_done_locked(item)
+
+    def to_dict(self, since: int = 0) -> Dict[str, Any]:
+        """Aggregated result document; `since` skips the first N finished items"""
+        now = time.time()
+        with self._lock:
+            self._expire_overdue_locked(now)
+            done_order = list(self.completion_order)
+            finished_at = self.finished_at
+            item_views = [item.to_dict(now) for item in self.items]
+
+        counts = {}
+        for view in item_views:
+            counts[view['status']] = counts.get(view['status'], 0) + 1
+
+        valid_count = sum(1 for view in item_views
+                          if view['status'] == 'completed' and view['result'] and view['result'].get('is_valid'))
+
+        return {
+            'batch_id': self.id,
+            'status': 'completed' if len(done_order) == len(self.items) else 'running',
+            'total': len(self.items),
+            'done': len(done_order),
+            'valid': valid_count,
+            'counts': counts,
+            'parallelism': self.parallelism,
+            'item_timeout_seconds': self.item_timeout,
+            'created_at': self.created_at,
+            'elapsed_seconds': round((finished_at or now) - self.created_at, 3),
+            'next_cursor': len(done_order),
+            'items': [item_views[index] for index in done_order[since:]]
+        }
+
+
+class BatchValidationRunner:
+    """
+    Fans batch URL validation out over a shared, bounded thread pool.
+    validate_fn(url, hashtags, deadline=<epoch seconds>) should bound its own waits by the
+    deadline - a worker thread can't be interrupted, so it holds its pool slot until it returns.
+    With a store, each batch is mirrored to the shared database as its items finish, so a
+    status poll served by another worker process still finds it.
+    """
+
+    def __init__(self, validate_fn: Callable[..., Dict[str, Any]],
+                 url_check_fn: Callable[[str], bool] = None,
+                 max_workers: int = 16, default_parallelism: int = 8,
+                 default_item_timeout: float = 600, max_items: int = 500,
+                 retention_seconds: int = 3600, store: Optional[BatchStore] = None):
+        self.validate_fn = validate_fn
+        self.url_check_fn = url_check_fn
+        self.max_workers = max_workers
+        self.default_parallelism = default_parallelism
+        self.default_item_timeout = default_item_timeout
+        self.max_items = max_items
+        self.retention_seconds = retention_seconds
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='batch-validator')
+        self._batches = {}
+        self._lock = threading.Lock()
+
+    def submit(self, raw_items: List[Dict[str, Any]], parallelism: Optional[int] = None,
+               item_timeout: Optional[float] = None) -> ValidationBatch:
+        """Start validating raw_items ([{url, hashtags}, ...]); raises ValueError on a bad request"""
+        if not isinstance(raw_items, list) or not raw_items:
+            raise ValueError("'items' must be a non-empty list of {url, hashtags} objects")
+        if len(raw_items) > self.max_items:
+            raise ValueError(f"Too many items ({len(raw_items)}). Maximum per batch is {self.max_items}")
+
+        parallelism = max(1, min(int(parallelism or self.default_parallelism), self.max_workers))
+        item_timeout = float(self.default_item_timeout if item_timeout is None else item_timeout)
+        if not item_timeout > 0:
+            raise ValueError("'item_timeout' must be a positive number of seconds")
+
+        items = []
+        for index, raw in enumerate(raw_items):
+            if not isinstance(raw, dict):
+                raw = {'url': str(raw)}
+            items.append(BatchItem(index, str(raw.get('url', '')).strip(), str(raw.get('hashtags', '')).strip()))
+
+        batch = ValidationBatch(items, parallelism, item_timeout)
+        batch._store = self.store
+        with self._lock:
+            self._prune()
+            self._batches[batch.id] = batch
+        batch._save(now=True)
+
+        # Only `parallelism` items of a batch are in the shared pool at once; each finished
+        # item feeds the next, so one large batch can't take every worker
+        for _ in range(parallelism):
+            self._start_next(batch)
+
+        print(f"📦 Batch {batch.id}: {len(items)} URLs queued (parallelism {parallelism})")
+        return batch
+
+    def get(self, batch_id: str) -> Optional[ValidationBatch]:
+        with self._lock:
+            return self._batches.get(batch_id)
+
+    def status(self, batch_id: str, since: int = 0) -> Optional[Dict[str, Any]]:
+        """to_dict(since) of the batch, read from the shared store when another process runs it"""
+        batch = self.get(batch_id)
+        if batch is not None:
+            return batch.to_dict(since=since)
+        snapshot = self.store.get(batch_id) if self.store else None
+        if snapshot is None:
+            return None
+        if snapshot['status'] != 'completed':
+            snapshot['elapsed_seconds'] = round(time.time() - snapshot['created_at'], 3)
+        snapshot['items'] = snapshot['items'][since:]
+        return snapshot
+
+    def _start_next(self, batch: ValidationBatch):
+        while True:
+            item = batch._next_pending()
+            if item is None:
+                return
+            if self.url_check_fn and not self.url_check_fn(item.url):
+                batch._mark_done(item, 'invalid', error='Not a direct video file URL')
+                continue
+            self._executor.submit(self._run_item, batch, item)
+            return
+
+    def _run_item(self, batch: ValidationBatch, item: BatchItem):
+        item.started_at = time.time()
+        item.deadline = item.started_at + batch.item_timeout
+        item.status = 'running'
+        try:
+            result = self.validate_fn(item.url, item.hashtags, deadline=item.deadline)
+            if time.time() > item.deadline:
+                batch._mark_done(item, 'timed_out', error=f'Exceeded {batch.item_timeout:.0f}s deadline')
+            else:
+                batch._mark_done(item, 'completed', result=result)
+        except Exception as e:
+            print(f"   ❌ Batch item {item.index} failed: {e}")
+            print(f"   Full traceback: {traceback.format_exc()}")
+            batch._mark_done(item, 'failed', error=str(e))
+        finally:
+            self._start_next(batch)
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_seconds
+        expired = [batch_id for batch_id, batch in self._batches.items()
+                   if batch.finished_at and batch.finished_at < cutoff]
+        for batch_id in expired:
+            del self._batches[batch_id]
+        if self.store and expired:
+            self.store.prune(cutoff)
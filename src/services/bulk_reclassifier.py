@@ -0,0 +1,180 @@
+# src/services/bulk_reclassifier.py
+import time
+from typing import Dict, Any, List, Mapping, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from src.services.mob_classifier import (
+    MobClassifier, PLATFORM_BONUS, DURATION_BONUS,
+    TITLE_KEYWORD_WEIGHT, HASHTAG_WEIGHT, AI_ANALYSIS_BONUS, PLATFORM_BONUS_WEIGHT, DURATION_BONUS_WEIGHT
+)
+
+
+class BulkReclassifier:
+    """
+    Re-scores the whole video catalog against the current mob rules.
+    Each video becomes a row of features (one column per keyword, hashtag, platform and duration
+    rule, plus the AI-analysis flag); multiplying by a features x mobs weight matrix scores every
+    video against every mob in one operation. Results match MobClassifier.classify() per video.
+    Falls back to classifying row by row when NumPy isn't installed.
+    """
+
+    def __init__(self, classifier: MobClassifier, chunk_size: int = 50000):
+        self.classifier = classifier
+        self.chunk_size = chunk_size
+        self.mob_keys = list(classifier.mobs.keys())
+        self.keyword_patterns = list(classifier.keyword_mobs.keys())
+        self.hashtag_patterns = list(classifier.hashtag_mobs.keys())
+        self.platforms = list(PLATFORM_BONUS.keys())
+        self.duration_mobs = [mob_key for mob_key in DURATION_BONUS if mob_key in classifier.mobs]
+        self.weights = self._weight_matrix() if NUMPY_AVAILABLE else None
+
+    def score(self, videos: List[Mapping[str, Any]]) -> Tuple[List[str], List[float]]:
+        """Best mob key and its score for each video (same order as the input)"""
+        if not NUMPY_AVAILABLE:
+            return self._score_python(videos)
+
+        best_keys, best_scores = [], []
+        for start in range(0, len(videos), self.chunk_size):
+            chunk = videos[start:start + self.chunk_size]
+            # Round so sums of the same weights in a different order still tie exactly
+            scores = np.round(self._features(chunk) @ self.weights, 6)
+
+            best = scores.argmax(axis=1)  # first mob wins ties, like max() in classify()
+            rows = np.arange(len(chunk))
+            best_score = scores[rows, best]
+
+            fallback = best_score < self.classifier.min_score
+            fallback_index = self.mob_keys.index(self.classifier.fallback_mob)
+            best[fallback] = fallback_index
+            best_score[fallback] = scores[fallback, fallback_index]
+
+            best_keys.extend(self.mob_keys[i] for i in best.tolist())
+            best_scores.extend(best_score.tolist())
+        return best_keys, best_scores
+
+    def reclassify(self, store, dry_run: bool = False, sample_size: int = 20) -> Dict[str, Any]:
+        """
+        Re-score every keyword-classified video; unless dry_run, apply all mob changes in one
+        transaction. Videos placed by embedding similarity are left where they are - the keyword
+        rules can't judge them.
+        """
+        timings = {}
+        started = time.time()
+        videos = []
+        skipped = 0
+        for video in store.classification_inputs():
+            if video['classification_method'] == 'embedding':
+                skipped += 1
+            else:
+                videos.append(video)
+        timings['load_seconds'] = round(time.time() - started, 3)
+
+        started = time.time()
+        best_keys, best_scores = self.score(videos)
+        timings['scoring_seconds'] = round(time.time() - started, 3)
+
+        mob_ids = {mob_key: mob['id'] for mob_key, mob in self.classifier.mobs.items()}
+        moves = []
+        move_counts = {}
+        before, after = {}, {}
+        samples = []
+        for video, mob_key, score in zip(videos, best_keys, best_scores):
+            old_mob, new_mob = video['mob_id'], mob_ids[mob_key]
+            before[old_mob] = before.get(old_mob, 0) + 1
+            after[new_mob] = after.get(new_mob, 0) + 1
+            if old_mob == new_mob:
+                continue
+            moves.append((video['id'], old_mob, new_mob))
+            move_key = f"{old_mob} -> {new_mob}"
+            move_counts[move_key] = move_counts.get(move_key, 0) + 1
+            if len(samples) < sample_size:
+                samples.append({'video_id': video['id'], 'title': video['title'],
+                                'from': old_mob, 'to': new_mob, 'score': score})
+
+        applied = 0
+        if moves and not dry_run:
+            started = time.time()
+            applied = store.reassign(moves)
+            timings['apply_seconds'] = round(time.time() - started, 3)
+
+        return {
+            'engine': 'numpy' if NUMPY_AVAILABLE else 'python',
+            'dry_run': dry_run,
+            'total_videos': len(videos),
+            'skipped_embedding_classified': skipped,
+            'changed': len(moves),
+            'applied': applied,
+            'moves': dict(sorted(move_counts.items(), key=lambda item: -item[1])),
+            'mob_counts': {'before': before, 'after': after},
+            'sample_changes': samples,
+            'timings': timings
+        }
+
+    def _weight_matrix(self):
+        columns = len(self.keyword_patterns) + len(self.hashtag_patterns) + 1 + len(self.platforms) + len(self.duration_mobs)
+        weights = np.zeros((columns, len(self.mob_keys)), dtype=np.float64)
+        mob_index = {mob_key: i for i, mob_key in enumerate(self.mob_keys)}
+
+        column = 0
+        for pattern in self.keyword_patterns:
+            for mob_key in self.classifier.keyword_mobs[pattern]:
+                weights[column, mob_index[mob_key]] += TITLE_KEYWORD_WEIGHT
+            column += 1
+        for pattern in self.hashtag_patterns:
+            for mob_key in self.classifier.hashtag_mobs[pattern]:
+                weights[column, mob_index[mob_key]] += HASHTAG_WEIGHT
+            column += 1
+        weights[column, :] = AI_ANALYSIS_BONUS
+        column += 1
+        for platform in self.platforms:
+            for mob_key in PLATFORM_BONUS[platform]:
+                if mob_key in mob_index:
+                    weights[column, mob_index[mob_key]] = PLATFORM_BONUS_WEIGHT
+            column += 1
+        for mob_key in self.duration_mobs:
+            weights[column, mob_index[mob_key]] = DURATION_BONUS_WEIGHT
+            column += 1
+        return weights
+
+    def _features(self, videos: List[Mapping[str, Any]]):
+        count = len(videos)
+        titles = [(video['title'] or '').lower() for video in videos]
+        hashtags = [(video['hashtags'] or '').lower() for video in videos]
+        platforms = np.array([(video['platform'] or '').lower() for video in videos], dtype=object)
+        durations = np.array([video['duration'] or 0 for video in videos], dtype=np.float64)
+
+        features = np.zeros((count, self.weights.shape[0]), dtype=np.float64)
+        column = 0
+        # Substring tests run once per pattern over the whole column of texts
+        for pattern in self.keyword_patterns:
+            features[:, column] = np.fromiter((pattern in title for title in titles), dtype=bool, count=count)
+            column += 1
+        for pattern in self.hashtag_patterns:
+            features[:, column] = np.fromiter((pattern in tags for tags in hashtags), dtype=bool, count=count)
+            column += 1
+        features[:, column] = np.fromiter((bool(video['ai_analyzed']) for video in videos), dtype=bool, count=count)
+        column += 1
+        for platform in self.platforms:
+            features[:, column] = platforms == platform
+            column += 1
+        for mob_key in self.duration_mobs:
+            features[:, column] = (durations > 0) & DURATION_BONUS[mob_key](durations)
+            column += 1
+        return features
+
+    def _score_python(self, videos: List[Mapping[str, Any]]) -> Tuple[List[str], List[float]]:
+        results = self.classifier.classify_many(
+            {
+                'video_info': {'title': video['title'], 'platform': video['platform'], 'duration': video['duration']},
+                'hashtags': video['hashtags'],
+                'validation_result': {'twelve_labs_data': {'search_results': 1}} if video['ai_analyzed'] else {}
+            }
+            for video in videos
+        )
+        return [result['mob_key'] for result in results], [result['match_score'] for result in results]
@@ -0,0 +1,352 @@
+# src/services/cloud_staging.py
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, Any, Callable, List, Optional
+
+try:
+    from google.cloud import storage
+    GCS_AVAILABLE = True
+except ImportError:
+    storage = None
+    GCS_AVAILABLE = False
+
+from src.models.staged_object import StagedObjectStore
+from src.utils.helpers import sha256_file
+
+MAX_COMPOSE_SOURCES = 32  # GCS limit per compose() call
+
+
+class _PartReader:
+    """
+    Seekable read-only window [offset, offset + length) of a file. Reports newly read bytes
+    (re-reads after a resumable-upload chunk retry seeks back are not counted twice).
+    """
+
+    def __init__(self, path: str, offset: int, length: int, on_read: Callable[[int], None]):
+        self._file = open(path, 'rb')
+        self._offset = offset
+        self._length = length
+        self._position = 0
+        self._high_water = 0
+        self._on_read = on_read
+        self._file.seek(offset)
+
+    def read(self, size: int = -1) -> bytes:
+        remaining = self._length - self._position
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        data = self._file.read(size)
+        self._position += len(data)
+        if self._position > self._high_water:
+            self._on_read(self._position - self._high_water)
+            self._high_water = self._position
+        return data
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, position: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            position += self._position
+        elif whence == os.SEEK_END:
+            position += self._length
+        self._position = max(0, min(position, self._length))
+        self._file.seek(self._offset + self._position)
+        return self._position
+
+    def close(self):
+        self._file.close()
+
+
+class CloudStager:
+    """
+    Stages local uploads in a GCS bucket so Twelve Labs can fetch them by URL.
+    Objects are named by the SHA-256 of their bytes, so uploads never collide and identical
+    bytes are stored once: a hash found in the local index (or, failing that, in the bucket
+    by one metadata request) returns the existing URL without uploading. Concurrent stagings
+    of the same bytes share one upload.
+    One client is created lazily and reused (its connection pool sized to max_workers).
+    Files above composite_threshold are cut into part_size parts that upload in parallel, each
+    as a resumable session of resumable_chunk_size chunks, and are then composed server-side
+    into the final object. Part names are derived from the file's size and mtime, so retrying
+    the same file skips parts that already made it - a dropped connection costs at most one part.
+    """
+
+    def __init__(self, bucket_name: str, prefix: str = 'uploads/', client_factory: Callable[[], Any] = None,
+                 part_size: int = 64 * 1024 * 1024, composite_threshold: int = 128 * 1024 * 1024,
+                 max_workers: int = 8, resumable_chunk_size: int = 8 * 1024 * 1024, part_retries: int = 3,
+                 index: Optional[StagedObjectStore] = None, file_hash: Callable[[str], str] = sha256_file,
+                 verify_after_seconds: float = 24 * 3600):
+        self.bucket_name = bucket_name
+        self.prefix = prefix
+        self.part_size = part_size
+        self.composite_threshold = composite_threshold
+        self.max_workers = max_workers
+        self.resumable_chunk_size = resumable_chunk_size
+        self.part_retries = part_retries
+        self.index = index
+        self.file_hash = file_hash
+        # Index entries older than this are re-checked against the bucket (lifecycle rules may delete objects)
+        self.verify_after_seconds = verify_after_seconds
+        self.files_staged = 0
+        self.bytes_staged = 0
+        self.parts_uploaded = 0
+        self.parts_reused = 0
+        self.part_retries_used = 0
+        self.index_hits = 0
+        self.remote_hits = 0
+        self.coalesced = 0
+        self.bytes_skipped = 0
+        self._uses_gcs = client_factory is None
+        self._client_factory = client_factory or self._gcs_client
+        self._client = None
+        self._bucket = None
+        self._in_flight = {}  # content hash -> Future
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='gcs-part')
+
+    @property
+    def available(self) -> bool:
+        return GCS_AVAILABLE or not self._uses_gcs
+
+    def bucket(self):
+        if self._bucket is None:
+            with self._lock:
+                if self._bucket is None:
+                    self._client = self._client_factory()
+                    self._bucket = self._client.bucket(self.bucket_name)
+        return self._bucket
+
+    def object_name_for(self, content_hash: str, file_path: str) -> str:
+        extension = os.path.splitext(file_path)[1].lower()
+        return f"{self.prefix}{content_hash}{extension}"
+
+    def stage(self, file_path: str, object_name: Optional[str] = None,
+              on_progress: Optional[Callable[[int, int], None]] = None,
+              content_hash: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Make file_path's bytes available in the bucket; returns {'url', 'object_name', 'bytes',
+        'parts', 'seconds', 'content_hash', 'deduplicated'} where deduplicated is None (uploaded),
+        'index', 'remote' or 'in_flight'. An explicit object_name bypasses content addressing.
+        """
+        total = os.path.getsize(file_path)
+        if object_name is not None:
+            return self._upload(file_path, object_name, total, on_progress)
+
+        content_hash = content_hash or self.file_hash(file_path)
+        object_name = self.object_name_for(content_hash, file_path)
+        with self._lock:
+            future = self._in_flight.get(content_hash)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[content_hash] = future
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            result = dict(future.result(), deduplicated='in_flight', parts=0)
+            self._skipped(total, on_progress)
+            return result
+
+        try:
+            result = self._existing(content_hash, object_name, total)
+            if result is not None:
+                self._skipped(total, on_progress)
+            else:
+                result = self._upload(file_path, object_name, total, on_progress)
+                if self.index is not None:
+                    self.index.put(content_hash, self.bucket_name, object_name, result['url'], total)
+            result['content_hash'] = content_hash
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(content_hash, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                'bucket': self.bucket_name,
+                'client_ready': self._client is not None,
+                'part_size': self.part_size,
+                'composite_threshold': self.composite_threshold,
+                'max_workers': self.max_workers,
+                'files_staged': self.files_staged,
+                'bytes_staged': self.bytes_staged,
+                'parts_uploaded': self.parts_uploaded,
+                'parts_reused': self.parts_reused,
+                'part_retries': self.part_retries_used,
+                'index_hits': self.index_hits,
+                'remote_hits': self.remote_hits,
+                'coalesced': self.coalesced,
+                'bytes_skipped': self.bytes_skipped
+            }
+        stats['indexed_objects'] = self.index.summary(self.bucket_name) if self.index is not None else None
+        return stats
+
+    def _existing(self, content_hash: str, object_name: str, total: int) -> Optional[Dict[str, Any]]:
+        """The already-staged copy of these bytes, if the index or the bucket has one"""
+        entry = self.index.get(content_hash, self.bucket_name) if self.index is not None else None
+        if entry is not None and entry['bytes'] == total \
+                and time.time() - entry['verified_at'] < self.verify_after_seconds:
+            with self._lock:
+                self.index_hits += 1
+            print(f"☁️ Already staged: {entry['object_name']} (index)")
+            return {'url': entry['url'], 'object_name': entry['object_name'], 'bytes': total,
+                    'parts': 0, 'seconds': 0.0, 'deduplicated': 'index'}
+
+        blob = self.bucket().get_blob(object_name)  # one metadata request, no body
+        if blob is None or blob.size != total:
+            if entry is not None:
+                self.index.forget(content_hash, self.bucket_name)
+            return None
+        if self.index is not None:
+            self.index.put(content_hash, self.bucket_name, object_name, blob.public_url, total,
+                           staged_at=entry['staged_at'] if entry else None)
+        with self._lock:
+            self.remote_hits += 1
+        print(f"☁️ Already staged: {object_name} (bucket)")
+        return {'url': blob.public_url, 'object_name': object_name, 'bytes': total,
+                'parts': 0, 'seconds': 0.0, 'deduplicated': 'remote'}
+
+    def _skipped(self, total: int, on_progress: Optional[Callable[[int, int], None]]):
+        with self._lock:
+            self.bytes_skipped += total
+        if on_progress:
+            on_progress(total, total)
+
+    def _upload(self, file_path: str, object_name: str, total: int,
+                on_progress: Optional[Callable[[int, int], None]]) -> Dict[str, Any]:
+        started = time.time()
+        progress = _Progress(total, on_progress)
+        if total <= self.composite_threshold:
+            blob = self._upload_part(file_path, 0, total, object_name, progress)
+            parts = 1
+        else:
+            blob, parts = self._upload_composite(file_path, total, object_name, progress)
+
+        with self._lock:
+            self.files_staged += 1
+            self.bytes_staged += total
+        seconds = time.time() - started
+        print(f"☁️ Staged {object_name}: {total / (1024 * 1024):.1f}MB in {parts} part(s), "
+              f"{seconds:.1f}s ({total / max(seconds, 1e-6) / (1024 * 1024):.1f}MB/s)")
+        return {'url': blob.public_url, 'object_name': object_name, 'bytes': total,
+                'parts': parts, 'seconds': round(seconds, 3), 'deduplicated': None}
+
+    def _upload_composite(self, file_path: str, total: int, object_name: str, progress: '_Progress'):
+        stat = os.stat(file_path)
+        parts_prefix = f"{object_name}.parts/{stat.st_size}-{int(stat.st_mtime)}/"
+        ranges = [(offset, min(self.part_size, total - offset)) for offset in range(0, total, self.part_size)]
+        names = [f"{parts_prefix}{index:05d}" for index in range(len(ranges))]
+
+        # Parts left over from an interrupted attempt at this same file are kept
+        existing = {blob.name: blob.size for blob in self.bucket().list_blobs(prefix=parts_prefix)}
+        futures = []
+        for name, (offset, length) in zip(names, ranges):
+            if existing.get(name) == length:
+                progress.add(length)
+                with self._lock:
+                    self.parts_reused += 1
+                continue
+            futures.append(self._executor.submit(self._upload_part, file_path, offset, length, name, progress))
+        # Let every part settle before reporting a failure, so a retry never races a part still in flight
+        wait(futures)
+        for future in futures:
+            future.result()
+
+        blob = self._compose(names, object_name)
+        for name in names:
+            try:
+                self.bucket().blob(name).delete()
+            except Exception as e:
+                print(f"⚠️ Could not delete staged part {name}: {e}")
+        return blob, len(names)
+
+    def _compose(self, names: List[str], object_name: str):
+        bucket = self.bucket()
+        level = 0
+        intermediates = []
+        # Larger files need more than 32 parts: compose in groups, then compose the groups
+        while len(names) > MAX_COMPOSE_SOURCES:
+            grouped = []
+            for start in range(0, len(names), MAX_COMPOSE_SOURCES):
+                group_name = f"{object_name}.compose/{level}-{start // MAX_COMPOSE_SOURCES:05d}"
+                bucket.blob(group_name).compose([bucket.blob(name) for name in names[start:start + MAX_COMPOSE_SOURCES]])
+                grouped.append(group_name)
+            intermediates.extend(grouped)
+            names = grouped
+            level += 1
+
+        blob = bucket.blob(object_name)
+        blob.compose([bucket.blob(name) for name in names])
+        for name in intermediates:
+            try:
+                bucket.blob(name).delete()
+            except Exception as e:
+                print(f"⚠️ Could not delete intermediate object {name}: {e}")
+        return blob
+
+    def _upload_part(self, file_path: str, offset: int, length: int, name: str, progress: '_Progress'):
+        for attempt in range(self.part_retries + 1):
+            sent = [0]
+
+            def on_read(count: int):
+                sent[0] += count
+                progress.add(count)
+
+            blob = self.bucket().blob(name)
+            blob.chunk_size = self.resumable_chunk_size  # resumable session, chunked
+            reader = _PartReader(file_path, offset, length, on_read)
+            try:
+                blob.upload_from_file(reader, size=length, rewind=False)
+                with self._lock:
+                    self.parts_uploaded += 1
+                return blob
+            except Exception as e:
+                progress.add(-sent[0])
+                if attempt == self.part_retries:
+                    raise
+                with self._lock:
+                    self.part_retries_used += 1
+                print(f"⚠️ Part {name} failed ({e}); retrying ({attempt + 1}/{self.part_retries})")
+                time.sleep(min(2 ** attempt, 10))
+            finally:
+                reader.close()
+
+    def _gcs_client(self):
+        if not GCS_AVAILABLE:
+            raise RuntimeError('google-cloud-storage is not installed')
+        client = storage.Client()
+        # Let every part worker keep its own pooled connection
+        try:
+            import requests
+            adapter = requests.adapters.HTTPAdapter(pool_connections=self.max_workers,
+                                                    pool_maxsize=self.max_workers)
+            client._http.mount('https://', adapter)
+        except Exception:
+            pass
+        return client
+
+
+class _Progress:
+    """Thread-safe byte counter shared by the parts of one staging call"""
+
+    def __init__(self, total: int, on_progress: Optional[Callable[[int, int], None]]):
+        self.total = total
+        self.done = 0
+        self._on_progress = on_progress
+        self._lock = threading.Lock()
+
+    def add(self, count: int):
+        with self._lock:
+            self.done += count
+            done = self.done
+        if self._on_progress:
+            self._on_progress(done, self.total)
@@ -0,0 +1,167 @@
+# src/services/event_stream.py
+import itertools
+import json
+import queue
+import threading
+import time
+from typing import Dict, Any, Callable, Iterator, Optional
+
+from src.models.stream_event import EventLog
+
+
+def compute_delta(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Nested dict of the keys whose values differ between old and new (removed keys map to None)"""
+    delta = {}
+    for key, value in new.items():
+        previous = old.get(key) if old else None
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested = compute_delta(previous, value)
+            if nested:
+                delta[key] = nested
+        elif key not in (old or {}) or previous != value:
+            delta[key] = value
+    for key in (old or {}):
+        if key not in new:
+            delta[key] = None
+    return delta
+
+
+class _Subscriber:
+    def __init__(self, max_queue: int):
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.connected_at = time.time()
+        self.dropped = 0
+
+
+class EventBroadcaster:
+    """
+    Fan-out of small JSON events to Server-Sent Events subscribers.
+    Each subscriber has a bounded queue; a viewer that stops reading loses its oldest events
+    instead of growing memory or blocking publishers.
+    publish() reaches this process's subscribers only. publish_shared() appends to the shared
+    EventLog, which a relay thread in every worker process tails every poll_interval seconds,
+    so an upload handled by one worker reaches viewers connected to any of them.
+    """
+
+    def __init__(self, max_queue: int = 100, heartbeat_seconds: float = 15.0, log: Optional[EventLog] = None,
+                 poll_interval: float = 0.5, retention_seconds: float = 300):
+        self.max_queue = max_queue
+        self.heartbeat_seconds = heartbeat_seconds
+        self.log = log
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self.published = 0
+        self.relayed = 0
+        self._ids = itertools.count(1)
+        self._subscribers = set()
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._relay = None
+        self._relay_lock = threading.Lock()
+
+    def start(self):
+        """Start tailing the shared log (no-op without one, or if already running)"""
+        if self.log is None or (self._relay is not None and self._relay.is_alive()):
+            return
+        with self._relay_lock:
+            if self._relay is None or not self._relay.is_alive():
+                self._relay = threading.Thread(target=self._run_relay, args=(self.log.last_id(),),
+                                               name='event-relay', daemon=True)
+                self._relay.start()
+
+    def add_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        """Call listener(event_type, data) for every shared event, whichever process published it"""
+        self._listeners.append(listener)
+
+    def publish_shared(self, event_type: str, data: Dict[str, Any]):
+        """Deliver to subscribers in every worker process"""
+        if self.log is None:
+            self.publish(event_type, data)
+            self._notify(event_type, data)
+            return
+        self.start()
+        self.log.append(event_type, data)
+
+    def publish(self, event_type: str, data: Dict[str, Any]):
+        message = self._format(next(self._ids), event_type, data)
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.published += 1
+        for subscriber in subscribers:
+            self._offer(subscriber, message)
+
+    def stream(self, initial_events: Optional[Dict[str, Dict[str, Any]]] = None) -> Iterator[str]:
+        """
+        Generator of SSE-formatted chunks for one connection. initial_events ({type: data}) are
+        sent first; a comment line goes out every heartbeat_seconds so proxies keep the socket open.
+        """
+        self.start()
+        subscriber = _Subscriber(self.max_queue)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        try:
+            yield "retry: 5000\n\n"
+            for event_type, data in (initial_events or {}).items():
+                yield self._format(next(self._ids), event_type, data)
+            while True:
+                try:
+                    yield subscriber.queue.get(timeout=self.heartbeat_seconds)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+        finally:
+            # Runs when the client disconnects and the server closes the generator
+            with self._lock:
+                self._subscribers.discard(subscriber)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        return {
+            'subscribers': len(subscribers),
+            'events_published': self.published,
+            'shared_events_relayed': self.relayed,
+            'shared_channel': 'sqlite' if self.log is not None else None,
+            'events_dropped': sum(s.dropped for s in subscribers),
+            'max_queue_per_subscriber': self.max_queue
+        }
+
+    def _run_relay(self, last_id: int):
+        last_pruned = 0.0
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                for event in self.log.after(last_id):
+                    last_id = event['event_id']
+                    self.relayed += 1
+                    self.publish(event['event_type'], event['data'])
+                    self._notify(event['event_type'], event['data'])
+                if time.time() - last_pruned > self.retention_seconds:
+                    self.log.prune(self.retention_seconds)
+                    last_pruned = time.time()
+            except Exception as e:
+                print(f"⚠️ Event relay poll failed: {e}")
+
+    def _notify(self, event_type: str, data: Dict[str, Any]):
+        for listener in self._listeners:
+            try:
+                listener(event_type, data)
+            except Exception as e:
+                print(f"⚠️ Event listener failed: {e}")
+
+    @staticmethod
+    def _offer(subscriber: _Subscriber, message: str):
+        while True:
+            try:
+                subscriber.queue.put_nowait(message)
+                return
+            except queue.Full:
+                try:
+                    subscriber.queue.get_nowait()
+                    subscriber.dropped += 1
+                except queue.Empty:
+                    pass
+
+    @staticmethod
+    def _format(event_id: int, event_type: str, data: Dict[str, Any]) -> str:
+        payload = json.dumps(data, default=str, separators=(',', ':'))
+        return f"id: {event_id}\nevent: {event_type}\ndata: {payload}\n\n"
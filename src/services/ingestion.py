@@ -0,0 +1,194 @@
+# src/services/ingestion.py
+import threading
+import time
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from src.models.ingestion import IngestionStore
+
+INGESTION_STATES = ('received', 'probed', 'transcoded', 'staged', 'indexing', 'indexed', 'scored', 'classified')
+
+# Job stage shown while working towards each state
+ACTIVE_STAGE_NAMES = {
+    'probed': 'probing',
+    'transcoded': 'transcoding',
+    'staged': 'staging',
+    'indexing': 'indexing',
+    'indexed': 'indexing',
+    'scored': 'scoring',
+    'classified': 'classifying'
+}
+
+
+class IngestionError(Exception):
+    """A pipeline step failed; the record keeps every state completed before it"""
+
+    def __init__(self, state: str, record: Dict[str, Any], cause: Exception):
+        super().__init__(f"Ingestion step '{state}' failed: {cause}")
+        self.state = state
+        self.record = record
+        self.cause = cause
+
+
+class IncompleteStep(Exception):
+    """
+    Raised by a step whose output isn't final (an unfinished index, a failed search), so it is
+    not persisted and the next attempt runs the step again. reset_from also discards that state
+    and every later one (e.g. a failed indexing task needs a new task); result is what this
+    attempt produced, for the caller to show without keeping it.
+    """
+
+    def __init__(self, message: str, reset_from: Optional[str] = None, result: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.reset_from = reset_from
+        self.result = result
+
+
+class IngestionPipeline:
+    """
+    Drives a submission through received -> probed -> transcoded -> staged -> indexing -> indexed ->
+    scored -> classified.
+    steps maps every state after 'received' to fn(outputs, context) -> output, run in order.
+    Each output is persisted the moment its step finishes; running the same key again resumes
+    after the last completed state, so a finished stage isn't executed twice for the same submission.
+    A failing step is recorded and raised as IngestionError - there is no second route to try.
+    A completed output is reused only while reusable(state, output) says so (a route chosen because
+    a service was down is redone once it is back), and records untouched for record_ttl seconds
+    are dropped, so a submission never stays pinned to an old outcome.
+    """
+
+    def __init__(self, store: IngestionStore, steps: List[Tuple[str, Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]]],
+                 reusable: Optional[Callable[[str, Dict[str, Any]], bool]] = None, record_ttl: float = 24 * 3600):
+        if [name for name, _ in steps] != list(INGESTION_STATES[1:]):
+            raise ValueError(f"Steps must cover {INGESTION_STATES[1:]} in order")
+        self.store = store
+        self.steps = steps
+        self.reusable = reusable
+        self.record_ttl = record_ttl
+        self.runs = 0
+        self.resumed = 0
+        self.steps_run = 0
+        self.steps_skipped = 0
+        self.failures = 0
+        self.incomplete = 0
+        self.expired = 0
+        self.outputs_discarded = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}  # key -> [lock, users]; one run per key at a time
+
+    def run(self, key: str, received: Dict[str, Any], context: Optional[Dict[str, Any]] = None,
+            on_stage: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Bring key to 'classified' and return its record; received describes this submission"""
+        key_lock = self._acquire(key)
+        try:
+            return self._run(key, received, context or {}, on_stage)
+        finally:
+            self._release(key, key_lock)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                'runs': self.runs,
+                'resumed': self.resumed,
+                'steps_run': self.steps_run,
+                'steps_skipped': self.steps_skipped,
+                'failures': self.failures,
+                'incomplete': self.incomplete,
+                'expired': self.expired,
+                'outputs_discarded': self.outputs_discarded,
+                'record_ttl_seconds': self.record_ttl
+            }
+        stats['records'] = self.store.counts()
+        return stats
+
+    def _run(self, key: str, received: Dict[str, Any], context: Dict[str, Any],
+             on_stage: Optional[Callable[[str], None]]) -> Dict[str, Any]:
+        now = time.time()
+        record = self.store.get(key)
+        if record is not None and now - record['updated_at'] > self.record_ttl:
+            print(f"⌛ Ingestion {key[:12]} expired; starting over")
+            record = None
+            with self._lock:
+                self.expired += 1
+        self.store.prune(now - self.record_ttl)
+        if record is None:
+            record = {'key': key, 'state': 'received', 'outputs': {'received': received},
+                      'stage_timings': {}, 'attempts': 1, 'error': None, 'created_at': now}
+        else:
+            # Same bytes and hashtags, new upload: later steps read this attempt's file
+            record['outputs']['received'] = received
+            record['attempts'] += 1
+            record['error'] = None
+            self._discard_stale(record)
+            with self._lock:
+                self.resumed += 1
+            print(f"🔁 Resuming ingestion {key[:12]} after '{record['state']}' (attempt {record['attempts']})")
+        self.store.save(record)
+        with self._lock:
+            self.runs += 1
+
+        for state, step in self.steps:
+            if state in record['outputs']:
+                with self._lock:
+                    self.steps_skipped += 1
+                continue
+            if on_stage:
+                on_stage(ACTIVE_STAGE_NAMES[state])
+            started = time.time()
+            try:
+                output = step(record['outputs'], context)
+            except Exception as e:
+                record['error'] = f"{state}: {e}"
+                record['stage_timings'][state] = round(time.time() - started, 3)
+                if isinstance(e, IncompleteStep) and e.reset_from:
+                    self._discard_from(record, e.reset_from)
+                self.store.save(record)
+                with self._lock:
+                    if isinstance(e, IncompleteStep):
+                        self.incomplete += 1
+                    else:
+                        self.failures += 1
+                raise IngestionError(state, record, e) from e
+            record['outputs'][state] = output if output is not None else {}
+            record['stage_timings'][state] = round(time.time() - started, 3)
+            record['state'] = state
+            self.store.save(record)
+            with self._lock:
+                self.steps_run += 1
+        return record
+
+    def _discard_stale(self, record: Dict[str, Any]):
+        """Drop the first completed output reusable() rejects, and everything after it"""
+        if self.reusable is None:
+            return
+        for state, _ in self.steps:
+            output = record['outputs'].get(state)
+            if output is not None and not self.reusable(state, output):
+                print(f"♻️ Redoing ingestion {record['key'][:12]} from '{state}'")
+                self._discard_from(record, state)
+                return
+
+    def _discard_from(self, record: Dict[str, Any], state: str):
+        """Forget state and every later output; the record falls back to the last state kept"""
+        later = INGESTION_STATES[INGESTION_STATES.index(state):]
+        for name in later:
+            if record['outputs'].pop(name, None) is not None:
+                with self._lock:
+                    self.outputs_discarded += 1
+            record['stage_timings'].pop(name, None)
+        record['state'] = max((name for name in record['outputs'] if name in INGESTION_STATES),
+                              key=INGESTION_STATES.index)
+
+    def _acquire(self, key: str) -> threading.Lock:
+        with self._lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        entry[0].acquire()
+        return entry[0]
+
+    def _release(self, key: str, key_lock: threading.Lock):
+        key_lock.release()
+        with self._lock:
+            entry = self._key_locks[key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._key_locks[key]
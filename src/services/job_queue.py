@@ -0,0 +1,189 @@
+# src/services/job_queue.py
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Optional
+
+from src.models.job import JobStore
+
+
+class ValidationJob:
+    """A single background validation submission and its progress"""
+
+    def __init__(self, kind: str, description: str = ""):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.description = description
+        self.status = 'queued'  # queued -> running -> completed | failed
+        self.stage = 'queued'
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.stage_timings = {}
+        self.progress = None  # {'stage', 'done', 'total', 'percent'} for stages that report it
+        self.result = None
+        self.error = None
+        self._stage_started_at = self.created_at
+        self._lock = threading.Lock()
+        self._store = None  # JobStore that mirrors every change, set by the queue
+
+    def set_stage(self, stage: str):
+        """Move the job to a new pipeline stage, recording time spent in the previous one"""
+        with self._lock:
+            if stage == self.stage:
+                return
+            now = time.time()
+            self.stage_timings[self.stage] = round(
+                self.stage_timings.get(self.stage, 0.0) + (now - self._stage_started_at), 3
+            )
+            self.stage = stage
+            self._stage_started_at = now
+        self._save()
+
+    def set_progress(self, done: int, total: int):
+        """Record how far the current stage has got (e.g. bytes staged)"""
+        with self._lock:
+            self.progress = {
+                'stage': self.stage,
+                'done': done,
+                'total': total,
+                'percent': round(100.0 * done / total, 1) if total else 100.0
+            }
+        self._save()
+
+    def _start(self):
+        self.started_at = time.time()
+        self.status = 'running'
+        self.set_stage('running')
+
+    def _finish(self, result: Dict[str, Any] = None, error: str = None):
+        self.set_stage('failed' if error else 'completed')
+        with self._lock:
+            self.finished_at = time.time()
+            self.result = result
+            self.error = error
+            self.status = 'failed' if error else 'completed'
+        self._save(now=True)
+
+    def _save(self, now: bool = False):
+        if self._store is None:
+            return
+        try:
+            self._store.save(self.to_dict(), now=now)
+        except Exception as e:
+            print(f"⚠️ Could not persist job {self.id}: {e}")
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ('completed', 'failed')
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable view of the job for the status endpoint"""
+        with self._lock:
+            now = time.time()
+            end = self.finished_at or now
+            return {
+                'job_id': self.id,
+                'kind': self.kind,
+                'description': self.description,
+                'status': self.status,
+                'stage': self.stage,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at,
+                'queue_wait_seconds': round((self.started_at or now) - self.created_at, 3),
+                'elapsed_seconds': round(end - self.created_at, 3),
+                'stage_timings': dict(self.stage_timings),
+                'progress': dict(self.progress) if self.progress else None,
+                'result': self.result,
+                'error': self.error
+            }
+
+
+class ValidationJobQueue:
+    """
+    Bounded worker pool that runs validation pipelines off the request thread.
+    With a store, every job's state is mirrored to the shared database so a status
+    request served by another worker process still finds it.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 200, retention_seconds: int = 3600,
+                 store: Optional[JobStore] = None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='validation-worker')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, description: str,
+               fn: Callable[..., Dict[str, Any]], *args, **kwargs) -> Optional[ValidationJob]:
+        """
+        Queue fn(job, *args, **kwargs) for background execution.
+        Returns None when the backlog is full so callers can answer with a 503.
+        """
+        with self._lock:
+            self._prune_finished()
+            if self._count_unfinished() >= self.max_pending:
+                print(f"⚠️ Validation queue full ({self.max_pending} pending jobs)")
+                return None
+            job = ValidationJob(kind, description)
+            job._store = self.store
+            self._jobs[job.id] = job
+        job._save()
+
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        print(f"📥 Queued {kind} validation job {job.id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[ValidationJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """to_dict() of the job, looked up in the shared store when another process owns it"""
+        job = self.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        return self.store.get(job_id) if self.store else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            statuses = {}
+            for job in self._jobs.values():
+                statuses[job.status] = statuses.get(job.status, 0) + 1
+            return {
+                'max_workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'tracked_jobs': len(self._jobs),
+                'by_status': statuses
+            }
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job: ValidationJob, fn, args, kwargs):
+        job._start()
+        try:
+            result = fn(job, *args, **kwargs)
+            job._finish(result=result)
+            print(f"✅ Validation job {job.id} completed in {job.finished_at - job.created_at:.1f}s")
+        except Exception as e:
+            print(f"❌ Validation job {job.id} failed: {e}")
+            print(f"   Full traceback: {traceback.format_exc()}")
+            job._finish(error=str(e))
+
+    def _count_unfinished(self) -> int:
+        return sum(1 for job in self._jobs.values() if not job.is_finished)
+
+    def _prune_finished(self):
+        cutoff = time.time() - self.retention_seconds
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.is_finished and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+        if self.store and expired:
+            self.store.prune(cutoff)
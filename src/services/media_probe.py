@@ -0,0 +1,255 @@
+# src/services/media_probe.py
+import json
+import os
+import shutil
+import struct
+import subprocess
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+FFPROBE_PATH = shutil.which('ffprobe')
+FFPROBE_AVAILABLE = FFPROBE_PATH is not None
+
+# ISO base media (MP4/MOV/M4V/3GP) boxes descended into on the way to track metadata
+CONTAINER_BOXES = {'moov', 'trak', 'mdia', 'minf', 'stbl'}
+# Extensions the in-process header parser covers on its own; other containers need ffprobe
+ISO_BMFF_EXTENSIONS = {'.mp4', '.mov', '.m4v', '.3gp'}
+
+
+class MediaProbeError(Exception):
+    """
+    The file's container metadata could not be read. unreadable is True when a prober that
+    handles this kind of file actually ran and failed (the file is broken or isn't a video),
+    False when the only suitable prober, ffprobe, isn't installed.
+    """
+
+    def __init__(self, message: str, unreadable: bool = False):
+        super().__init__(message)
+        self.unreadable = unreadable
+
+
+class VideoPolicyError(Exception):
+    """The video was read fine but is outside what we accept (too long, too small, ...)"""
+
+
+def _boxes(f, start: int, end: int) -> Iterator[Tuple[str, int, int]]:
+    """(type, payload_start, box_end) for each box in [start, end); payloads are seeked over, not read"""
+    position = start
+    while position + 8 <= end:
+        f.seek(position)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, kind = struct.unpack('>I4s', header)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack('>Q', f.read(8))[0]
+            header_size = 16
+        elif size == 0:
+            size = end - position
+        if size < header_size:
+            raise MediaProbeError(f"Corrupt {kind!r} box at offset {position}")
+        yield kind.decode('latin-1'), position + header_size, position + size
+        position += size
+
+
+def probe_iso_bmff(file_path: str) -> Dict[str, Any]:
+    """Duration, resolution and codecs from an MP4/MOV header (moov box) without touching frame data"""
+    with open(file_path, 'rb') as f:
+        f.seek(4)
+        if f.read(4) not in (b'ftyp', b'moov', b'wide', b'mdat', b'free'):
+            raise MediaProbeError('Not an ISO base media file')
+        file_size = os.fstat(f.fileno()).st_size
+        info = {'container': 'mp4', 'duration': 0.0, 'width': 0, 'height': 0,
+                'video_codec': None, 'audio_codec': None}
+        moov = next(((start, end) for kind, start, end in _boxes(f, 0, file_size) if kind == 'moov'), None)
+        if moov is None:
+            raise MediaProbeError('No moov box (truncated upload?)')
+        for kind, start, end in _boxes(f, *moov):
+            if kind == 'mvhd':
+                info['duration'] = _read_duration(f, start)
+            elif kind == 'trak':
+                _read_track(f, start, end, info)
+
+    if info['duration'] > 0:
+        info['bitrate'] = int(file_size * 8 / info['duration'])
+    return info
+
+
+def _read_duration(f, start: int) -> float:
+    """mvhd/mdhd: version-dependent timescale + duration"""
+    f.seek(start)
+    version = f.read(1)[0]
+    if version == 1:
+        f.seek(start + 20)
+        timescale, duration = struct.unpack('>IQ', f.read(12))
+    else:
+        f.seek(start + 12)
+        timescale, duration = struct.unpack('>II', f.read(8))
+    return duration / timescale if timescale else 0.0
+
+
+def _read_track(f, start: int, end: int, info: Dict[str, Any]):
+    width = height = 0
+    handler = codec = None
+    stack = [(start, end)]
+    while stack:
+        for kind, box_start, box_end in _boxes(f, *stack.pop()):
+            if kind == 'tkhd':
+                f.seek(box_start)
+                offset = 88 if f.read(1)[0] == 1 else 76
+                f.seek(box_start + offset)
+                width, height = (value >> 16 for value in struct.unpack('>II', f.read(8)))
+            elif kind == 'hdlr':
+                f.seek(box_start + 8)
+                handler = f.read(4).decode('latin-1')
+            elif kind == 'stsd':
+                f.seek(box_start + 12)
+                codec = f.read(4).decode('latin-1').strip() or None
+            elif kind in CONTAINER_BOXES:
+                stack.append((box_start, box_end))
+
+    if handler == 'vide' and not info['video_codec']:
+        info['video_codec'], info['width'], info['height'] = codec, width, height
+    elif handler == 'soun' and not info['audio_codec']:
+        info['audio_codec'] = codec
+
+
+class MediaProbe:
+    """
+    Reads duration, resolution, codecs and bitrate from an uploaded file's container header.
+    MP4/MOV are parsed in-process (only the moov box is read, however large the file);
+    other containers go to ffprobe when it's installed, which also reads headers only.
+    Results are cached per content hash, so a resubmitted clip is never probed twice.
+    check() applies the upload policy before anything is staged or indexed.
+    """
+
+    def __init__(self, min_duration: float = 4, max_duration: float = 7200, min_resolution: int = 360,
+                 max_resolution: int = 3840, max_entries: int = 1024, ffprobe_timeout: float = 15):
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.min_resolution = min_resolution
+        self.max_resolution = max_resolution
+        self.max_entries = max_entries
+        self.ffprobe_timeout = ffprobe_timeout
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.rejections = 0
+        self._results = OrderedDict()  # content hash -> probe result
+        self._lock = threading.Lock()
+
+    def probe(self, file_path: str, content_hash: Optional[str] = None) -> Dict[str, Any]:
+        """Container metadata for file_path; raises MediaProbeError when no prober can read it"""
+        if content_hash:
+            with self._lock:
+                cached = self._results.get(content_hash)
+                if cached is not None:
+                    self._results.move_to_end(content_hash)
+                    self.hits += 1
+                    return dict(cached)
+                self.misses += 1
+
+        try:
+            info = self._probe(file_path)
+        except MediaProbeError:
+            with self._lock:
+                self.failures += 1
+            raise
+
+        if content_hash:
+            with self._lock:
+                self._results[content_hash] = info
+                while len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+        return dict(info)
+
+    def check(self, info: Dict[str, Any]):
+        """Raise VideoPolicyError if the probed video is outside the upload policy"""
+        reason = self._policy_violation(info)
+        if reason:
+            with self._lock:
+                self.rejections += 1
+            raise VideoPolicyError(reason)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'ffprobe_available': FFPROBE_AVAILABLE,
+                'cached_results': len(self._results),
+                'hits': self.hits,
+                'misses': self.misses,
+                'failures': self.failures,
+                'rejections': self.rejections,
+                'policy': {
+                    'min_duration': self.min_duration,
+                    'max_duration': self.max_duration,
+                    'min_resolution': self.min_resolution,
+                    'max_resolution': self.max_resolution
+                }
+            }
+
+    def _probe(self, file_path: str) -> Dict[str, Any]:
+        errors = []
+        header_covers_file = os.path.splitext(file_path)[1].lower() in ISO_BMFF_EXTENSIONS
+        header_failed = False
+        try:
+            info = probe_iso_bmff(file_path)
+            if info['duration'] > 0 or not FFPROBE_AVAILABLE:
+                info['probe_method'] = 'header'
+                return info
+        except (MediaProbeError, struct.error, IndexError) as e:
+            errors.append(f"header: {e}")
+            header_failed = True
+        if FFPROBE_AVAILABLE:
+            try:
+                info = self._ffprobe(file_path)
+                info['probe_method'] = 'ffprobe'
+                return info
+            except MediaProbeError as e:
+                errors.append(f"ffprobe: {e}")
+                raise MediaProbeError('; '.join(errors), unreadable=True) from e
+        errors.append('ffprobe not installed')
+        raise MediaProbeError('; '.join(errors), unreadable=header_failed and header_covers_file)
+
+    def _ffprobe(self, file_path: str) -> Dict[str, Any]:
+        try:
+            completed = subprocess.run(
+                [FFPROBE_PATH, '-v', 'error', '-show_format', '-show_streams', '-of', 'json', file_path],
+                capture_output=True, timeout=self.ffprobe_timeout, check=True
+            )
+            data = json.loads(completed.stdout or b'{}')
+        except (subprocess.SubprocessError, OSError, ValueError) as e:
+            raise MediaProbeError(str(e)) from e
+
+        fmt = data.get('format') or {}
+        streams = data.get('streams') or []
+        video = next((s for s in streams if s.get('codec_type') == 'video'), {})
+        audio = next((s for s in streams if s.get('codec_type') == 'audio'), {})
+        duration = float(fmt.get('duration') or video.get('duration') or 0)
+        return {
+            'container': (fmt.get('format_name') or '').split(',')[0] or None,
+            'duration': duration,
+            'width': int(video.get('width') or 0),
+            'height': int(video.get('height') or 0),
+            'video_codec': video.get('codec_name'),
+            'audio_codec': audio.get('codec_name'),
+            'bitrate': int(fmt['bit_rate']) if fmt.get('bit_rate') else None
+        }
+
+    def _policy_violation(self, info: Dict[str, Any]) -> Optional[str]:
+        duration = info.get('duration') or 0
+        if info.get('audio_codec') and not info.get('video_codec'):
+            return 'The file has an audio track but no video'
+        if duration and duration < self.min_duration:
+            return f"Video is {duration:.1f}s long; it must be at least {self.min_duration:.0f}s"
+        if duration > self.max_duration:
+            return f"Video is {duration / 60:.1f} minutes long; the limit is {self.max_duration / 60:.0f} minutes"
+        width, height = info.get('width') or 0, info.get('height') or 0
+        if width and height:
+            if min(width, height) < self.min_resolution:
+                return f"Resolution {width}x{height} is below the {self.min_resolution}p minimum"
+            if max(width, height) > self.max_resolution:
+                return f"Resolution {width}x{height} is above the {self.max_resolution}px maximum"
+        return None
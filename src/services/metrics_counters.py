@@ -0,0 +1,63 @@
+# src/services/metrics_counters.py
+import threading
+from typing import Dict
+
+
+class ShardedCounters:
+    """
+    Named counters whose increments land in a per-thread shard, so writers never take a lock.
+    Reads sum every shard. Shards are cumulative and only their owning thread writes them,
+    so a snapshot can never lose or double-count an increment: anything added after a
+    snapshot is simply part of the next one. Shards of finished threads are folded into a
+    retired total on read, which keeps the shard list bounded under thread-per-request servers.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []   # [(owner thread, shard dict)]
+        self._retired = {}
+        self._lock = threading.Lock()  # readers and shard registration only
+
+    def add(self, key: str, delta: float = 1):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._register_shard()
+        shard[key] = shard.get(key, 0) + delta
+
+    def add_many(self, deltas: Dict[str, float]):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._register_shard()
+        for key, delta in deltas.items():
+            shard[key] = shard.get(key, 0) + delta
+
+    def snapshot(self) -> Dict[str, float]:
+        """Cumulative totals of every counter across all threads"""
+        with self._lock:
+            totals = dict(self._retired)
+            live_shards = []
+            for owner, shard in self._shards:
+                # Check liveness before copying: a shard copied after its owner exited is final
+                alive = owner.is_alive()
+                # dict.copy() runs without releasing the GIL, so the owner can't tear it
+                values = shard.copy()
+                for key, value in values.items():
+                    totals[key] = totals.get(key, 0) + value
+                if alive:
+                    live_shards.append((owner, shard))
+                else:
+                    for key, value in values.items():
+                        self._retired[key] = self._retired.get(key, 0) + value
+            self._shards = live_shards
+        return totals
+
+    def shard_count(self) -> int:
+        with self._lock:
+            return len(self._shards)
+
+    def _register_shard(self) -> Dict[str, float]:
+        shard = {}
+        self._local.shard = shard
+        with self._lock:
+            self._shards.append((threading.current_thread(), shard))
+        return shard
@@ -0,0 +1,247 @@
+# src/services/mob_classifier.py
+import copy
+from collections import deque
+from typing import Dict, Any, Iterable, List, Optional, Set
+
+# Single source of truth for the Milk Mobs (used by classification and the explore pages)
+MOB_DEFINITIONS = {
+    'extreme_milk': {
+        'id': 'mob001',
+        'name': 'Extreme Milk',
+        'description': 'Adventurous milk drinking with sports, stunts, and daring activities',
+        'keywords': ['extreme', 'stunt', 'skateboard', 'bike', 'jump', 'trick', 'adventure', 'dare', 'challenge'],
+        'hashtags': ['#extrememilk', '#stunts', '#adventure', '#challenge'],
+        'icon': '🏄‍♂️',
+        'color': '#ff6b35',
+        'member_count': 23
+    },
+    'milk_artists': {
+        'id': 'mob002',
+        'name': 'Milk Artists',
+        'description': 'Creative artistic expressions involving milk - art, photography, aesthetics',
+        'keywords': ['art', 'creative', 'aesthetic', 'photo', 'picture', 'beautiful', 'artistic', 'paint', 'design'],
+        'hashtags': ['#milkart', '#aesthetic', '#creative', '#photography'],
+        'icon': '🎨',
+        'color': '#4ecdc4',
+        'member_count': 31
+    },
+    'mukbang_masters': {
+        'id': 'mob003',
+        'name': 'Mukbang Masters',
+        'description': 'Food enthusiasts featuring milk in eating shows and food content',
+        'keywords': ['mukbang', 'asmr', 'eating', 'food', 'taste', 'review', 'delicious', 'cooking'],
+        'hashtags': ['#mukbang', '#asmr', '#foodie', '#cooking'],
+        'icon': '🍽️',
+        'color': '#45b7d1',
+        'member_count': 67
+    },
+    'fitness_fuel': {
+        'id': 'mob004',
+        'name': 'Fitness Fuel',
+        'description': 'Athletes and fitness enthusiasts using milk for workout nutrition',
+        'keywords': ['workout', 'gym', 'fitness', 'protein', 'muscle', 'training', 'exercise', 'athlete', 'nutrition'],
+        'hashtags': ['#fitnessmilk', '#protein', '#workout', '#gym'],
+        'icon': '💪',
+        'color': '#96ceb4',
+        'member_count': 45
+    },
+    'daily_milk': {
+        'id': 'mob005',
+        'name': 'Daily Milk',
+        'description': 'Everyday milk moments - breakfast, cooking, family time',
+        'keywords': ['breakfast', 'morning', 'cereal', 'coffee', 'cooking', 'family', 'home', 'daily', 'routine'],
+        'hashtags': ['#dailymilk', '#breakfast', '#family', '#morning'],
+        'icon': '🥛',
+        'color': '#feca57',
+        'member_count': 89
+    }
+}
+
+# Score weights (shared by MobClassifier and the vectorized BulkReclassifier)
+TITLE_KEYWORD_WEIGHT = 0.3
+HASHTAG_WEIGHT = 0.4
+AI_ANALYSIS_BONUS = 0.2
+PLATFORM_BONUS_WEIGHT = 0.1
+DURATION_BONUS_WEIGHT = 0.1
+
+# Small score nudges by platform and duration, per mob
+PLATFORM_BONUS = {
+    'youtube': {'mukbang_masters', 'fitness_fuel'},
+    'tiktok': {'extreme_milk', 'milk_artists'},
+    'instagram': {'milk_artists'}
+}
+# Applied when duration > 0; written with & so they also work on NumPy arrays
+DURATION_BONUS = {
+    'extreme_milk': lambda d: d < 30,
+    'mukbang_masters': lambda d: d > 60,
+    'daily_milk': lambda d: (d >= 15) & (d <= 45)
+}
+
+
+def mob_result(mobs: Dict[str, Dict[str, Any]], mob_key: str, score: float, reasons: List[str],
+               method: str) -> Dict[str, Any]:
+    """The classification dict returned by every mob classifier"""
+    mob = mobs[mob_key]
+    return {
+        'mob_id': mob['id'],
+        'mob_key': mob_key,
+        'mob_name': mob['name'],
+        'mob_description': mob['description'],
+        'mob_icon': mob['icon'],
+        'mob_color': mob['color'],
+        'match_score': score,
+        'match_reasons': reasons,
+        'classification_method': method,
+        'all_mobs': mobs
+    }
+
+
+class _PatternAutomaton:
+    """
+    Aho-Corasick automaton over a fixed set of substrings.
+    matches(text) reports every pattern occurring anywhere in text - overlapping ones included -
+    in a single left-to-right pass, independent of how many patterns there are.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [set()]
+
+        for pattern in set(patterns):
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(set())
+                state = next_state
+            self.output[state].add(pattern)
+
+        # Breadth-first so every failure link points at an already-finished, shallower state
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] |= self.output[self.fail[next_state]]
+
+    def matches(self, text: str) -> Set[str]:
+        found = set()
+        state = 0
+        goto, fail, output = self.goto, self.fail, self.output
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+        return found
+
+
+class MobClassifier:
+    """
+    Assigns a video to a Milk Mob from its title, hashtags, platform and duration.
+    Mob keywords and hashtags are compiled once into two Aho-Corasick automata, so each
+    classification is one pass over the title and one over the hashtags, however many
+    mobs and keywords are defined.
+    """
+
+    def __init__(self, mobs: Dict[str, Dict[str, Any]] = None, fallback_mob: str = 'daily_milk',
+                 min_score: float = 0.2):
+        self.mobs = copy.deepcopy(mobs or MOB_DEFINITIONS)
+        self.fallback_mob = fallback_mob
+        self.min_score = min_score
+
+        # pattern -> mob keys it counts for (one keyword may belong to several mobs)
+        self.keyword_mobs = self._pattern_index('keywords')
+        self.hashtag_mobs = self._pattern_index('hashtags')
+        self._keyword_matcher = _PatternAutomaton(self.keyword_mobs)
+        self._hashtag_matcher = _PatternAutomaton(self.hashtag_mobs)
+
+    def classify(self, video_info: Dict[str, Any], hashtags: str,
+                 validation_result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Best-matching mob for one video (falls back to Daily Milk below min_score)"""
+        title = (video_info.get('title') or '').lower()
+        platform = (video_info.get('platform') or '').lower()
+        duration = video_info.get('duration') or 0
+        twelve_labs_data = (validation_result or {}).get('twelve_labs_data', {})
+        ai_analyzed = bool(twelve_labs_data and twelve_labs_data.get('search_results', 0) > 0)
+
+        title_hits = self._count_hits(self._keyword_matcher.matches(title), self.keyword_mobs)
+        hashtag_hits = self._count_hits(self._hashtag_matcher.matches((hashtags or '').lower()), self.hashtag_mobs)
+
+        mob_scores = {}
+        for mob_key in self.mobs:
+            score = 0
+            reasons = []
+
+            title_matches = title_hits.get(mob_key, 0)
+            if title_matches > 0:
+                score += title_matches * TITLE_KEYWORD_WEIGHT
+                reasons.append(f"title keywords ({title_matches})")
+
+            hashtag_matches = hashtag_hits.get(mob_key, 0)
+            if hashtag_matches > 0:
+                score += hashtag_matches * HASHTAG_WEIGHT
+                reasons.append(f"hashtag match ({hashtag_matches})")
+
+            if ai_analyzed:
+                score += AI_ANALYSIS_BONUS  # Bonus for having Twelve Labs analysis
+                reasons.append("AI-analyzed content")
+
+            if mob_key in PLATFORM_BONUS.get(platform, ()):
+                score += PLATFORM_BONUS_WEIGHT
+
+            if duration > 0 and mob_key in DURATION_BONUS and DURATION_BONUS[mob_key](duration):
+                score += DURATION_BONUS_WEIGHT
+
+            mob_scores[mob_key] = (score, reasons)
+
+        # max() keeps the first-defined mob on ties; rounding stops float noise from breaking them
+        best_key = max(mob_scores, key=lambda key: round(mob_scores[key][0], 6))
+        best_score, best_reasons = mob_scores[best_key]
+
+        # Fallback to Daily Milk if no strong matches
+        if round(best_score, 6) < self.min_score:
+            best_key = self.fallback_mob
+            best_score = mob_scores[best_key][0]
+            best_reasons = ['general milk content']
+
+        return mob_result(self.mobs, best_key, best_score, best_reasons, method='keywords')
+
+    def classify_many(self, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Classify [{'video_info': ..., 'hashtags': ..., 'validation_result': ...}, ...] in order"""
+        return [
+            self.classify(item.get('video_info') or {}, item.get('hashtags') or '', item.get('validation_result'))
+            for item in items
+        ]
+
+    def mob_directory(self) -> Dict[str, Dict[str, Any]]:
+        """Display info for every mob (fresh copies, safe for callers to annotate)"""
+        return {
+            mob_key: {field: value for field, value in mob.items() if field not in ('keywords', 'hashtags')}
+            for mob_key, mob in self.mobs.items()
+        }
+
+    def _pattern_index(self, field: str) -> Dict[str, List[str]]:
+        index = {}
+        for mob_key, mob in self.mobs.items():
+            for pattern in mob.get(field, []):
+                index.setdefault(pattern.lower(), []).append(mob_key)
+        return index
+
+    @staticmethod
+    def _count_hits(found: Set[str], pattern_mobs: Dict[str, List[str]]) -> Dict[str, int]:
+        hits = {}
+        for pattern in found:
+            for mob_key in pattern_mobs[pattern]:
+                hits[mob_key] = hits.get(mob_key, 0) + 1
+        return hits
@@ -0,0 +1,297 @@
+# src/services/mob_embeddings.py
+import copy
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Any, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from src.models.embedding import EmbeddingStore
+from src.services.mob_classifier import MOB_DEFINITIONS, mob_result
+
+
+class EmbeddingUnavailableError(ValueError):
+    """The index holds no embeddings for this video (e.g. the index was created without embedding support)"""
+
+
+def _normalize(vector: 'np.ndarray') -> 'np.ndarray':
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm > 0 else vector
+
+
+class TwelveLabsEmbeddingProvider:
+    """Video embeddings from the Marengo index, text embeddings from the Embed API"""
+
+    def __init__(self, client: Any, index_id: str, model_name: str = 'Marengo-retrieval-2.7', limiter: Any = None):
+        self.client = client
+        self.index_id = index_id
+        self.model_name = model_name
+        self.limiter = limiter
+
+    @property
+    def model(self) -> str:
+        return f"twelvelabs:{self.model_name}"
+
+    def video_embedding(self, video_id: str, context_text: str = '') -> 'np.ndarray':
+        """Mean of the video's embedding segments (its whole-video segment when the index has one)"""
+        segments = self.video_segments(video_id)
+        whole_video = [segment for segment in segments if segment['scope'] == 'video']
+        return np.mean(np.asarray([segment['vector'] for segment in (whole_video or segments)]), axis=0)
+
+    def video_segments(self, video_id: str, context_text: str = '') -> List[Dict[str, Any]]:
+        """[{'start', 'end', 'scope', 'vector'}, ...] as stored in the index"""
+        if self.limiter is not None:
+            self.limiter.acquire('status')
+        # GET /indexes/{index_id}/videos/{id}?embedding_option=visual-text
+        video = self.client.index.video.retrieve(index_id=self.index_id, id=video_id,
+                                                 embedding_option=['visual-text'])
+        segments = getattr(getattr(getattr(video, 'embedding', None), 'video_embedding', None), 'segments', None) or []
+        if not segments:
+            raise EmbeddingUnavailableError(f"No embeddings stored for video {video_id} (index needs embedding support)")
+        return [
+            {
+                'start': getattr(segment, 'start_offset_sec', None),
+                'end': getattr(segment, 'end_offset_sec', None),
+                'scope': getattr(segment, 'embedding_scope', None) or 'clip',
+                'vector': np.asarray(segment.embeddings_float, dtype=np.float32)
+            }
+            for segment in segments
+        ]
+
+    def list_video_ids(self, page_limit: int = 50) -> List[str]:
+        """Every video in the index"""
+        video_ids = []
+        page = 1
+        while True:
+            if self.limiter is not None:
+                self.limiter.acquire('status')
+            videos = list(self.client.index.video.list(index_id=self.index_id, page=page, page_limit=page_limit))
+            video_ids.extend(video.id for video in videos)
+            if len(videos) < page_limit:
+                return video_ids
+            page += 1
+
+    def text_embedding(self, text: str) -> 'np.ndarray':
+        response = self.client.embed.create(model_name=self.model_name, text=text)
+        text_embedding = response.text_embedding
+        segments = getattr(text_embedding, 'segments', None)
+        values = segments[0].embeddings_float if segments else text_embedding.float
+        return np.asarray(values, dtype=np.float32)
+
+
+class LocalEmbeddingProvider:
+    """
+    Offline stand-in: hashes words into a fixed-size signed vector (the hashing trick).
+    Videos are embedded from the context text the caller passes (title + hashtags),
+    so results track keyword overlap - good enough for development and tests, never the
+    default: it's only used when EMBEDDING_PROVIDER=local is set explicitly.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    @property
+    def model(self) -> str:
+        return f"local-hash-{self.dim}"
+
+    def video_embedding(self, video_id: str, context_text: str = '') -> 'np.ndarray':
+        return self.text_embedding(context_text or video_id)
+
+    def video_segments(self, video_id: str, context_text: str = '') -> List[Dict[str, Any]]:
+        return [{'start': None, 'end': None, 'scope': 'video', 'vector': self.video_embedding(video_id, context_text)}]
+
+    def list_video_ids(self) -> List[str]:
+        return []
+
+    def text_embedding(self, text: str) -> 'np.ndarray':
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in re.findall(r'[a-z0-9]+', text.lower()):
+            digest = hashlib.md5(token.encode('utf-8')).digest()
+            index = int.from_bytes(digest[:4], 'little') % self.dim
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        return vector
+
+
+def build_embedding_provider(setting: str, client: Any, index_id: str, model_name: str,
+                             limiter: Any = None) -> Optional[Any]:
+    """
+    The provider EMBEDDING_PROVIDER asks for: 'local' for the hashing stand-in, otherwise Twelve Labs
+    when a client is configured. None (keyword mob rules only) when there's no client or no NumPy.
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+    if setting == 'local':
+        return LocalEmbeddingProvider()
+    if client:
+        return TwelveLabsEmbeddingProvider(client, index_id, model_name, limiter=limiter)
+    return None
+
+
+class EmbeddingMobClassifier:
+    """
+    Assigns a video to the mob whose centroid is closest (cosine) to the video's embedding.
+    Mob centroids are built once from each mob's description, keywords and hashtags and kept
+    as one contiguous, row-normalized float32 matrix, so a classification is a single dot
+    product. Video embeddings are fetched once per video: an in-memory LRU sits in front of
+    the SQLite EmbeddingStore, and concurrent requests for the same video share one fetch.
+    A video the index has no embeddings for is remembered for unavailable_ttl seconds, so
+    repeat classifications go straight to the keyword fallback instead of asking again.
+    """
+
+    def __init__(self, provider: Any, store: EmbeddingStore, mobs: Dict[str, Dict[str, Any]] = None,
+                 min_similarity: float = 0.05, max_cached: int = 2048, unavailable_ttl: float = 3600):
+        self.provider = provider
+        self.store = store
+        self.mobs = copy.deepcopy(mobs or MOB_DEFINITIONS)
+        self.min_similarity = min_similarity
+        self.max_cached = max_cached
+        self.unavailable_ttl = unavailable_ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.unavailable_hits = 0
+        self._vectors = OrderedDict()  # video_id -> normalized vector
+        self._unavailable = OrderedDict()  # video_id -> (error message, expires_at)
+        self._in_flight = {}           # video_id -> Future
+        self._lock = threading.Lock()
+        self._centroid_lock = threading.Lock()
+        self._centroids = None
+        self._centroid_keys = []
+
+    def classify(self, video_id: str, context_text: str = '') -> Optional[Dict[str, Any]]:
+        """Nearest-centroid mob, or None when there's no embedding or no mob is similar enough"""
+        try:
+            vector = self.video_vector(video_id, context_text)
+            centroids = self.centroids()
+        except Exception as e:
+            print(f"⚠️ Embedding classification unavailable for {video_id}: {e}")
+            return None
+
+        similarities = centroids @ vector
+        best = int(similarities.argmax())
+        best_similarity = float(similarities[best])
+        if best_similarity < self.min_similarity:
+            return None
+
+        ranked = similarities.argsort()[::-1]
+        reasons = [f"embedding similarity {best_similarity:.2f}"]
+        if len(ranked) > 1:
+            runner_up = int(ranked[1])
+            reasons.append(f"next closest: {self.mobs[self._centroid_keys[runner_up]]['name']} "
+                           f"({float(similarities[runner_up]):.2f})")
+        return mob_result(self.mobs, self._centroid_keys[best], round(best_similarity, 4), reasons,
+                          method='embedding')
+
+    def video_vector(self, video_id: str, context_text: str = '') -> 'np.ndarray':
+        """Normalized embedding for one video, fetched from the provider at most once"""
+        with self._lock:
+            vector = self._vectors.get(video_id)
+            if vector is not None:
+                self._vectors.move_to_end(video_id)
+                self.hits += 1
+                return vector
+            unavailable = self._unavailable.get(video_id)
+            if unavailable is not None:
+                if time.time() < unavailable[1]:
+                    self.unavailable_hits += 1
+                    raise EmbeddingUnavailableError(unavailable[0])
+                del self._unavailable[video_id]
+            future = self._in_flight.get(video_id)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                self._in_flight[video_id] = future
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            key = f"video:{video_id}"
+            vector = self.store.get(self.provider.model, key)
+            if vector is None:
+                vector = np.asarray(self.provider.video_embedding(video_id, context_text), dtype=np.float32)
+                self.store.put(self.provider.model, key, vector)
+                with self._lock:
+                    self.misses += 1
+            else:
+                with self._lock:
+                    self.hits += 1
+            vector = _normalize(vector)
+        except Exception as e:
+            with self._lock:
+                self._in_flight.pop(video_id, None)
+                self.failures += 1
+                if isinstance(e, EmbeddingUnavailableError):
+                    self._unavailable[video_id] = (str(e), time.time() + self.unavailable_ttl)
+                    while len(self._unavailable) > self.max_cached:
+                        self._unavailable.popitem(last=False)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._in_flight.pop(video_id, None)
+            self._vectors[video_id] = vector
+            while len(self._vectors) > self.max_cached:
+                self._vectors.popitem(last=False)
+        future.set_result(vector)
+        return vector
+
+    def centroids(self) -> 'np.ndarray':
+        """(mobs x dim) contiguous matrix of unit-length mob centroids, built on first use"""
+        if self._centroids is not None:
+            return self._centroids
+        with self._centroid_lock:
+            if self._centroids is None:
+                keys = list(self.mobs.keys())
+                rows = [self._mob_centroid(mob_key) for mob_key in keys]
+                self._centroid_keys = keys
+                self._centroids = np.ascontiguousarray(np.vstack(rows), dtype=np.float32)
+                print(f"🧭 Built {len(keys)} mob centroids ({self._centroids.shape[1]}-d, {self.provider.model})")
+        return self._centroids
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'model': self.provider.model,
+                'centroids_ready': self._centroids is not None,
+                'cached_videos': len(self._vectors),
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'failures': self.failures,
+                'unavailable_videos': len(self._unavailable),
+                'unavailable_hits': self.unavailable_hits,
+                'min_similarity': self.min_similarity
+            }
+
+    def _mob_centroid(self, mob_key: str) -> 'np.ndarray':
+        mob = self.mobs[mob_key]
+        prompts = [
+            f"{mob['name']}: {mob['description']}",
+            ', '.join(mob.get('keywords', [])),
+            ' '.join(tag.lstrip('#') for tag in mob.get('hashtags', []))
+        ]
+        vectors = []
+        for prompt in prompts:
+            # Keyed by the prompt text, so editing a mob's definition re-embeds only that prompt
+            key = f"prompt:{hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:16]}"
+            vector = self.store.get(self.provider.model, key)
+            if vector is None:
+                vector = np.asarray(self.provider.text_embedding(prompt), dtype=np.float32)
+                self.store.put(self.provider.model, key, vector)
+            vectors.append(_normalize(vector))
+        return _normalize(np.mean(vectors, axis=0))
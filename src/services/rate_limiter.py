@@ -0,0 +1,243 @@
+# src/services/rate_limiter.py
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+# Lower number wins when callers are queued for the same bucket
+PRIORITY_CLASSES = {
+    'interactive': 0,  # user uploads waiting on a result
+    'batch': 1,        # /api/validate-batch items
+    'analytics': 2,    # dashboard / social feed searches
+    'debug': 3         # /debug/* and status probes
+}
+
+_current_priority = contextvars.ContextVar('twelve_labs_priority', default='interactive')
+_current_deadline = contextvars.ContextVar('twelve_labs_deadline', default=None)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a caller waited longer than max_wait for a token"""
+
+
+class TokenBucket:
+    """Token bucket whose waiters are served strictly by priority class, FIFO within a class"""
+
+    def __init__(self, name: str, rate_per_minute: float, capacity: int):
+        self.name = name
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.granted = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self._last_refill = time.monotonic()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._recent_grants = deque()
+        self._cond = threading.Condition()
+
+    def acquire(self, priority: str = 'interactive', max_wait: Optional[float] = None) -> float:
+        """Block until a token is available for this caller; returns seconds waited"""
+        entry = (PRIORITY_CLASSES.get(priority, len(PRIORITY_CLASSES)), next(self._sequence), priority)
+        started = time.monotonic()
+        deadline = started + max_wait if max_wait is not None else None
+
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+
+                if self._waiters[0] is entry and self.tokens >= 1:
+                    heapq.heappop(self._waiters)
+                    self.tokens -= 1
+                    waited = now - started
+                    self.granted += 1
+                    self.total_wait += waited
+                    self._recent_grants.append(now)
+                    # Let the next waiter in line re-check
+                    self._cond.notify_all()
+                    return waited
+
+                if deadline is not None and now >= deadline:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    self.timeouts += 1
+                    self._cond.notify_all()
+                    raise RateLimitExceeded(
+                        f"No '{self.name}' token for {priority} caller within {max_wait:.0f}s")
+
+                # Only the head waiter needs to time its wake-up; the rest wait to be notified
+                if self._waiters[0] is entry:
+                    sleep_for = (1 - self.tokens) / self.rate if self.rate > 0 else 1.0
+                else:
+                    sleep_for = 1.0
+                if deadline is not None:
+                    sleep_for = min(sleep_for, deadline - now)
+                self._cond.wait(timeout=max(sleep_for, 0.001))
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            while self._recent_grants and now - self._recent_grants[0] > 60:
+                self._recent_grants.popleft()
+
+            waiting = {}
+            for _, _, priority in self._waiters:
+                waiting[priority] = waiting.get(priority, 0) + 1
+
+            per_minute = self.rate * 60
+            return {
+                'rate_per_minute': round(per_minute, 2),
+                'capacity': self.capacity,
+                'tokens_available': round(self.tokens, 2),
+                'granted': self.granted,
+                'timeouts': self.timeouts,
+                'avg_wait_seconds': round(self.total_wait / self.granted, 3) if self.granted else 0.0,
+                'granted_last_minute': len(self._recent_grants),
+                'utilization': round(len(self._recent_grants) / per_minute, 3) if per_minute else 0.0,
+                'waiting': waiting
+            }
+
+
+class ApiRateLimiter:
+    """Process-wide set of token buckets that every Twelve Labs call goes through"""
+
+    def __init__(self, limits: Dict[str, Dict[str, float]], max_wait: float = 120.0):
+        self.max_wait = max_wait
+        self.buckets = {
+            name: TokenBucket(name, limit['rate_per_minute'], int(limit['capacity']))
+            for name, limit in limits.items()
+        }
+
+    @contextmanager
+    def priority(self, priority_class: str):
+        """Run a block (and any search fan-out it starts) under the given priority class"""
+        token = _current_priority.set(priority_class)
+        try:
+            yield
+        finally:
+            _current_priority.reset(token)
+
+    @contextmanager
+    def deadline(self, deadline: float):
+        """Calls made inside the block give up waiting for a token at deadline (epoch seconds)"""
+        token = _current_deadline.set(deadline)
+        try:
+            yield
+        finally:
+            _current_deadline.reset(token)
+
+    @staticmethod
+    def current_priority() -> str:
+        return _current_priority.get()
+
+    def acquire(self, bucket_name: str, priority: Optional[str] = None) -> float:
+        bucket = self.buckets.get(bucket_name)
+        if bucket is None:
+            return 0.0
+        max_wait = self.max_wait
+        deadline = _current_deadline.get()
+        if deadline is not None:
+            max_wait = max(0.0, min(max_wait, deadline - time.time()))
+        return bucket.acquire(priority or self.current_priority(), max_wait=max_wait)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'max_wait_seconds': self.max_wait,
+            'priority_classes': list(PRIORITY_CLASSES.keys()),
+            'buckets': {name: bucket.stats() for name, bucket in self.buckets.items()}
+        }
+
+
+class _RateLimitedPager:
+    """
+    Lazy SDK pager (has_next / get_next() / items) whose later pages each take a token.
+    The first page came back with the throttled call itself; iterating past it fetches
+    one more page per get_next(), and each of those is a request of its own.
+    """
+
+    def __init__(self, pager: Any, limiter: ApiRateLimiter, bucket_name: str):
+        self._pager = pager
+        self._limiter = limiter
+        self._bucket_name = bucket_name
+
+    def __iter__(self):
+        for page in self.iter_pages():
+            yield from page.items or []
+
+    def iter_pages(self):
+        page = self._pager
+        while True:
+            yield page
+            if not getattr(page, 'has_next', False) or getattr(page, 'get_next', None) is None:
+                return
+            self._limiter.acquire(self._bucket_name)
+            page = page.get_next()
+            if page is None or page.items is None:
+                return
+
+    def __getattr__(self, name: str):
+        return getattr(self._pager, name)
+
+
+def _is_pager(result: Any) -> bool:
+    return hasattr(result, 'has_next') and hasattr(result, 'get_next') and hasattr(result, 'items')
+
+
+class _RateLimitedResource:
+    """
+    Proxy for an SDK resource (client.search, client.task, ...) that takes a token per call,
+    and per further page when the call returns a lazy pager.
+    """
+
+    def __init__(self, resource: Any, limiter: ApiRateLimiter, method_buckets: Dict[str, str]):
+        self._resource = resource
+        self._limiter = limiter
+        self._method_buckets = method_buckets
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._resource, name)
+        bucket_name = self._method_buckets.get(name)
+        if bucket_name is None or not callable(attr):
+            return attr
+
+        def throttled(*args, **kwargs):
+            self._limiter.acquire(bucket_name)
+            result = attr(*args, **kwargs)
+            return _RateLimitedPager(result, self._limiter, bucket_name) if _is_pager(result) else result
+        return throttled
+
+
+class RateLimitedClient:
+    """Wraps a TwelveLabs SDK client so search, task creation and status calls share the limiter"""
+
+    RESOURCE_BUCKETS = {
+        'search': {'query': 'search'},
+        'task': {'create': 'task_create', 'retrieve': 'status', 'list': 'status'},
+        'index': {'list': 'status', 'retrieve': 'status'},
+        'embed': {'create': 'search'}
+    }
+
+    def __init__(self, client: Any, limiter: ApiRateLimiter):
+        self._client = client
+        self.limiter = limiter
+        for resource_name, method_buckets in self.RESOURCE_BUCKETS.items():
+            resource = getattr(client, resource_name, None)
+            if resource is not None:
+                setattr(self, resource_name, _RateLimitedResource(resource, limiter, method_buckets))
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
@@ -0,0 +1,147 @@
+# src/services/result_cache.py
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from src.models.database import SQLiteDatabase
+from src.utils.helpers import sha256_file, normalize_hashtags
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS validation_cache (
+    cache_key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_validation_cache_last_access ON validation_cache(last_access);
+"""
+
+SELECT_ENTRY = "SELECT result, created_at FROM validation_cache WHERE cache_key = ?"
+UPSERT_ENTRY = """
+INSERT OR REPLACE INTO validation_cache (cache_key, result, created_at, last_access)
+VALUES (?, ?, ?, ?)
+"""
+TOUCH_ENTRY = "UPDATE validation_cache SET last_access = ? WHERE cache_key = ?"
+DELETE_ENTRY = "DELETE FROM validation_cache WHERE cache_key = ?"
+DELETE_ALL = "DELETE FROM validation_cache"
+COUNT_ENTRIES = "SELECT COUNT(*) AS entries FROM validation_cache"
+EVICT_OLDEST = """
+DELETE FROM validation_cache WHERE cache_key IN
+    (SELECT cache_key FROM validation_cache ORDER BY last_access ASC LIMIT ?)
+"""
+
+
+class ValidationResultCache:
+    """
+    Persistent, content-addressed cache of Twelve Labs validation results.
+    Keys are SHA-256 of uploaded bytes or the cleaned URL, plus normalized hashtags.
+    Entries expire after ttl_seconds; the least recently used are evicted past max_entries.
+    Rows live in the shared SQLiteDatabase, so every worker process reads the same cache.
+    """
+
+    def __init__(self, db: SQLiteDatabase, ttl_seconds: int = 7 * 24 * 3600, max_entries: int = 5000):
+        self.db = db
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # (path, size, mtime) -> sha256, so a file is only hashed once per process
+        self._file_hashes = {}
+
+        self.db.executescript(SCHEMA)
+
+    # ----- keys -----
+
+    def file_key(self, file_path: str, hashtags: str) -> str:
+        """Cache key for an uploaded file: hash of its bytes plus hashtags"""
+        return self._make_key('file', self.file_hash(file_path), hashtags)
+
+    def url_key(self, cleaned_url: str, hashtags: str) -> str:
+        """Cache key for a video URL (already passed through clean_video_url)"""
+        return self._make_key('url', cleaned_url.strip(), hashtags)
+
+    def file_hash(self, file_path: str) -> str:
+        stat = os.stat(file_path)
+        fingerprint = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached_hash = self._file_hashes.get(fingerprint)
+        if cached_hash:
+            return cached_hash
+
+        content_hash = sha256_file(file_path)
+        self.remember_file_hash(file_path, content_hash)
+        return content_hash
+
+    def remember_file_hash(self, file_path: str, content_hash: str):
+        """Record a hash computed elsewhere (e.g. while the upload was streamed)"""
+        stat = os.stat(file_path)
+        fingerprint = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            if len(self._file_hashes) >= 1024:
+                self._file_hashes.clear()
+            self._file_hashes[fingerprint] = content_hash
+
+    def _make_key(self, kind: str, identity: str, hashtags: str) -> str:
+        raw = f"{kind}|{identity}|{normalize_hashtags(hashtags)}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    # ----- lookups -----
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        rows = self.db.query(SELECT_ENTRY, (cache_key,))
+        if not rows:
+            self.misses += 1
+            return None
+
+        if now - rows[0]['created_at'] > self.ttl_seconds:
+            self.db.enqueue(DELETE_ENTRY, (cache_key,))
+            self.misses += 1
+            return None
+
+        # Recency only steers eviction, so the touch can ride the write queue
+        self.db.enqueue(TOUCH_ENTRY, (now, cache_key))
+        self.hits += 1
+        return json.loads(rows[0]['result'])
+
+    def put(self, cache_key: str, result: Dict[str, Any]):
+        now = time.time()
+        try:
+            result_json = json.dumps(result, default=str)
+        except (TypeError, ValueError) as e:
+            print(f"⚠️ Validation result not cacheable: {e}")
+            return
+
+        self.db.enqueue(UPSERT_ENTRY, (cache_key, result_json, now, now))
+        self._evict()
+
+    def _evict(self):
+        overflow = self._count() - self.max_entries
+        if overflow > 0:
+            self.db.enqueue(EVICT_OLDEST, (overflow,))
+            self.evictions += overflow
+
+    def _count(self) -> int:
+        return self.db.query(COUNT_ENTRIES)[0]['entries']
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': self._count(),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+    def clear(self):
+        self.db.execute_now([(DELETE_ALL, ())])
+        with self._lock:
+            self._file_hashes.clear()
@@ -0,0 +1,111 @@
+# src/services/search_cache.py
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Any, Callable, List, Tuple
+
+
+class SearchResultCache:
+    """
+    In-process TTL + LRU cache for search.query results, keyed by (index, query, options, threshold).
+    Concurrent misses for the same key share one upstream call (single-flight).
+    invalidate_index() drops an index's entries when new content lands in it; a search that was
+    already in flight at that moment is returned to its callers but not stored.
+    """
+
+    def __init__(self, ttl_seconds: float = 60, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()  # key -> (results, stored_at)
+        self._in_flight = {}           # key -> Future
+        self._generations = {}         # index_id -> bumped on invalidation
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(index_id: str, query_text: str, options: List[str], threshold: str) -> Tuple:
+        return (index_id, query_text.strip().lower(), tuple(sorted(options or [])), threshold)
+
+    def query(self, search_fn: Callable[..., Any], index_id: str, query_text: str,
+              options: List[str], threshold: str) -> Tuple[list, bool]:
+        """
+        Return (results, from_cache). On a miss, search_fn(index_id=..., query_text=..., options=...,
+        threshold=...) is called once no matter how many threads asked for the same key.
+        """
+        key = self.make_key(index_id, query_text, options, threshold)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                results, stored_at = entry
+                if time.time() - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return list(results), True
+                del self._entries[key]
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                generation = self._generations.get(index_id, 0)
+                self.misses += 1
+                leader = True
+
+        if not leader:
+            return list(future.result()), True
+
+        try:
+            results = list(search_fn(index_id=index_id, query_text=query_text,
+                                     options=options, threshold=threshold))
+        except Exception as e:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._in_flight.pop(key, None)
+            if self._generations.get(index_id, 0) == generation:
+                self._entries[key] = (results, time.time())
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        future.set_result(results)
+        return list(results), False
+
+    def invalidate_index(self, index_id: str):
+        """Forget every cached search against index_id (e.g. a video just finished indexing)"""
+        with self._lock:
+            self._generations[index_id] = self._generations.get(index_id, 0) + 1
+            stale = [key for key in self._entries if key[0] == index_id]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += 1
+        if stale:
+            print(f"🧹 Search cache: dropped {len(stale)} result set(s) for index {index_id}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'in_flight': len(self._in_flight),
+                'hit_rate': round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0
+            }
@@ -0,0 +1,85 @@
+# src/services/search_fanout.py
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, Callable, Optional
+
+
+class SearchFanout:
+    """
+    Runs a set of independent search calls concurrently, each with its own time budget.
+    A call's budget starts when a worker picks it up, so time spent queued behind other
+    requests' searches isn't charged to it; a call still queued after one budget is dropped.
+    With a limiter, a call's wait for a rate-limit token also ends at its deadline.
+    Queries that fail or miss the deadline come back with an error instead of results,
+    so callers can score whatever arrived in time.
+    """
+
+    def __init__(self, max_workers: int = 8, limiter: Optional[Any] = None):
+        self.max_workers = max_workers
+        self.limiter = limiter
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='search-fanout')
+
+    def run(self, search_fn: Callable[..., Any], queries: Dict[str, Dict[str, Any]],
+            timeout: float = 30.0) -> Dict[str, Dict[str, Any]]:
+        """
+        queries maps a name to the keyword arguments for search_fn.
+        Returns {name: {'results': list | None, 'error': str | None, 'elapsed': seconds}}.
+        """
+        started = time.time()
+        dispatched = {}  # name -> when a worker started the call
+        # Each call runs in a copy of the caller's context so its rate-limit priority carries over
+        futures = {
+            name: self._executor.submit(contextvars.copy_context().run, self._timed_call,
+                                        name, search_fn, kwargs, dispatched, timeout)
+            for name, kwargs in queries.items()
+        }
+
+        outcomes = {}
+        pending = dict(futures)
+        while pending:
+            now = time.time()
+            next_expiry = None
+            for name, future in list(pending.items()):
+                if future.done():
+                    outcomes[name] = self._outcome(future, started)
+                    del pending[name]
+                    continue
+                expiry = dispatched.get(name, started) + timeout
+                if now < expiry:
+                    next_expiry = expiry if next_expiry is None else min(next_expiry, expiry)
+                    continue
+                # Queued calls never start; running ones finish in the background and are ignored
+                if future.cancel():
+                    error = f'not started within {timeout:g}s (search workers busy)'
+                else:
+                    error = f'deadline of {timeout:g}s exceeded'
+                outcomes[name] = {'results': None, 'error': error, 'elapsed': round(now - started, 3)}
+                del pending[name]
+            if pending:
+                wait(pending.values(), timeout=max(next_expiry - time.time(), 0.001), return_when=FIRST_COMPLETED)
+
+        return {name: outcomes[name] for name in queries}
+
+    def _timed_call(self, name, search_fn, kwargs, dispatched, timeout):
+        started = time.time()
+        dispatched[name] = started
+        if self.limiter is None:
+            results = self._materialize(search_fn, kwargs)
+        else:
+            with self.limiter.deadline(started + timeout):
+                results = self._materialize(search_fn, kwargs)
+        return results, round(time.time() - started, 3)
+
+    @staticmethod
+    def _materialize(search_fn, kwargs) -> list:
+        # Materialize inside the worker so paginated iterables are fetched concurrently too
+        return list(search_fn(**kwargs))
+
+    @staticmethod
+    def _outcome(future, started: float) -> Dict[str, Any]:
+        try:
+            results, elapsed = future.result()
+            return {'results': results, 'error': None, 'elapsed': elapsed}
+        except Exception as e:
+            return {'results': None, 'error': str(e), 'elapsed': round(time.time() - started, 3)}
@@ -0,0 +1,202 @@
+# src/services/semantic_search.py
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src.models.embedding import EmbeddingStore
+from src.services.vector_index import IVFVectorIndex
+
+
+class SemanticSearchIndex:
+    """
+    Local semantic search over the campaign index's video and segment embeddings.
+    Segment vectors live in an on-disk IVFVectorIndex (one per embedding model); videos are
+    added as they finish indexing, and sync() backfills everything already in the index.
+    search() embeds the query once (cached in memory and in the EmbeddingStore), so repeat
+    queries never leave the process. It returns None on a miss - empty index, no query
+    embedding, or nothing scoring min_score - so callers can fall back to remote search.
+    Results use the remote search schema (video_id, start, end, confidence, metadata).
+    """
+
+    # Cosine similarity needed for each confidence label Twelve Labs search returns
+    CONFIDENCE_LEVELS = (('high', 0.5), ('medium', 0.35), ('low', 0.0))
+
+    def __init__(self, provider: Any, store: EmbeddingStore, directory: str, nlist: int = 64,
+                 nprobe: int = 8, min_score: float = 0.2, max_queries: int = 512):
+        self.provider = provider
+        self.store = store
+        self.directory = os.path.join(directory, provider.model.replace(':', '_').replace('/', '_'))
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_score = min_score
+        self.max_queries = max_queries
+        self.local_hits = 0
+        self.local_misses = 0
+        self.index_failures = 0
+        self.syncing = False
+        self._lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        self._query_vectors = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='semantic-index')
+        self.index = None
+        self._indexed = set()
+
+        meta_path = os.path.join(self.directory, 'index.json')
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            self._open_index(meta['dim'])
+            self._indexed = {item['video_id'] for item in self.index.items()}
+
+    def index_video(self, video_id: str, context_text: str = '') -> int:
+        """Add a video's segment embeddings (once per video); returns how many segments were added"""
+        with self._index_lock:
+            self._refresh_indexed()
+            if video_id in self._indexed:
+                return 0
+            segments = self.provider.video_segments(video_id, context_text)
+            vectors = np.vstack([segment['vector'] for segment in segments])
+            if self.index is None:
+                self._open_index(vectors.shape[1])
+            self._refresh_indexed()
+            if video_id in self._indexed:
+                # Another worker process added it while we fetched the segments
+                return 0
+            self.index.add(vectors, [
+                {'video_id': video_id, 'start': segment['start'], 'end': segment['end'], 'scope': segment['scope']}
+                for segment in segments
+            ])
+            self._indexed.add(video_id)
+
+            # The mob classifier looks up the same whole-video vector; save it a fetch
+            key = f"video:{video_id}"
+            if self.store.get(self.provider.model, key) is None:
+                whole_video = [segment['vector'] for segment in segments if segment['scope'] == 'video']
+                self.store.put(self.provider.model, key, np.mean(whole_video or list(vectors), axis=0))
+        return len(segments)
+
+    def index_video_async(self, video_id: str, context_text: str = ''):
+        self._executor.submit(self._index_quietly, video_id, context_text)
+
+    def sync(self) -> int:
+        """Index every video in the remote index not seen yet; returns how many were added"""
+        self.syncing = True
+        added = 0
+        try:
+            for video_id in self.provider.list_video_ids():
+                if video_id not in self._indexed and self._index_quietly(video_id):
+                    added += 1
+        finally:
+            self.syncing = False
+        print(f"🧮 Semantic index sync: {added} new video(s), {len(self._indexed)} indexed")
+        return added
+
+    def sync_async(self):
+        self._executor.submit(self.sync)
+
+    def search(self, query_text: str, k: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """Top-k local matches, or None when the local index can't answer"""
+        if self.index is None:
+            with self._index_lock:
+                self._refresh_indexed()
+        index = self.index
+        if index is None or len(index) == 0:
+            return self._miss()
+        try:
+            query_vector = self._query_vector(query_text)
+        except Exception as e:
+            print(f"⚠️ Query embedding failed, using remote search: {e}")
+            return self._miss()
+
+        matches = [(score, item) for score, item in index.search(query_vector, k) if score >= self.min_score]
+        if not matches:
+            return self._miss()
+        with self._lock:
+            self.local_hits += 1
+        return [
+            {'video_id': item['video_id'], 'start': item['start'], 'end': item['end'],
+             'confidence': self._confidence(score),
+             'metadata': {'scope': item['scope'], 'score': round(score, 4)}}
+            for score, item in matches
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                'model': self.provider.model,
+                'indexed_videos': len(self._indexed),
+                'syncing': self.syncing,
+                'local_hits': self.local_hits,
+                'local_misses': self.local_misses,
+                'index_failures': self.index_failures,
+                'cached_queries': len(self._query_vectors),
+                'min_score': self.min_score
+            }
+        stats['index'] = self.index.stats() if self.index is not None else None
+        return stats
+
+    def _refresh_indexed(self):
+        """Pick up videos other worker processes added (or the index one of them created)"""
+        if self.index is None:
+            meta_path = os.path.join(self.directory, 'index.json')
+            if not os.path.exists(meta_path):
+                return
+            with open(meta_path, encoding='utf-8') as f:
+                self._open_index(json.load(f)['dim'])
+        elif not self.index.refresh():
+            return
+        self._indexed = {item['video_id'] for item in self.index.items()}
+
+    @classmethod
+    def _confidence(cls, score: float) -> str:
+        return next(label for label, floor in cls.CONFIDENCE_LEVELS if score >= floor)
+
+    def _open_index(self, dim: int):
+        self.index = IVFVectorIndex(self.directory, dim, nlist=self.nlist, nprobe=self.nprobe)
+        meta_path = os.path.join(self.directory, 'index.json')
+        if not os.path.exists(meta_path):
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump({'dim': dim, 'model': self.provider.model}, f)
+
+    def _index_quietly(self, video_id: str, context_text: str = '') -> int:
+        try:
+            return self.index_video(video_id, context_text)
+        except Exception as e:
+            with self._lock:
+                self.index_failures += 1
+            print(f"⚠️ Could not add {video_id} to the semantic index: {e}")
+            return 0
+
+    def _query_vector(self, query_text: str) -> 'np.ndarray':
+        normalized = ' '.join(query_text.lower().split())
+        with self._lock:
+            vector = self._query_vectors.get(normalized)
+            if vector is not None:
+                self._query_vectors.move_to_end(normalized)
+                return vector
+
+        key = f"query:{hashlib.sha256(normalized.encode('utf-8')).hexdigest()[:16]}"
+        vector = self.store.get(self.provider.model, key)
+        if vector is None:
+            vector = np.asarray(self.provider.text_embedding(normalized), dtype=np.float32)
+            self.store.put(self.provider.model, key, vector)
+
+        with self._lock:
+            self._query_vectors[normalized] = vector
+            while len(self._query_vectors) > self.max_queries:
+                self._query_vectors.popitem(last=False)
+        return vector
+
+    def _miss(self) -> None:
+        with self._lock:
+            self.local_misses += 1
+        return None
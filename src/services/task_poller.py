@@ -0,0 +1,175 @@
+# src/services/task_poller.py
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, Callable, List, Optional
+
+TERMINAL_STATUSES = ('ready', 'failed')
+
+
+def task_status(task_obj: Any) -> Optional[str]:
+    """Status of an SDK Task object or a REST task dict"""
+    if isinstance(task_obj, dict):
+        return task_obj.get('status')
+    return getattr(task_obj, 'status', None)
+
+
+class _TrackedTask:
+    def __init__(self, task_id: str, initial_interval: float):
+        self.task_id = task_id
+        self.future = Future()
+        self.callbacks = []
+        self.interval = initial_interval
+        self.first_seen = time.time()
+        self.next_poll_at = self.first_seen + initial_interval
+        self.last_status = None
+        self.waiters = 0  # wait() calls currently blocked on this task
+        self.watched = False  # someone holds the Future from watch(); keep polling until it resolves
+
+
+class TaskPoller:
+    """
+    One background thread that polls every in-flight indexing task.
+    Tasks due at the same time are fetched in a single batch call; each task's poll interval
+    starts short and backs off for long-running jobs. Waiters block on a Future, not a sleep loop.
+    """
+
+    def __init__(self, fetch_fn: Callable[[List[str]], Dict[str, Any]],
+                 initial_interval: float = 2.0, max_interval: float = 20.0,
+                 backoff: float = 1.5, max_track_seconds: float = 3600, batch_window: float = 1.0):
+        self.fetch_fn = fetch_fn
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_track_seconds = max_track_seconds
+        # Tasks due within this many seconds of each other share one poll round
+        self.batch_window = batch_window
+        self.poll_rounds = 0
+        self.tasks_polled = 0
+        self._tracked = {}
+        self._listeners = []
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def watch(self, task_id: str, on_update: Callable[[Any], None] = None) -> Future:
+        """Start tracking task_id (if not already) and return a Future for its final task object"""
+        tracked = self._track(task_id, on_update)
+        tracked.watched = True
+        return tracked.future
+
+    def wait(self, task_id: str, timeout: Optional[float] = None, on_update: Callable[[Any], None] = None) -> Any:
+        """
+        Block until the task is ready/failed; raises TimeoutError after `timeout` seconds.
+        A timed-out waiter's callback is dropped, and the task stops being polled once no one waits on it.
+        """
+        tracked = self._track(task_id, on_update, waiter=True)
+        try:
+            return tracked.future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self._abandon(tracked, on_update)
+            raise TimeoutError(f"Task {task_id} still running after {timeout:.0f}s")
+
+    def _track(self, task_id: str, on_update: Callable[[Any], None] = None, waiter: bool = False) -> _TrackedTask:
+        with self._cond:
+            tracked = self._tracked.get(task_id)
+            if tracked is None:
+                tracked = _TrackedTask(task_id, self.initial_interval)
+                self._tracked[task_id] = tracked
+            if on_update:
+                tracked.callbacks.append(on_update)
+            if waiter:
+                tracked.waiters += 1
+            self._ensure_thread()
+            self._cond.notify()
+            return tracked
+
+    def _abandon(self, tracked: _TrackedTask, on_update: Callable[[Any], None] = None):
+        with self._cond:
+            if on_update in tracked.callbacks:
+                tracked.callbacks.remove(on_update)
+            tracked.waiters -= 1
+            if tracked.waiters <= 0 and not tracked.watched and self._tracked.get(tracked.task_id) is tracked:
+                del self._tracked[tracked.task_id]
+                print(f"⏹️ Stopped polling task {tracked.task_id}: its last waiter timed out")
+
+    def add_listener(self, listener: Callable[[Any], None]):
+        """Call listener(task_obj) whenever any tracked task finishes (ready or failed)"""
+        self._listeners.append(listener)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            tracked = len(self._tracked)
+        return {
+            'tracked_tasks': tracked,
+            'poll_rounds': self.poll_rounds,
+            'tasks_polled': self.tasks_polled,
+            'initial_interval': self.initial_interval,
+            'max_interval': self.max_interval
+        }
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='task-poller', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._tracked:
+                    self._cond.wait()
+                now = time.time()
+                next_due = min(t.next_poll_at for t in self._tracked.values())
+                if next_due > now:
+                    self._cond.wait(timeout=next_due - now)
+                    continue
+                due = [t for t in self._tracked.values() if t.next_poll_at <= now + self.batch_window]
+
+            self._poll(due)
+
+    def _poll(self, due: List[_TrackedTask]):
+        task_ids = [t.task_id for t in due]
+        try:
+            statuses = self.fetch_fn(task_ids) or {}
+        except Exception as e:
+            print(f"⚠️ Task poll failed for {len(task_ids)} task(s): {e}")
+            statuses = {}
+
+        self.poll_rounds += 1
+        self.tasks_polled += len(task_ids)
+        now = time.time()
+
+        for tracked in due:
+            task_obj = statuses.get(tracked.task_id)
+            status = task_status(task_obj) if task_obj is not None else None
+
+            if task_obj is not None and status != tracked.last_status:
+                tracked.last_status = status
+                for callback in list(tracked.callbacks):
+                    try:
+                        callback(task_obj)
+                    except Exception as e:
+                        print(f"⚠️ Task update callback failed: {e}")
+
+            if status in TERMINAL_STATUSES:
+                self._resolve(tracked, result=task_obj)
+            elif now - tracked.first_seen > self.max_track_seconds:
+                self._resolve(tracked, error=TimeoutError(
+                    f"Task {tracked.task_id} not finished after {self.max_track_seconds:.0f}s"))
+            else:
+                tracked.interval = min(tracked.interval * self.backoff, self.max_interval)
+                tracked.next_poll_at = now + tracked.interval
+
+    def _resolve(self, tracked: _TrackedTask, result: Any = None, error: Exception = None):
+        with self._cond:
+            self._tracked.pop(tracked.task_id, None)
+        if error:
+            tracked.future.set_exception(error)
+            return
+
+        # Listeners run before waiters wake, so e.g. caches are fresh when the waiter reads them
+        for listener in self._listeners:
+            try:
+                listener(result)
+            except Exception as e:
+                print(f"⚠️ Task completion listener failed: {e}")
+        tracked.future.set_result(result)
@@ -0,0 +1,154 @@
+# src/services/transcoder.py
+import os
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+
+FFMPEG_PATH = shutil.which('ffmpeg')
+FFMPEG_AVAILABLE = FFMPEG_PATH is not None
+
+
+class TranscodeError(Exception):
+    """ffmpeg could not produce a proxy"""
+
+
+class ProxyTranscoder:
+    """
+    Turns uploads above max_height (shorter side) or max_bitrate_kbps into an H.264/AAC proxy that
+    is staged and indexed instead of the original - URL downloads are already capped at 720p.
+    Each transcode is its own ffmpeg process using threads_per_job threads; at most `workers`
+    run at once (default: one per threads_per_job CPUs), so a burst of 4K phone clips can't
+    oversubscribe the machine. Proxies are kept under output_dir by content hash (the newest
+    max_cached are kept) and concurrent requests for the same upload share one transcode.
+    """
+
+    def __init__(self, output_dir: str, max_height: int = 720, max_bitrate_kbps: int = 2500,
+                 audio_bitrate_kbps: int = 128, workers: Optional[int] = None, threads_per_job: int = 2,
+                 timeout: float = 900, max_cached: int = 64):
+        self.output_dir = output_dir
+        self.max_height = max_height
+        self.max_bitrate_kbps = max_bitrate_kbps
+        self.audio_bitrate_kbps = audio_bitrate_kbps
+        self.threads_per_job = threads_per_job
+        self.workers = workers or max(1, (os.cpu_count() or 1) // threads_per_job)
+        self.timeout = timeout
+        self.max_cached = max_cached
+        self.transcoded = 0
+        self.reused = 0
+        self.failures = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.seconds = 0.0
+        self._in_flight = {}  # content hash -> Future
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='transcode')
+
+    @property
+    def available(self) -> bool:
+        return FFMPEG_AVAILABLE
+
+    def needs_proxy(self, media: Dict[str, Any]) -> bool:
+        """Worth transcoding? Only when the probe says the video is bigger than the proxy would be"""
+        width, height = media.get('width') or 0, media.get('height') or 0
+        bitrate = media.get('bitrate') or 0
+        return bool(width and height and min(width, height) > self.max_height) \
+            or bitrate > (self.max_bitrate_kbps + self.audio_bitrate_kbps) * 1000 * 1.25
+
+    def proxy_path(self, content_hash: str) -> str:
+        return os.path.join(self.output_dir, f"{content_hash}-{self.max_height}p.mp4")
+
+    def transcode(self, file_path: str, content_hash: str) -> Dict[str, Any]:
+        """Path and size of the proxy for file_path (made once per content hash); raises TranscodeError"""
+        path = self.proxy_path(content_hash)
+        if os.path.exists(path):
+            with self._lock:
+                self.reused += 1
+            os.utime(path)
+            return {'path': path, 'bytes': os.path.getsize(path), 'reused': True}
+
+        with self._lock:
+            future = self._in_flight.get(content_hash)
+            if future is None:
+                future = self._executor.submit(self._run, file_path, content_hash, path)
+                self._in_flight[content_hash] = future
+        return dict(future.result())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'available': self.available,
+                'workers': self.workers,
+                'threads_per_job': self.threads_per_job,
+                'max_height': self.max_height,
+                'max_bitrate_kbps': self.max_bitrate_kbps,
+                'in_flight': len(self._in_flight),
+                'transcoded': self.transcoded,
+                'reused': self.reused,
+                'failures': self.failures,
+                'bytes_in': self.bytes_in,
+                'bytes_out': self.bytes_out,
+                'size_ratio': round(self.bytes_out / self.bytes_in, 3) if self.bytes_in else None,
+                'transcode_seconds': round(self.seconds, 1)
+            }
+
+    def _run(self, file_path: str, content_hash: str, path: str) -> Dict[str, Any]:
+        try:
+            return self._transcode(file_path, path)
+        finally:
+            with self._lock:
+                self._in_flight.pop(content_hash, None)
+
+    def _transcode(self, file_path: str, path: str) -> Dict[str, Any]:
+        if not FFMPEG_AVAILABLE:
+            raise TranscodeError('ffmpeg is not installed')
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp-{threading.get_ident()}.mp4"
+        side = self.max_height
+        # Bound the shorter side (portrait phone clips too), keep aspect ratio and even dimensions
+        scale = (f"scale='if(gt(iw,ih),-2,min(iw,{side}))':'if(gt(iw,ih),min(ih,{side}),-2)'")
+        command = [
+            FFMPEG_PATH, '-hide_banner', '-loglevel', 'error', '-y', '-i', file_path,
+            '-map', '0:v:0', '-map', '0:a:0?', '-vf', scale,
+            '-c:v', 'libx264', '-preset', 'veryfast', '-crf', '23',
+            '-maxrate', f"{self.max_bitrate_kbps}k", '-bufsize', f"{self.max_bitrate_kbps * 2}k",
+            '-c:a', 'aac', '-b:a', f"{self.audio_bitrate_kbps}k",
+            '-movflags', '+faststart', '-threads', str(self.threads_per_job), tmp_path
+        ]
+        started = time.time()
+        try:
+            subprocess.run(command, capture_output=True, timeout=self.timeout, check=True)
+            os.replace(tmp_path, path)
+        except (subprocess.SubprocessError, OSError) as e:
+            with self._lock:
+                self.failures += 1
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            stderr = getattr(e, 'stderr', None)
+            detail = stderr.decode('utf-8', 'replace').strip().splitlines()[-1] if stderr else str(e)
+            raise TranscodeError(detail) from e
+
+        seconds = time.time() - started
+        size_in, size_out = os.path.getsize(file_path), os.path.getsize(path)
+        with self._lock:
+            self.transcoded += 1
+            self.bytes_in += size_in
+            self.bytes_out += size_out
+            self.seconds += seconds
+        print(f"🎬 Proxy {os.path.basename(path)}: {size_in / (1024 * 1024):.1f}MB -> "
+              f"{size_out / (1024 * 1024):.1f}MB in {seconds:.1f}s")
+        self._evict()
+        return {'path': path, 'bytes': size_out, 'reused': False}
+
+    def _evict(self):
+        """Keep only the max_cached most recently used proxies"""
+        try:
+            proxies = [os.path.join(self.output_dir, name) for name in os.listdir(self.output_dir)
+                       if name.endswith('p.mp4')]
+            proxies.sort(key=os.path.getmtime, reverse=True)
+            for stale in proxies[self.max_cached:]:
+                os.remove(stale)
+        except OSError as e:
+            print(f"⚠️ Proxy cache cleanup failed: {e}")
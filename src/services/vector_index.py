@@ -0,0 +1,279 @@
+# src/services/vector_index.py
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    # No flock (Windows): only one process may write to an index directory
+    fcntl = None
+    FCNTL_AVAILABLE = False
+
+
+class IVFVectorIndex:
+    """
+    Approximate nearest-neighbour index (inverted file, cosine similarity) kept on disk:
+      vectors.f32     append-only float32 rows, memory-mapped for search
+      items.jsonl     one metadata line per row
+      lists.i32       the IVF list each row belongs to
+      centroids.f32   coarse quantizer, trained with spherical k-means
+    Search scores the nprobe closest lists only. Until there are enough rows to train
+    (train_factor x nlist) every row is scanned exactly. add() is incremental: rows are
+    appended and assigned to their nearest list; the quantizer is retrained once the
+    index has grown retrain_growth times past the size it was trained on.
+    Several worker processes can share a directory: writes (and reloads, which may truncate a
+    torn tail) hold an flock on index.lock, and each process reloads when the files on disk
+    have changed since it last read them, so rows never misalign across processes.
+    """
+
+    def __init__(self, directory: str, dim: int, nlist: int = 64, nprobe: int = 8,
+                 train_factor: int = 8, retrain_growth: float = 4.0):
+        self.directory = directory
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_factor = train_factor
+        self.retrain_growth = retrain_growth
+        self.searches = 0
+        self._lock = threading.Lock()
+        self._items = []          # row -> metadata dict
+        self._lists = {}          # list id -> np.ndarray of rows
+        self._centroids = None
+        self._trained_rows = 0
+        self._mapped = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._vectors_path = os.path.join(directory, 'vectors.f32')
+        self._items_path = os.path.join(directory, 'items.jsonl')
+        self._lists_path = os.path.join(directory, 'lists.i32')
+        self._centroids_path = os.path.join(directory, 'centroids.f32')
+        self._lock_path = os.path.join(directory, 'index.lock')
+        self._disk_state = None  # _disk_signature() as of the last load or write by this process
+        with self._file_lock():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def items(self) -> List[Dict[str, Any]]:
+        self.refresh()
+        with self._lock:
+            return list(self._items)
+
+    def add(self, vectors: 'np.ndarray', items: List[Dict[str, Any]]):
+        """Append rows (normalized here) with one metadata dict each"""
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if vectors.shape != (len(items), self.dim):
+            raise ValueError(f"Expected {len(items)} x {self.dim} vectors, got {vectors.shape}")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = np.ascontiguousarray(vectors / np.where(norms > 0, norms, 1))
+
+        with self._lock, self._file_lock():
+            if self._disk_signature() != self._disk_state:
+                self._reload()
+            # Vectors first, metadata last: _load() trusts only rows present in every file
+            with open(self._vectors_path, 'ab') as f:
+                f.write(vectors.tobytes())
+            if self._centroids is not None:
+                assigned = (vectors @ self._centroids.T).argmax(axis=1).astype(np.int32)
+                with open(self._lists_path, 'ab') as f:
+                    f.write(assigned.tobytes())
+            with open(self._items_path, 'a', encoding='utf-8') as f:
+                for item in items:
+                    f.write(json.dumps(item) + '\n')
+
+            first_row = len(self._items)
+            self._items.extend(items)
+            self._mapped = None
+            if self._centroids is not None:
+                self._append_to_lists(first_row, assigned)
+
+            if self._needs_training():
+                self._train()
+            self._disk_state = self._disk_signature()
+
+    def refresh(self) -> bool:
+        """Pick up rows (or a retrained quantizer) written by another process; True if anything changed"""
+        if self._disk_signature() == self._disk_state:
+            return False
+        with self._lock, self._file_lock():
+            if self._disk_signature() == self._disk_state:
+                return False
+            self._reload()
+            return True
+
+    def search(self, query: 'np.ndarray', k: int = 10) -> List[Tuple[float, Dict[str, Any]]]:
+        """Top-k (similarity, metadata) pairs, best first"""
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        norm = float(np.linalg.norm(query))
+        if norm == 0:
+            return []
+        query = query / norm
+
+        self.refresh()
+        with self._lock:
+            if not self._items:
+                return []
+            vectors = self._vectors()
+            centroids = self._centroids
+            lists = self._lists
+            items = self._items
+            self.searches += 1
+
+        if centroids is None:
+            candidates = None
+            scores = vectors @ query
+        else:
+            probe = np.argsort(centroids @ query)[::-1][:self.nprobe]
+            chosen = [lists[int(list_id)] for list_id in probe if int(list_id) in lists]
+            if not chosen:
+                return []
+            candidates = np.concatenate(chosen)
+            scores = vectors[candidates] @ query
+
+        k = min(k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        rows = top if candidates is None else candidates[top]
+        return [(float(scores[i]), items[int(row)]) for i, row in zip(top, rows)]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'path': self.directory,
+                'rows': len(self._items),
+                'dim': self.dim,
+                'trained': self._centroids is not None,
+                'nlist': self.nlist if self._centroids is not None else 0,
+                'nprobe': self.nprobe,
+                'trained_rows': self._trained_rows,
+                'searches': self.searches
+            }
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive across every process using this directory (a no-op without fcntl)"""
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+        with open(self._lock_path, 'a') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _disk_signature(self) -> Tuple:
+        signature = []
+        for path in (self._items_path, self._centroids_path):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_size, stat.st_mtime_ns))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _reload(self):
+        self._items = []
+        self._lists = {}
+        self._centroids = None
+        self._trained_rows = 0
+        self._mapped = None
+        self._load()
+
+    def _vectors(self) -> 'np.ndarray':
+        if self._mapped is None or self._mapped.shape[0] != len(self._items):
+            self._mapped = np.memmap(self._vectors_path, dtype=np.float32, mode='r',
+                                     shape=(len(self._items), self.dim))
+        return self._mapped
+
+    def _needs_training(self) -> bool:
+        rows = len(self._items)
+        if rows < self.nlist * self.train_factor:
+            return False
+        return self._centroids is None or rows >= self._trained_rows * self.retrain_growth
+
+    def _train(self, iterations: int = 10, sample_size: int = 20000):
+        started = time.time()
+        vectors = self._vectors()
+        rng = np.random.default_rng(0)
+        rows = vectors.shape[0]
+        sample = np.asarray(vectors[np.sort(rng.choice(rows, size=min(rows, sample_size), replace=False))])
+
+        centroids = sample[rng.choice(sample.shape[0], size=self.nlist, replace=False)].copy()
+        for _ in range(iterations):
+            nearest = (sample @ centroids.T).argmax(axis=1)
+            for list_id in range(self.nlist):
+                members = sample[nearest == list_id]
+                if len(members):
+                    center = members.sum(axis=0)
+                    centroids[list_id] = center / max(float(np.linalg.norm(center)), 1e-12)
+
+        assignments = np.empty(rows, dtype=np.int32)
+        for start in range(0, rows, 65536):
+            assignments[start:start + 65536] = (np.asarray(vectors[start:start + 65536]) @ centroids.T).argmax(axis=1)
+
+        centroids.astype(np.float32).tofile(self._centroids_path + '.tmp')
+        assignments.tofile(self._lists_path + '.tmp')
+        os.replace(self._centroids_path + '.tmp', self._centroids_path)
+        os.replace(self._lists_path + '.tmp', self._lists_path)
+
+        self._centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self._lists = {}
+        self._append_to_lists(0, assignments)
+        self._trained_rows = rows
+        print(f"🧮 Trained IVF index: {rows} rows into {self.nlist} lists in {time.time() - started:.2f}s")
+
+    def _append_to_lists(self, first_row: int, assignments: 'np.ndarray'):
+        lists = dict(self._lists)  # copy-on-write so in-flight searches keep a consistent view
+        order = np.argsort(assignments, kind='stable')
+        boundaries = np.flatnonzero(np.diff(assignments[order])) + 1
+        for group in np.split(order, boundaries):
+            if not len(group):
+                continue
+            list_id = int(assignments[group[0]])
+            rows = (group + first_row).astype(np.int64)
+            lists[list_id] = np.concatenate([lists[list_id], rows]) if list_id in lists else rows
+        self._lists = lists
+
+    def _load(self):
+        """Read the files from disk; callers hold the file lock"""
+        if not os.path.exists(self._items_path):
+            self._disk_state = self._disk_signature()
+            return
+        with open(self._items_path, encoding='utf-8') as f:
+            items = [json.loads(line) for line in f if line.endswith('\n')]
+        stored_vectors = os.path.getsize(self._vectors_path) // (4 * self.dim) if os.path.exists(self._vectors_path) else 0
+        rows = min(len(items), stored_vectors)
+        self._items = items[:rows]
+        # Drop the tail of an add() that was interrupted part-way, so later appends stay aligned
+        if stored_vectors > rows:
+            with open(self._vectors_path, 'r+b') as f:
+                f.truncate(rows * 4 * self.dim)
+
+        if os.path.exists(self._centroids_path) and os.path.exists(self._lists_path):
+            centroids = np.fromfile(self._centroids_path, dtype=np.float32)
+            assignments = np.fromfile(self._lists_path, dtype=np.int32)
+            if centroids.size == self.nlist * self.dim and assignments.size >= rows:
+                if assignments.size > rows:
+                    with open(self._lists_path, 'r+b') as f:
+                        f.truncate(rows * 4)
+                self._centroids = centroids.reshape(self.nlist, self.dim)
+                self._append_to_lists(0, assignments[:rows])
+                self._trained_rows = rows
+        if self._items and self._centroids is None and self._needs_training():
+            self._train()
+        self._disk_state = self._disk_signature()
+        print(f"🧮 Loaded vector index {self.directory}: {rows} rows")
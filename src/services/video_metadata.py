@@ -0,0 +1,202 @@
+# src/services/video_metadata.py
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+
+try:
+    import yt_dlp
+    YT_DLP_AVAILABLE = True
+except ImportError:
+    yt_dlp = None
+    YT_DLP_AVAILABLE = False
+
+# Query parameters that never change which video a URL points at
+TRACKING_PARAMS = re.compile(r'^(utm_.*|si|feature|fbclid|gclid|igshid|igsh|is_from_webapp|sender_device|ref|ref_src|_r|_t|pp)$')
+YOUTUBE_HOSTS = {'youtube.com', 'm.youtube.com', 'music.youtube.com', 'youtube-nocookie.com'}
+
+
+def canonical_url(url: str) -> str:
+    """One spelling per video: lower-case host without www./m., no tracking params or fragment"""
+    parsed = urlparse(url.strip())
+    host = (parsed.hostname or '').lower()
+    path = parsed.path or '/'
+    query = [(key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+             if not TRACKING_PARAMS.match(key)]
+
+    if host == 'youtu.be':
+        host, query, path = 'youtube.com', [('v', path.strip('/'))], '/watch'
+    elif host.startswith('www.'):
+        host = host[4:]
+    if host in YOUTUBE_HOSTS:
+        host = 'youtube.com'
+        shorts = re.match(r'^/(shorts|embed|live)/([^/?#]+)', path)
+        if shorts:
+            path, query = '/watch', [('v', shorts.group(2))]
+        elif path == '/watch':
+            query = [(key, value) for key, value in query if key == 'v']
+    elif host.startswith('m.'):
+        host = host[2:]
+
+    if len(path) > 1:
+        path = path.rstrip('/')
+    port = f":{parsed.port}" if parsed.port and parsed.port not in (80, 443) else ''
+    return urlunparse(((parsed.scheme or 'https').lower(), host + port, path, '', urlencode(sorted(query)), ''))
+
+
+class VideoMetadataError(Exception):
+    """Metadata could not be extracted (the failure itself is cached briefly)"""
+
+
+class VideoMetadataService:
+    """
+    yt-dlp metadata lookups with a per-canonical-URL TTL cache.
+    Failures are cached too (for a shorter negative_ttl) so a bad URL typed into the upload form
+    isn't re-extracted on every keystroke. Concurrent lookups of the same URL share one extraction,
+    and extraction runs on a small pool of long-lived YoutubeDL instances instead of building one
+    per call (each instance keeps its initialized extractors and their caches warm).
+    """
+
+    def __init__(self, ttl_seconds: float = 3600, negative_ttl_seconds: float = 60,
+                 max_entries: int = 2048, pool_size: int = 4, socket_timeout: float = 15):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        self.pool_size = pool_size
+        self.socket_timeout = socket_timeout
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.failures = 0
+        self._entries = OrderedDict()  # canonical url -> (info or None, error or None, expires_at)
+        self._in_flight = {}           # canonical url -> Future
+        self._lock = threading.Lock()
+        self._extractors = queue.Queue()
+        self._extractors_created = 0
+
+    @property
+    def available(self) -> bool:
+        return YT_DLP_AVAILABLE
+
+    def lookup(self, url: str) -> Tuple[Dict[str, Any], bool]:
+        """(metadata, from_cache); raises VideoMetadataError for malformed URLs and failed (now or recently) extractions"""
+        try:
+            key = canonical_url(url)
+        except ValueError as e:  # e.g. a non-numeric port or an unbalanced IPv6 bracket
+            raise VideoMetadataError(f"Invalid URL: {e}") from e
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                info, error, expires_at = entry
+                if time.time() < expires_at:
+                    self._entries.move_to_end(key)
+                    if error is not None:
+                        self.negative_hits += 1
+                        raise VideoMetadataError(error)
+                    self.hits += 1
+                    return dict(info), True
+                del self._entries[key]
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                self.misses += 1
+                leader = True
+
+        if not leader:
+            try:
+                return dict(future.result()), True
+            except Exception as e:
+                raise VideoMetadataError(str(e)) from e
+
+        try:
+            info = self._extract(key)
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+            self._store(key, None, error, self.negative_ttl_seconds)
+            with self._lock:
+                self.failures += 1
+            future.set_exception(VideoMetadataError(error))
+            raise VideoMetadataError(error) from e
+
+        self._store(key, info, None, self.ttl_seconds)
+        future.set_result(info)
+        return dict(info), False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses + self.coalesced
+            return {
+                'available': self.available,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'negative_ttl_seconds': self.negative_ttl_seconds,
+                'hits': self.hits,
+                'negative_hits': self.negative_hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'failures': self.failures,
+                'in_flight': len(self._in_flight),
+                'extractors': self._extractors_created,
+                'hit_rate': round((self.hits + self.negative_hits + self.coalesced) / lookups, 3) if lookups else 0.0
+            }
+
+    def _store(self, key: str, info: Optional[Dict[str, Any]], error: Optional[str], ttl: float):
+        with self._lock:
+            self._in_flight.pop(key, None)
+            self._entries[key] = (info, error, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _extract(self, url: str) -> Dict[str, Any]:
+        if not YT_DLP_AVAILABLE:
+            raise VideoMetadataError('yt-dlp is not installed')
+        extractor = self._checkout()
+        try:
+            info = extractor.extract_info(url, download=False)
+        finally:
+            self._extractors.put(extractor)
+        if info is None:
+            raise VideoMetadataError(f"No metadata found for {url}")
+        description = info.get('description') or ''
+        return {
+            'title': info.get('title') or 'Unknown',
+            'duration': info.get('duration') or 0,
+            'uploader': info.get('uploader') or 'Unknown',
+            'view_count': info.get('view_count') or 0,
+            'description': description[:200] + ('...' if len(description) > 200 else ''),
+            'thumbnail': info.get('thumbnail'),
+            'platform': info.get('extractor') or 'Unknown',
+            'webpage_url': info.get('webpage_url') or url
+        }
+
+    def _checkout(self):
+        """An idle YoutubeDL instance; at most pool_size exist, extra callers wait for one"""
+        try:
+            return self._extractors.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            create = self._extractors_created < self.pool_size
+            if create:
+                self._extractors_created += 1
+        if create:
+            return yt_dlp.YoutubeDL({
+                'quiet': True,
+                'no_warnings': True,
+                'skip_download': True,
+                'noplaylist': True,
+                'socket_timeout': self.socket_timeout
+            })
+        return self._extractors.get()
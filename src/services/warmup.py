@@ -0,0 +1,121 @@
+# src/services/warmup.py
+import threading
+import time
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+
+class LazyTwelveLabsClient:
+    """
+    Stands in for the Twelve Labs client until it's first used: the SDK is imported and the
+    client built on first attribute access (or by the warmup thread), never at module import.
+    Truthiness means "configured and not known to be broken", so `if twelve_labs_client:`
+    checks stay cheap and never trigger client creation.
+    """
+
+    def __init__(self, factory: Callable[[], Any], configured: bool):
+        self._factory = factory
+        self._configured = configured
+        self._client = None
+        self._error = None
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return self._configured and self._error is None
+
+    def __getattr__(self, name: str):
+        return getattr(self.get(), name)
+
+    def get(self) -> Any:
+        """The real client, created on first call (raises if it can't be)"""
+        if self._client is not None:
+            return self._client
+        with self._lock:
+            if self._client is None:
+                if not self._configured:
+                    raise RuntimeError('Twelve Labs client not configured (SDK missing or no API key)')
+                if self._error is not None:
+                    raise RuntimeError(f'Twelve Labs client unavailable: {self._error}')
+                try:
+                    self._client = self._factory()
+                except Exception as e:
+                    self._error = str(e)
+                    print(f"⚠️ Warning: Twelve Labs client initialization failed: {e}")
+                    raise
+                print("✅ Twelve Labs client initialized successfully")
+        return self._client
+
+    @property
+    def initialized(self) -> bool:
+        return self._client is not None
+
+    @property
+    def error(self) -> Optional[str]:
+        return self._error
+
+
+class StartupWarmup:
+    """
+    Runs the slow parts of startup in one background thread after the app is importable:
+    each step is (name, fn) and runs in order; a failing step is recorded and the rest still run.
+    State goes pending -> warming -> ready (every step passed) or degraded.
+    """
+
+    def __init__(self, steps: List[Tuple[str, Callable[[], Any]]]):
+        self.steps = list(steps)
+        self.state = 'pending'
+        self.started_at = None
+        self.finished_at = None
+        self.results = {}
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self) -> bool:
+        """Start warming up (once); returns False if it was already started"""
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self.state = 'warming'
+            self.started_at = time.time()
+            self._thread = threading.Thread(target=self._run, name='startup-warmup', daemon=True)
+            self._thread.start()
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until warmup finishes; True if it did within timeout"""
+        thread = self._thread
+        if thread is None:
+            return False
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'state': self.state,
+                'ready': self.state == 'ready',
+                'started_at': self.started_at,
+                'duration_seconds': round((self.finished_at or time.time()) - self.started_at, 3) if self.started_at else None,
+                'steps': {name: dict(result) for name, result in self.results.items()}
+            }
+
+    def _run(self):
+        failed = False
+        for name, step in self.steps:
+            step_started = time.time()
+            try:
+                detail = step()
+                result = {'ok': True}
+                if detail is not None:
+                    result['detail'] = detail
+            except Exception as e:
+                failed = True
+                result = {'ok': False, 'error': str(e)}
+                print(f"⚠️ Startup warmup step '{name}' failed: {e}")
+            result['seconds'] = round(time.time() - step_started, 3)
+            with self._lock:
+                self.results[name] = result
+
+        with self._lock:
+            self.finished_at = time.time()
+            self.state = 'degraded' if failed else 'ready'
+        print(f"🔥 Startup warmup {self.state} in {self.finished_at - self.started_at:.2f}s")
@@ -0,0 +1,22 @@
+# src/utils/helpers.py
+import hashlib
+from typing import Optional
+
+HASH_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+def sha256_file(file_path: str, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """SHA-256 of a file's contents, read in fixed-size chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def normalize_hashtags(hashtags: Optional[str]) -> str:
+    """Canonical, order-independent form of a hashtag string (for cache keys)"""
+    if not hashtags:
+        return ''
+    tags = {tag.strip().lower() for tag in hashtags.split() if tag.strip()}
+    return ' '.join(sorted(tags))
@@ -0,0 +1,113 @@
+# src/utils/upload_stream.py
+import hashlib
+import os
+import uuid
+from typing import Optional
+
+from flask import Request, current_app
+from werkzeug.exceptions import RequestEntityTooLarge
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB write buffer
+
+
+class HashingFileStream:
+    """
+    Write target for a multipart file part that goes straight into the upload folder.
+    Hashes and counts bytes as they arrive so nothing has to re-read the file afterwards.
+    Parts with a disallowed extension are counted but never written to disk.
+    """
+
+    def __init__(self, upload_folder: str, filename: str, max_size: Optional[int] = None,
+                 accept: bool = True, chunk_size: int = UPLOAD_CHUNK_SIZE):
+        self.filename = filename
+        self.max_size = max_size
+        self.accepted = accept
+        self.bytes_written = 0
+        self.committed_path = None
+        self._digest = hashlib.sha256()
+        self.temp_path = None
+        self._file = None
+
+        if accept:
+            os.makedirs(upload_folder, exist_ok=True)
+            self.temp_path = os.path.join(upload_folder, f".incoming-{uuid.uuid4().hex}")
+            self._file = open(self.temp_path, 'w+b', buffering=chunk_size)
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+    def write(self, data: bytes) -> int:
+        self.bytes_written += len(data)
+        if self.max_size is not None and self.bytes_written > self.max_size:
+            print(f"   ❌ Upload '{self.filename}' exceeded {self.max_size / (1024*1024):.0f}MB, aborting")
+            self.discard()
+            raise RequestEntityTooLarge()
+
+        if self._file is None:
+            return len(data)
+
+        self._digest.update(data)
+        return self._file.write(data)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self._file.seek(offset, whence) if self._file else 0
+
+    def tell(self) -> int:
+        return self._file.tell() if self._file else 0
+
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size) if self._file else b''
+
+    def commit(self, final_path: str) -> str:
+        """Move the received file to its final name (a rename, never a copy)"""
+        if not self.accepted or self.temp_path is None:
+            raise ValueError(f"Upload '{self.filename}' was not stored")
+        self._file.flush()
+        self._file.close()
+        os.replace(self.temp_path, final_path)
+        self.committed_path = final_path
+        self.temp_path = None
+        return final_path
+
+    def discard(self):
+        if self._file and not self._file.closed:
+            self._file.close()
+        if self.temp_path and os.path.exists(self.temp_path):
+            try:
+                os.remove(self.temp_path)
+            except OSError:
+                pass
+        self.temp_path = None
+
+    def close(self):
+        # Anything the route didn't commit is a leftover from a rejected or aborted request
+        if self.committed_path is None:
+            self.discard()
+        elif self._file and not self._file.closed:
+            self._file.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None or self._file.closed
+
+
+class StreamingUploadRequest(Request):
+    """Request class whose file parts are streamed by HashingFileStream instead of spooled temp files"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        app_config = current_app.config
+        allowed_extensions = app_config.get('ALLOWED_EXTENSIONS')
+        extension = filename.rsplit('.', 1)[1].lower() if filename and '.' in filename else ''
+        accept = bool(filename) and (not allowed_extensions or extension in allowed_extensions)
+
+        if filename and not accept:
+            print(f"   ⚠️ Skipping disallowed upload '{filename}' without writing it to disk")
+
+        return HashingFileStream(
+            app_config['UPLOAD_FOLDER'],
+            filename or '',
+            max_size=app_config.get('MAX_UPLOAD_FILE_SIZE'),
+            accept=accept,
+            chunk_size=app_config.get('UPLOAD_CHUNK_SIZE', UPLOAD_CHUNK_SIZE)
+        )
@@ -4,10 +4,14 @@ import tempfile
 import os
 from typing import Optional, Dict, Any
 
+from src.services.video_metadata import VideoMetadataService, VideoMetadataError
+
 class VideoURLHandler:
     """Handle downloading videos from various platforms"""
     
-    def __init__(self):
+    def __init__(self, metadata_service: Optional[VideoMetadataService] = None):
+        # Pass the app's VideoMetadataService to share its cache; otherwise the handler gets its own
+        self.metadata_service = metadata_service or VideoMetadataService()
         self.supported_platforms = [
             'youtube.com', 'youtu.be',
             'tiktok.com',
@@ -94,27 +98,20 @@ class VideoURLHandler:
             return None
     
     def get_video_info(self, url: str) -> Dict[str, Any]:
-        """Get video information without downloading"""
+        """Get video information without downloading (cached per canonical URL)"""
         try:
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
+            info, _ = self.metadata_service.lookup(url)
+            return {
+                'title': info['title'],
+                'duration': info['duration'],
+                'uploader': info['uploader'],
+                'view_count': info['view_count'],
+                'description': info['description'],
+                'thumbnail': info['thumbnail'],
+                'platform': info['platform']
             }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
                 
-                return {
-                    'title': info.get('title', 'Unknown'),
-                    'duration': info.get('duration', 0),
-                    'uploader': info.get('uploader', 'Unknown'),
-                    'view_count': info.get('view_count', 0),
-                    'description': info.get('description', '')[:200] + '...',
-                    'thumbnail': info.get('thumbnail'),
-                    'platform': info.get('extractor', 'Unknown')
-                }
-                
-        except Exception as e:
+        except VideoMetadataError as e:
             print(f"❌ Failed to get video info: {e}")
             return {
                 'title': 'Unknown',
@@ -133,9 +130,9 @@ class VideoURLHandler:
             print(f"⚠️ Failed to cleanup temp file: {e}")
 
 # Example usage functions
-def download_video_from_url(url: str) -> Optional[str]:
+def download_video_from_url(url: str, metadata_service: Optional[VideoMetadataService] = None) -> Optional[str]:
     """Convenience function to download video from URL"""
-    handler = VideoURLHandler()
+    handler = VideoURLHandler(metadata_service)
     
     if not handler.is_supported_url(url):
         print(f"❌ Unsupported URL: {url}")
@@ -143,7 +140,7 @@ def download_video_from_url(url: str) -> Optional[str]:
     
     return handler.download_video(url)
 
-def get_video_preview(url: str) -> Dict[str, Any]:
+def get_video_preview(url: str, metadata_service: Optional[VideoMetadataService] = None) -> Dict[str, Any]:
     """Get video preview information"""
-    handler = VideoURLHandler()
+    handler = VideoURLHandler(metadata_service)
     return handler.get_video_info(url)
\ No newline at end of file
@@ -0,0 +1,16 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+
+# Tests import the app's packages the same way app.py does: from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.database import SQLiteDatabase  # noqa: E402
+
+
+@pytest.fixture
+def database(tmp_path):
+    """A fresh WAL database file per test; stores under test are built on it"""
+    return SQLiteDatabase(str(tmp_path / 'test.sqlite3'))
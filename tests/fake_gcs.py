@@ -0,0 +1,128 @@
+# tests/fake_gcs.py
+import os
+import shutil
+import uuid
+from typing import List, Optional
+
+
+class LocalGCSClient:
+    """
+    Filesystem stand-in for google.cloud.storage.Client, covering what CloudStager uses:
+    bucket(), Bucket.blob() / get_blob() / list_blobs(prefix), Blob.upload_from_file() / compose() / delete().
+    Objects are files under root/<bucket>/<object name>; writes land atomically.
+    fail_uploads maps an object name to how many of its next uploads should fail partway through.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.fail_uploads = {}
+        self.uploads = []     # object names, in upload order
+        self.compose_calls = []  # (destination, source count)
+        os.makedirs(root, exist_ok=True)
+
+    def bucket(self, name: str) -> 'LocalBucket':
+        return LocalBucket(self, name)
+
+
+class LocalBucket:
+    def __init__(self, client: LocalGCSClient, name: str):
+        self.client = client
+        self.name = name
+        self.path = os.path.join(client.root, name)
+        os.makedirs(self.path, exist_ok=True)
+
+    def blob(self, name: str) -> 'LocalBlob':
+        return LocalBlob(self, name)
+
+    def get_blob(self, name: str) -> Optional['LocalBlob']:
+        blob = self.blob(name)
+        return blob if blob.exists() else None
+
+    def list_blobs(self, prefix: str = '') -> List['LocalBlob']:
+        blobs = []
+        for directory, _, files in os.walk(self.path):
+            for filename in files:
+                if filename.startswith('.tmp-'):
+                    continue
+                name = os.path.relpath(os.path.join(directory, filename), self.path).replace(os.sep, '/')
+                if name.startswith(prefix):
+                    blobs.append(self.blob(name))
+        return sorted(blobs, key=lambda blob: blob.name)
+
+
+class LocalBlob:
+    def __init__(self, bucket: LocalBucket, name: str):
+        self.bucket = bucket
+        self.name = name
+        self.chunk_size = None
+        self.path = os.path.join(bucket.path, *name.split('/'))
+
+    @property
+    def size(self) -> Optional[int]:
+        return os.path.getsize(self.path) if os.path.exists(self.path) else None
+
+    @property
+    def public_url(self) -> str:
+        return f"file://{os.path.abspath(self.path)}"
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def upload_from_file(self, file_obj, size: Optional[int] = None, rewind: bool = False, **kwargs):
+        if rewind:
+            file_obj.seek(0)
+        client = self.bucket.client
+        client.uploads.append(self.name)
+        chunk = self.chunk_size or 1024 * 1024
+        remaining = size
+        with self._atomic_writer() as out:
+            while remaining is None or remaining > 0:
+                data = file_obj.read(chunk if remaining is None else min(chunk, remaining))
+                if not data:
+                    break
+                out.write(data)
+                if client.fail_uploads.get(self.name):
+                    client.fail_uploads[self.name] -= 1
+                    raise ConnectionError(f"injected failure uploading {self.name}")
+                if remaining is not None:
+                    remaining -= len(data)
+        if remaining:
+            raise ValueError(f"Stream ended {remaining} bytes early uploading {self.name}")
+
+    def upload_from_filename(self, filename: str, **kwargs):
+        with open(filename, 'rb') as f:
+            self.upload_from_file(f)
+
+    def compose(self, sources: List['LocalBlob'], **kwargs):
+        if not 0 < len(sources) <= 32:
+            raise ValueError(f"compose() takes 1-32 sources, got {len(sources)}")
+        self.bucket.client.compose_calls.append((self.name, len(sources)))
+        with self._atomic_writer() as out:
+            for source in sources:
+                with open(source.path, 'rb') as f:
+                    shutil.copyfileobj(f, out, 1024 * 1024)
+
+    def delete(self):
+        os.remove(self.path)
+
+    def _atomic_writer(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        return _AtomicFile(self.path)
+
+
+class _AtomicFile:
+    def __init__(self, path: str):
+        self.path = path
+        self.tmp_path = os.path.join(os.path.dirname(path), f".tmp-{uuid.uuid4().hex}")
+
+    def __enter__(self):
+        self._file = open(self.tmp_path, 'wb')
+        return self._file
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        if exc_type is None:
+            os.replace(self.tmp_path, self.path)
+        else:
+            os.remove(self.tmp_path)
+        return False
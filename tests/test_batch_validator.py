@@ -0,0 +1,53 @@
+# tests/test_batch_validator.py
+import threading
+
+import pytest
+
+from src.models.batch import BatchStore
+from src.services.batch_validator import BatchValidationRunner
+
+
+def test_batch_status_is_readable_from_another_worker(database):
+    release = threading.Event()
+
+    def validate(url, hashtags, deadline=None):
+        if url.endswith('slow.mp4'):
+            release.wait(timeout=5)
+        return {'is_valid': url.endswith('.mp4')}
+
+    # Two runners on one database stand in for two worker processes
+    owner = BatchValidationRunner(validate, url_check_fn=lambda url: url.startswith('https://'),
+                                  store=BatchStore(database))
+    other = BatchValidationRunner(validate, store=BatchStore(database))
+    batch = owner.submit([{'url': 'https://a/fast.mp4'}, {'url': 'ftp://b'}, {'url': 'https://c/slow.mp4'}],
+                         parallelism=3)
+
+    for _ in range(100):
+        partial = other.status(batch.id)
+        if partial['done'] == 2:
+            break
+        threading.Event().wait(0.02)
+    assert partial['status'] == 'running'
+    assert sorted(item['status'] for item in partial['items']) == ['completed', 'invalid']
+
+    release.set()
+    for _ in range(100):
+        final = other.status(batch.id, since=partial['next_cursor'])
+        if final['status'] == 'completed':
+            break
+        threading.Event().wait(0.02)
+    assert final['done'] == 3 and final['valid'] == 2
+    assert [item['url'] for item in final['items']] == ['https://c/slow.mp4']
+    local = owner.status(batch.id, since=partial['next_cursor'])
+    assert {key: value for key, value in final.items() if key != 'elapsed_seconds'} == \
+        {key: value for key, value in local.items() if key != 'elapsed_seconds'}
+
+
+def test_unknown_batch_is_none(database):
+    assert BatchValidationRunner(lambda *a, **k: {}, store=BatchStore(database)).status('missing') is None
+
+
+@pytest.mark.parametrize('timeout', [0, -1, float('nan')])
+def test_non_positive_item_timeout_is_rejected(timeout):
+    with pytest.raises(ValueError):
+        BatchValidationRunner(lambda *a, **k: {}).submit([{'url': 'https://a/b.mp4'}], item_timeout=timeout)
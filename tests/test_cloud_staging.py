@@ -0,0 +1,96 @@
+# tests/test_cloud_staging.py
+import os
+
+import pytest
+
+from src.services.cloud_staging import CloudStager, MAX_COMPOSE_SOURCES
+from tests.fake_gcs import LocalGCSClient
+
+PART_SIZE = 1024
+
+
+@pytest.fixture
+def client(tmp_path):
+    return LocalGCSClient(str(tmp_path / 'gcs'))
+
+
+@pytest.fixture
+def source(tmp_path):
+    def write(size: int) -> str:
+        path = tmp_path / f'video-{size}.mp4'
+        path.write_bytes(os.urandom(size))
+        return str(path)
+    return write
+
+
+def make_stager(client, **kwargs) -> CloudStager:
+    options = dict(client_factory=lambda: client, part_size=PART_SIZE, composite_threshold=PART_SIZE,
+                   resumable_chunk_size=256, max_workers=4)
+    options.update(kwargs)
+    return CloudStager('bucket', **options)
+
+
+def staged_bytes(client, object_name: str) -> bytes:
+    with open(client.bucket('bucket').blob(object_name).path, 'rb') as f:
+        return f.read()
+
+
+def test_composite_upload_is_byte_exact_beyond_32_parts(client, source):
+    path = source(40 * PART_SIZE + 17)  # 41 parts: two compose groups, then the final compose
+    result = make_stager(client).stage(path)
+
+    assert result['parts'] == 41
+    with open(path, 'rb') as f:
+        assert staged_bytes(client, result['object_name']) == f.read()
+    assert all(count <= MAX_COMPOSE_SOURCES for _, count in client.compose_calls)
+    assert client.compose_calls[-1] == (result['object_name'], 2)
+    # Parts and intermediate composites are cleaned up
+    assert [blob.name for blob in client.bucket('bucket').list_blobs()] == [result['object_name']]
+
+
+def test_failed_part_is_resumed_without_reuploading_finished_parts(client, source):
+    path = source(5 * PART_SIZE)
+    stager = make_stager(client, part_retries=0)
+    object_name = stager.object_name_for(stager.file_hash(path), path)
+    stat = os.stat(path)
+    failing_part = f"{object_name}.parts/{stat.st_size}-{int(stat.st_mtime)}/00003"
+    client.fail_uploads[failing_part] = 1
+
+    with pytest.raises(ConnectionError):
+        stager.stage(path)
+    uploads_before_retry = len(client.uploads)
+
+    result = stager.stage(path)
+    with open(path, 'rb') as f:
+        assert staged_bytes(client, result['object_name']) == f.read()
+    assert client.uploads[uploads_before_retry:] == [failing_part]
+    assert stager.parts_reused == 4
+
+
+def test_progress_reaches_the_total_through_a_retried_part(client, source, monkeypatch):
+    monkeypatch.setattr('src.services.cloud_staging.time.sleep', lambda seconds: None)
+    path = source(3 * PART_SIZE + 100)
+    stager = make_stager(client, part_retries=2)
+    object_name = stager.object_name_for(stager.file_hash(path), path)
+    stat = os.stat(path)
+    client.fail_uploads[f"{object_name}.parts/{stat.st_size}-{int(stat.st_mtime)}/00001"] = 1
+
+    progress = []
+    stager.stage(path, on_progress=lambda done, total: progress.append((done, total)))
+
+    total = os.path.getsize(path)
+    assert progress[-1] == (total, total)
+    assert all(0 <= done <= total and reported == total for done, reported in progress)
+    assert stager.part_retries_used == 1
+
+
+def test_restaging_the_same_bytes_skips_the_upload_but_reports_full_progress(client, source):
+    path = source(PART_SIZE // 2)
+    stager = make_stager(client)
+    first = stager.stage(path)
+
+    progress = []
+    second = stager.stage(path, on_progress=lambda done, total: progress.append((done, total)))
+    assert first['deduplicated'] is None and second['deduplicated'] == 'remote'
+    assert progress == [(PART_SIZE // 2, PART_SIZE // 2)]
+    assert len(client.uploads) == 1
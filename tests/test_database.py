@@ -0,0 +1,45 @@
+# tests/test_database.py
+import sqlite3
+
+import pytest
+
+from src.models.database import SQLiteDatabase
+
+CREATE = "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT NOT NULL)"
+INSERT = "INSERT INTO items (id, name) VALUES (?, ?)"
+
+
+def names(database):
+    return [row['name'] for row in database.query("SELECT name FROM items ORDER BY id")]
+
+
+def test_batch_survives_a_busy_database(database, tmp_path):
+    database.executescript(CREATE)
+    blocker = sqlite3.connect(str(tmp_path / 'test.sqlite3'))
+    blocker.execute("BEGIN EXCLUSIVE")
+    database.connection().execute("PRAGMA busy_timeout=10")
+
+    database.enqueue(INSERT, (1, 'first'))
+    database.enqueue(INSERT, (2, 'second'))
+    with pytest.raises(sqlite3.OperationalError):
+        database.flush()
+    assert database.stats()['pending_writes'] == 2
+
+    blocker.rollback()
+    assert names(database) == ['first', 'second']
+
+
+def test_a_statement_that_cannot_commit_is_dropped_alone(database):
+    database.executescript(CREATE)
+    database.enqueue(INSERT, (1, 'first'))
+    database.enqueue(INSERT, (1, 'duplicate id'))
+    database.enqueue(INSERT, (2, 'second'))
+
+    assert names(database) == ['first', 'second']
+    assert database.stats()['statements_dropped'] == 1
+
+
+def test_bare_filename_opens_in_the_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    SQLiteDatabase('bare.sqlite3').executescript(CREATE)
+    assert (tmp_path / 'bare.sqlite3').exists()
@@ -0,0 +1,97 @@
+# tests/test_ingestion.py
+import pytest
+
+from src.models.ingestion import IngestionStore
+from src.services.ingestion import IngestionPipeline, IngestionError, IncompleteStep, INGESTION_STATES
+
+
+class ScriptedSteps:
+    """One step per state; outcomes[state] is a list of outputs or exceptions, consumed per call"""
+
+    def __init__(self, **outcomes):
+        self.outcomes = outcomes
+        self.calls = []
+
+    def steps(self):
+        return [(state, self._step(state)) for state in INGESTION_STATES[1:]]
+
+    def _step(self, state):
+        def step(outputs, context):
+            self.calls.append(state)
+            queue = self.outcomes.get(state)
+            outcome = queue.pop(0) if queue else {'done': state}
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        return step
+
+
+@pytest.fixture
+def store(database):
+    return IngestionStore(database)
+
+
+def test_incomplete_step_is_not_persisted_and_reruns(store):
+    partial = {'is_valid': True}
+    script = ScriptedSteps(scored=[IncompleteStep('1 search failed', result=partial)])
+    pipeline = IngestionPipeline(store, script.steps())
+
+    with pytest.raises(IngestionError) as raised:
+        pipeline.run('key', {})
+    assert raised.value.cause.result is partial
+    assert store.get('key')['state'] == 'indexed'
+    assert 'scored' not in store.get('key')['outputs']
+
+    script.calls.clear()
+    record = pipeline.run('key', {})
+    assert script.calls == ['scored', 'classified']
+    assert record['state'] == 'classified'
+    assert pipeline.stats()['incomplete'] == 1 and pipeline.stats()['failures'] == 0
+
+
+def test_reset_from_discards_earlier_states(store):
+    script = ScriptedSteps(indexed=[IncompleteStep('task failed', reset_from='indexing')])
+    pipeline = IngestionPipeline(store, script.steps())
+
+    with pytest.raises(IngestionError):
+        pipeline.run('key', {})
+    record = store.get('key')
+    assert record['state'] == 'staged'
+    assert 'indexing' not in record['outputs']
+
+    script.calls.clear()
+    pipeline.run('key', {})
+    assert script.calls == ['indexing', 'indexed', 'scored', 'classified']
+
+
+def test_unreusable_output_is_redone_with_everything_after_it(store):
+    script = ScriptedSteps(staged=[{'route': 'local'}, {'route': 'gcs'}])
+    service_up = [False]
+    pipeline = IngestionPipeline(store, script.steps(),
+                                 reusable=lambda state, output: not (output.get('route') == 'local' and service_up[0]))
+    pipeline.run('key', {})
+
+    script.calls.clear()
+    pipeline.run('key', {})
+    assert script.calls == []  # still down: the local route stands
+
+    service_up[0] = True
+    record = pipeline.run('key', {})
+    assert script.calls == ['staged', 'indexing', 'indexed', 'scored', 'classified']
+    assert record['outputs']['staged'] == {'route': 'gcs'}
+
+
+def test_expired_record_starts_over(store):
+    script = ScriptedSteps()
+    pipeline = IngestionPipeline(store, script.steps(), record_ttl=60)
+    pipeline.run('key', {})
+    record = store.get('key')
+    record['updated_at'] -= 120
+    store.db.execute_now([("UPDATE ingestions SET updated_at = ? WHERE ingestion_key = ?",
+                           (record['updated_at'], 'key'))])
+
+    script.calls.clear()
+    record = pipeline.run('key', {})
+    assert script.calls == list(INGESTION_STATES[1:])
+    assert record['attempts'] == 1
+    assert pipeline.stats()['expired'] == 1
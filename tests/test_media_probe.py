@@ -0,0 +1,45 @@
+# tests/test_media_probe.py
+import struct
+
+import pytest
+
+from src.services import media_probe as media_probe_module
+from src.services.media_probe import MediaProbe, MediaProbeError
+
+
+def box(kind: bytes, payload: bytes) -> bytes:
+    return struct.pack('>I', 8 + len(payload)) + kind + payload
+
+
+def minimal_mp4(seconds: int) -> bytes:
+    # mvhd v0: version/flags, creation, modification, timescale, duration
+    mvhd = box(b'mvhd', struct.pack('>IIIII', 0, 0, 0, 1000, seconds * 1000) + b'\0' * 80)
+    return box(b'ftyp', b'isom\0\0\0\0') + box(b'moov', mvhd)
+
+
+@pytest.fixture(autouse=True)
+def no_ffprobe(monkeypatch):
+    monkeypatch.setattr(media_probe_module, 'FFPROBE_AVAILABLE', False)
+
+
+def test_header_is_read_without_ffprobe(tmp_path):
+    path = tmp_path / 'clip.mp4'
+    path.write_bytes(minimal_mp4(12))
+    info = MediaProbe().probe(str(path))
+    assert info['duration'] == 12 and info['probe_method'] == 'header'
+
+
+def test_zero_filled_mp4_is_unreadable(tmp_path):
+    path = tmp_path / 'clip.mp4'
+    path.write_bytes(b'\0' * 5000)
+    with pytest.raises(MediaProbeError) as raised:
+        MediaProbe().probe(str(path))
+    assert raised.value.unreadable
+
+
+def test_other_containers_are_not_judged_without_ffprobe(tmp_path):
+    path = tmp_path / 'clip.webm'
+    path.write_bytes(b'\x1a\x45\xdf\xa3' + b'\0' * 100)
+    with pytest.raises(MediaProbeError) as raised:
+        MediaProbe().probe(str(path))
+    assert not raised.value.unreadable
@@ -0,0 +1,62 @@
+# tests/test_metrics_counters.py
+import threading
+
+from src.services.metrics_counters import ShardedCounters
+
+THREADS = 16
+INCREMENTS = 5000
+
+
+def _hammer(counters: ShardedCounters, start: threading.Barrier):
+    start.wait()
+    for i in range(INCREMENTS):
+        if i % 2:
+            counters.add('uploads')
+        else:
+            counters.add_many({'uploads': 1, 'bytes': 3})
+
+
+def test_concurrent_increments_sum_exactly():
+    counters = ShardedCounters()
+    start = threading.Barrier(THREADS)
+    threads = [threading.Thread(target=_hammer, args=(counters, start)) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    totals = counters.snapshot()
+    assert totals['uploads'] == THREADS * INCREMENTS
+    assert totals['bytes'] == THREADS * (INCREMENTS // 2) * 3
+
+
+def test_snapshots_during_writes_never_lose_or_double_count():
+    counters = ShardedCounters()
+    start = threading.Barrier(THREADS + 1)
+    threads = [threading.Thread(target=_hammer, args=(counters, start)) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+
+    start.wait()
+    seen = []
+    while any(thread.is_alive() for thread in threads):
+        seen.append(counters.snapshot().get('uploads', 0))
+    for thread in threads:
+        thread.join()
+    seen.append(counters.snapshot()['uploads'])
+
+    assert seen == sorted(seen)
+    assert seen[-1] == THREADS * INCREMENTS
+    assert all(value <= THREADS * INCREMENTS for value in seen)
+
+
+def test_finished_threads_are_folded_into_retired_totals():
+    counters = ShardedCounters()
+    for _ in range(3):
+        worker = threading.Thread(target=counters.add, args=('uploads', 2))
+        worker.start()
+        worker.join()
+
+    assert counters.snapshot() == {'uploads': 6}
+    assert counters.shard_count() == 0
+    assert counters.snapshot() == {'uploads': 6}
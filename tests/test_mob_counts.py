@@ -0,0 +1,28 @@
+# tests/test_mob_counts.py
+from src.models.mob import CampaignStore
+from src.models.video import VideoStore
+from src.services.bulk_reclassifier import BulkReclassifier
+from src.services.mob_classifier import MobClassifier
+
+TEMPLATE = {
+    'total_videos_analyzed': 0,
+    'campaign_videos_detected': 0,
+    'mob_distribution': {mob_id: {'count': 0, 'name': mob_id} for mob_id in ('mob001', 'mob005')}
+}
+
+
+def test_mob_counts_follow_the_catalog_through_reclassification(database):
+    videos = VideoStore(database)
+    campaign = CampaignStore(database, TEMPLATE, mob_counts=videos.counts_by_mob)
+    videos.seed({'mob001': [{'title': 'Parkour milk run - extreme edition'}]})
+    videos.add('mob005', {'title': 'skateboard stunt jump'})
+
+    assert {mob_id: mob['count'] for mob_id, mob in campaign.document()['mob_distribution'].items()} == \
+        {'mob001': 1, 'mob005': 1}
+
+    report = BulkReclassifier(MobClassifier()).reclassify(videos)
+    assert report['applied'] == 1
+
+    counts = {mob_id: mob['count'] for mob_id, mob in campaign.document()['mob_distribution'].items()}
+    assert counts == {'mob001': 2, 'mob005': 0}
+    assert counts == {mob_id: videos.counts_by_mob().get(mob_id, 0) for mob_id in counts}
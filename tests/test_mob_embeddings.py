@@ -0,0 +1,124 @@
+# tests/test_mob_embeddings.py
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.models.embedding import EmbeddingStore
+from src.services.mob_embeddings import (
+    EmbeddingMobClassifier, EmbeddingUnavailableError, LocalEmbeddingProvider, TwelveLabsEmbeddingProvider,
+    build_embedding_provider
+)
+
+
+class CountingProvider(LocalEmbeddingProvider):
+    """Local provider that counts (and can slow down) video embedding fetches"""
+
+    def __init__(self, gate: threading.Event = None):
+        super().__init__()
+        self.gate = gate
+        self.video_calls = 0
+
+    def video_embedding(self, video_id, context_text=''):
+        self.video_calls += 1
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        return super().video_embedding(video_id, context_text)
+
+
+@pytest.fixture
+def store(database):
+    return EmbeddingStore(database)
+
+
+def test_no_provider_without_client_or_explicit_local():
+    assert build_embedding_provider('', None, 'index', 'model') is None
+    assert build_embedding_provider('twelvelabs', None, 'index', 'model') is None
+
+
+def test_local_provider_only_when_asked_for():
+    assert isinstance(build_embedding_provider('local', None, 'index', 'model'), LocalEmbeddingProvider)
+    client = object()
+    assert isinstance(build_embedding_provider('', client, 'index', 'model'), TwelveLabsEmbeddingProvider)
+
+
+def test_classifies_by_nearest_mob_centroid(store):
+    classifier = EmbeddingMobClassifier(LocalEmbeddingProvider(), store)
+    result = classifier.classify('v1', 'mukbang asmr eating show #mukbang #asmr')
+    assert result['mob_key'] == 'mukbang_masters'
+    assert result['classification_method'] == 'embedding'
+
+
+def test_no_assignment_below_min_similarity(store):
+    classifier = EmbeddingMobClassifier(LocalEmbeddingProvider(), store, min_similarity=0.05)
+    assert classifier.classify('v2', 'zzqx') is None
+
+
+def test_concurrent_requests_share_one_fetch(store):
+    gate = threading.Event()
+    provider = CountingProvider(gate)
+    classifier = EmbeddingMobClassifier(provider, store)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(classifier.video_vector('v3', 'milk art')))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    gate.set()
+    for thread in threads:
+        thread.join()
+
+    assert provider.video_calls == 1
+    assert len(results) == 8
+    assert classifier.stats()['coalesced'] + classifier.stats()['hits'] == 7
+
+
+def test_vectors_persist_across_classifiers(store):
+    first = EmbeddingMobClassifier(CountingProvider(), store)
+    first.classify('v4', 'protein shake after the gym workout')
+
+    provider = CountingProvider()
+    second = EmbeddingMobClassifier(provider, store)
+    assert second.classify('v4', 'protein shake after the gym workout')['mob_key'] == 'fitness_fuel'
+    assert provider.video_calls == 0
+
+
+class FakeVideoResource:
+    """client.index.video with the SDK's retrieve() signature; unknown keywords raise TypeError"""
+
+    def __init__(self, segments):
+        self.segments = segments
+        self.calls = []
+
+    def retrieve(self, index_id, id, *, embedding_option=None, request_options=None):
+        self.calls.append({'index_id': index_id, 'id': id, 'embedding_option': embedding_option})
+        video_embedding = SimpleNamespace(segments=self.segments)
+        return SimpleNamespace(embedding=SimpleNamespace(video_embedding=video_embedding))
+
+
+def fake_client(segments):
+    return SimpleNamespace(index=SimpleNamespace(video=FakeVideoResource(segments)))
+
+
+def test_remote_provider_requests_visual_text_embeddings():
+    segments = [
+        SimpleNamespace(start_offset_sec=0.0, end_offset_sec=6.0, embedding_scope='clip', embeddings_float=[1.0, 0.0]),
+        SimpleNamespace(start_offset_sec=0.0, end_offset_sec=12.0, embedding_scope='video', embeddings_float=[0.0, 1.0])
+    ]
+    client = fake_client(segments)
+    provider = TwelveLabsEmbeddingProvider(client, 'index-1')
+
+    vector = provider.video_embedding('video-9')
+    assert client.index.video.calls == [{'index_id': 'index-1', 'id': 'video-9', 'embedding_option': ['visual-text']}]
+    assert vector.tolist() == [0.0, 1.0]  # the whole-video segment wins over clips
+
+
+def test_missing_embeddings_are_remembered_per_video(store):
+    client = fake_client([])
+    classifier = EmbeddingMobClassifier(TwelveLabsEmbeddingProvider(client, 'index-1'), store)
+
+    assert classifier.classify('video-9') is None
+    assert classifier.classify('video-9') is None
+    with pytest.raises(EmbeddingUnavailableError):
+        classifier.video_vector('video-9')
+    assert len(client.index.video.calls) == 1
+    assert classifier.stats()['unavailable_hits'] == 2
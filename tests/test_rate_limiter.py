@@ -0,0 +1,57 @@
+# tests/test_rate_limiter.py
+from types import SimpleNamespace
+
+from src.api.http_client import PooledHTTPClient
+from src.services.rate_limiter import ApiRateLimiter, RateLimitedClient
+
+
+class CountingLimiter(ApiRateLimiter):
+    def __init__(self):
+        super().__init__({'search': {'rate_per_minute': 6000, 'capacity': 100}})
+        self.acquired = []
+
+    def acquire(self, bucket_name, priority=None):
+        self.acquired.append(bucket_name)
+        return super().acquire(bucket_name, priority)
+
+
+class FakePager:
+    """Shape of the SDK's lazy pager: one page of items plus get_next() for the following one"""
+
+    def __init__(self, pages, fetched):
+        self.items = pages[0]
+        self.has_next = len(pages) > 1
+        self._rest = pages[1:]
+        self._fetched = fetched
+
+    def get_next(self):
+        self._fetched.append(len(self._rest))
+        return FakePager(self._rest, self._fetched)
+
+
+def test_each_further_page_takes_a_token():
+    limiter = CountingLimiter()
+    fetched = []
+    sdk = SimpleNamespace(search=SimpleNamespace(query=lambda **kwargs: FakePager([[1, 2], [3, 4], [5]], fetched)))
+    client = RateLimitedClient(sdk, limiter)
+
+    clips = []
+    for clip in client.search.query(index_id='index'):
+        clips.append(clip)
+        if clip == 3:
+            break
+
+    assert clips == [1, 2, 3]
+    assert len(fetched) == 1                       # the third page was never requested
+    assert limiter.acquired == ['search', 'search']  # the query itself, then page two
+
+
+def test_http_client_takes_a_token_per_attempt(monkeypatch):
+    limiter = CountingLimiter()
+    http = PooledHTTPClient(limiter=limiter, max_retries=2, backoff_base=0)
+    # The 429 is retried, and the retry is a request of its own
+    responses = iter([SimpleNamespace(status_code=429, headers={}), SimpleNamespace(status_code=200, headers={})])
+    monkeypatch.setattr(http.session, 'request', lambda method, url, **kwargs: next(responses))
+
+    assert http.post('https://api.example/search', idempotent=True, bucket='search').status_code == 200
+    assert limiter.acquired == ['search', 'search']
@@ -0,0 +1,49 @@
+import threading
+
+from src.services.result_cache import ValidationResultCache
+
+
+def test_entries_are_shared_through_the_database(database):
+    writer = ValidationResultCache(database)
+    key = writer.url_key('https://www.tiktok.com/@milkmob/video/1', '#gotmilk')
+    writer.put(key, {'is_valid': True, 'mob_id': 'mob001'})
+
+    # A second cache on the same database stands in for another worker process
+    reader = ValidationResultCache(database)
+    assert reader.get(key) == {'is_valid': True, 'mob_id': 'mob001'}
+    assert reader.stats()['hits'] == 1
+
+
+def test_lookups_from_many_threads(database):
+    cache = ValidationResultCache(database)
+    keys = [cache.url_key(f'https://youtu.be/{i}', '') for i in range(20)]
+    errors = []
+
+    def worker(index):
+        try:
+            cache.put(keys[index], {'index': index})
+            assert cache.get(keys[index]) == {'index': index}
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(keys))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert cache.stats()['entries'] == len(keys)
+
+
+def test_expired_and_overflowing_entries_are_dropped(database):
+    cache = ValidationResultCache(database, ttl_seconds=-1)
+    key = cache.url_key('https://youtu.be/old', '')
+    cache.put(key, {'is_valid': False})
+    assert cache.get(key) is None
+
+    cache = ValidationResultCache(database, max_entries=2)
+    for i in range(3):
+        cache.put(cache.url_key(f'https://youtu.be/{i}', ''), {'index': i})
+    assert cache.stats()['entries'] == 2
+    assert cache.evictions == 1
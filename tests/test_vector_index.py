@@ -0,0 +1,43 @@
+# tests/test_vector_index.py
+import numpy as np
+
+from src.services.vector_index import IVFVectorIndex
+
+DIM = 8
+
+
+def _unit(i: int) -> np.ndarray:
+    vector = np.zeros(DIM, dtype=np.float32)
+    vector[i % DIM] = 1.0
+    return vector
+
+
+def test_writers_sharing_a_directory_stay_aligned(tmp_path):
+    # Two instances on one directory stand in for two worker processes
+    first = IVFVectorIndex(str(tmp_path), DIM)
+    second = IVFVectorIndex(str(tmp_path), DIM)
+
+    first.add(np.vstack([_unit(0), _unit(1)]), [{'video_id': 'a'}, {'video_id': 'b'}])
+    second.add(np.vstack([_unit(2)]), [{'video_id': 'c'}])
+    first.add(np.vstack([_unit(3)]), [{'video_id': 'd'}])
+
+    for index in (first, second, IVFVectorIndex(str(tmp_path), DIM)):
+        assert [item['video_id'] for item in index.items()] == ['a', 'b', 'c', 'd']
+        for i, video_id in enumerate('abcd'):
+            score, item = index.search(_unit(i), k=1)[0]
+            assert item['video_id'] == video_id
+            assert score > 0.99
+
+
+def test_retrained_quantizer_is_picked_up_by_other_instances(tmp_path):
+    first = IVFVectorIndex(str(tmp_path), DIM, nlist=2, nprobe=2, train_factor=2)
+    second = IVFVectorIndex(str(tmp_path), DIM, nlist=2, nprobe=2, train_factor=2)
+
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(6, DIM)).astype(np.float32)
+    first.add(vectors, [{'video_id': str(i)} for i in range(6)])
+
+    assert second.stats()['trained'] is False
+    score, item = second.search(vectors[4], k=1)[0]
+    assert item['video_id'] == '4'
+    assert second.stats()['trained'] is True
@@ -0,0 +1,15 @@
+# tests/test_video_metadata.py
+import pytest
+
+from src.services.video_metadata import VideoMetadataService, VideoMetadataError, canonical_url
+
+
+@pytest.mark.parametrize('url', ['https://youtube.com:abc/watch?v=x', 'http://[::1/video'])
+def test_malformed_url_raises_metadata_error(url):
+    with pytest.raises(VideoMetadataError, match='Invalid URL'):
+        VideoMetadataService().lookup(url)
+
+
+def test_canonical_url_strips_tracking_and_mobile_host():
+    assert canonical_url('https://m.youtube.com/watch?v=abc&si=xyz#t=1') == 'https://youtube.com/watch?v=abc'
+    assert canonical_url('https://youtu.be/abc?si=xyz') == 'https://youtube.com/watch?v=abc'